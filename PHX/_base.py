@@ -7,24 +7,39 @@ the from_dict() method due to circular import problems.
 """
 
 import uuid
+import PHX.metrics_cache
 import PHX.serialization.to_dict
 
+_MISSING = object()
 
-class _Base(object):
-    """PHX Object Base class."""
+# -- Value types which are compared by value (==) instead of by identity (is) when set
+_VALUE_TYPES = (bool, int, float, str, type(None))
 
-    def __init__(self):
-        self.identifier = uuid.uuid4()
-        self.user_data = {}
+
+class _BaseMixin(object):
+    """The methods shared by all PHX Objects, both _Base and _ValueBase.
+
+    Subclasses provide the 'identifier' and 'user_data' attributes.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, _name, _value):
+        # -- Record the change, for anything watching the object (ie: to re-write its cached XML text)
+        if not PHX.metrics_cache._VERSIONS:
+            object.__setattr__(self, _name, _value)
+            return
+
+        old = getattr(self, _name, _MISSING)
+        object.__setattr__(self, _name, _value)
+        if old is _value or (type(old) is type(_value) and isinstance(_value, _VALUE_TYPES) and old == _value):
+            return
+        PHX.metrics_cache.touched(self)
 
     @property
     def identifier_short(self):
         return str(self.identifier).split("-")[0]
 
-    def __new__(cls, *args, **kwargs):
-        """Included so that subclasses can customize their own __new__"""
-        return super(_Base, cls).__new__(cls)
-
     def to_dict(self):
         """Serialize the Object into a dictionary
 
@@ -33,9 +48,7 @@ class _Base(object):
             * (dict) A dictionary with all the relevant object attributes
         """
 
-        module = self.__class__.__module__
-        class_name = self.__class__.__name__
-        func = getattr(PHX.serialization.to_dict, "_{}".format(class_name))
+        func = getattr(PHX.serialization.to_dict, "_{}".format(self.__class__.__name__))
         return func(self)
 
     def __str__(self):
@@ -48,3 +61,51 @@ class _Base(object):
         return "{}(identifier={!r}, user_data={!r})".format(
             self.__class__.__name__, self.identifier_short, self.user_data
         )
+
+
+class _Base(_BaseMixin):
+    """PHX Object Base class."""
+
+    def __init__(self):
+        self.identifier = uuid.uuid4()
+        self.user_data = {}
+
+    def __new__(cls, *args, **kwargs):
+        """Included so that subclasses can customize their own __new__"""
+        return super(_Base, cls).__new__(cls)
+
+
+class _ValueBase(_BaseMixin):
+    """Lightweight PHX Object Base class, for small 'value' objects (Vectors, Colors, ...)
+    which are made in large numbers.
+
+    Uses __slots__ instead of an instance __dict__, and does not make the identifier
+    or user_data until they are first used. Subclasses must list their own attributes
+    in __slots__ as well.
+    """
+
+    __slots__ = ("_identifier", "_user_data", "__weakref__")
+
+    @property
+    def identifier(self):
+        try:
+            return self._identifier
+        except AttributeError:
+            self._identifier = uuid.uuid4()
+            return self._identifier
+
+    @identifier.setter
+    def identifier(self, _in):
+        self._identifier = _in
+
+    @property
+    def user_data(self):
+        try:
+            return self._user_data
+        except AttributeError:
+            self._user_data = {}
+            return self._user_data
+
+    @user_data.setter
+    def user_data(self, _in):
+        self._user_data = _in
@@ -1,4 +1,5 @@
 import PHX._base
+import PHX.metrics_cache
 import PHX.programs.schedules
 import PHX.serialization.from_dict
 from collections import defaultdict
@@ -143,95 +144,116 @@ class Appliance(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Appliance(cls, _dict)
 
-    def __add__(self, other):
-        # type: (Appliance, Appliance) -> Appliance
+    # -- Appliance types which can be added together
+    addable_types = {1, 2, 3, 4, 5, 6, 7, 11, 13, 14, 15, 16, 17, 18, 21, 22, 23, 24}
+
+    # -- Attributes which must be the same to add Appliances together
+    type_fields = (
+        "reference_energy_norm",
+        "dishwasher_capacity_type",
+        "dishwasher_water_connection",
+        "washer_connection",
+        "dryer_type",
+        "dryer_field_utilization_factor_type",
+        "cooktop_type",
+    )
+
+    # -- Attributes which are averaged, weighted by each Appliance's quantity
+    quantity_weighted_fields = (
+        "energy_demand",
+        "energy_demand_per_use",
+        "combined_energy_facor",
+        "dishwasher_capacity",
+        "washer_capacity",
+        "washer_modified_energy_factor",
+        "washer_utilization_factor",
+        "dryer_gas_consumption",
+        "dryer_gas_efficiency_factor",
+        "dryer_field_utilization_factor",
+        "lighting_frac_high_efficiency",
+    )
 
-        def _set_quantity_weighted_average(_new_obj, _obj_a, _obj_b, _attr_name):
-            # type: (Appliance, Appliance, Appliance, str) -> None
-            """Utility function used by __add__: Sets appliance energy demand on a unit-weighted average basis"""
+    @classmethod
+    def merge(cls, _appliances):
+        # type: (Iterable[Appliance]) -> Appliance | None
+        """Merge any number of Appliances of the same type together into a single Appliance, in one pass.
 
-            a = getattr(_obj_a, _attr_name, 0) * _obj_a.quantity
-            b = getattr(_obj_b, _attr_name, 0) * _obj_b.quantity
-            weighted_avg = (float(a) + float(b)) / (_obj_a.quantity + _obj_b.quantity)
-            setattr(_new_obj, _attr_name, weighted_avg)
+        Gives the same result as adding the Appliances together two at a time (a1 + a2 + ...),
+        without making a new Appliance for each step. If there is only a single Appliance,
+        it is returned as-is.
 
-            return None
+        Arguments:
+        ----------
+            * _appliances (Iterable[Appliance]): The Appliances to merge.
+
+        Returns:
+        --------
+            * (Appliance | None): The merged Appliance, or None if there were no Appliances.
+        """
 
-        def _set_type_value(_new_obj, _obj_a, _obj_b, _attr_name):
-            # type (Appliance, Appliance, Appliance, str) -> None
-            """Utility function used by __add__: Checks Appliance 'type' values are the same when adding"""
+        appliances = [_ for _ in _appliances if _]
+        if not appliances:
+            return None
 
-            a = getattr(_obj_a, _attr_name)
-            b = getattr(_obj_b, _attr_name)
-            if a != b:
-                raise ApplianceTypeMismatchError(_obj_a, _obj_b, _attr_name)
-            else:
-                setattr(_new_obj, _attr_name, a)
+        first = appliances[0]
+        if len(appliances) == 1:
+            return first
 
-        if self and not other:
-            return self
-        elif self.type != other.type:
-            raise ApplianceAdditionError(self, other)
-        elif self.type not in {1, 2, 3, 4, 5, 6, 7, 11, 13, 14, 15, 16, 17, 18, 21, 22, 23, 24}:
-            raise ApplianceAdditionError(self, other)
+        for appliance in appliances[1:]:
+            if appliance.type != first.type:
+                raise ApplianceAdditionError(first, appliance)
+        if first.type not in cls.addable_types:
+            raise ApplianceAdditionError(first, appliances[1])
 
-        new_appliance = self.__class__()
-        new_appliance.type = self.type
-        new_appliance.quantity = self.quantity + other.quantity
+        new_appliance = cls()
+        new_appliance.type = first.type
+        new_appliance.name = first.name
 
         # -- Set the comment
-        if self.comment == other.comment:
-            new_appliance.comment = self.comment
+        comments = [_.comment for _ in appliances]
+        if all(_ == first.comment for _ in comments):
+            new_appliance.comment = first.comment
         else:
-            new_appliance.comment = self.comment or "" + other.comment or ""
-
-        # -- General Appliance Values
-        _set_type_value(new_appliance, self, other, "reference_energy_norm")
-        _set_quantity_weighted_average(new_appliance, self, other, "energy_demand")
-        _set_quantity_weighted_average(new_appliance, self, other, "energy_demand_per_use")
-        _set_quantity_weighted_average(new_appliance, self, other, "combined_energy_facor")
-
-        # -- Dishwasher
-        _set_type_value(new_appliance, self, other, "dishwasher_capacity_type")
-        _set_quantity_weighted_average(new_appliance, self, other, "dishwasher_capacity")
-        _set_type_value(new_appliance, self, other, "dishwasher_water_connection")
-
-        # -- Laundry Washer
-        _set_quantity_weighted_average(new_appliance, self, other, "washer_capacity")
-        _set_quantity_weighted_average(new_appliance, self, other, "washer_modified_energy_factor")
-        _set_type_value(new_appliance, self, other, "washer_connection")
-        _set_quantity_weighted_average(new_appliance, self, other, "washer_utilization_factor")
-
-        # -- Laundry Dryer
-        _set_type_value(new_appliance, self, other, "dryer_type")
-        _set_quantity_weighted_average(new_appliance, self, other, "dryer_gas_consumption")
-        _set_quantity_weighted_average(new_appliance, self, other, "dryer_gas_efficiency_factor")
-        _set_type_value(new_appliance, self, other, "dryer_field_utilization_factor_type")
-        _set_quantity_weighted_average(new_appliance, self, other, "dryer_field_utilization_factor")
-
-        # -- Cooktop
-        _set_type_value(new_appliance, self, other, "cooktop_type")
-
-        # -- PHIUS Lighting and MEL
-        _set_quantity_weighted_average(new_appliance, self, other, "lighting_frac_high_efficiency")
+            new_appliance.comment = next((_ for _ in comments if _), "")
+
+        # -- Type values must all match
+        for attr_name in cls.type_fields:
+            value = getattr(first, attr_name)
+            for appliance in appliances:
+                if getattr(appliance, attr_name) != value:
+                    raise ApplianceTypeMismatchError(first, appliance, attr_name)
+            setattr(new_appliance, attr_name, value)
+
+        # -- Quantity weighted averages, totaled in a single pass over the Appliances
+        totals = dict.fromkeys(cls.quantity_weighted_fields, 0.0)
+        total_quantity = 0
+        for appliance in appliances:
+            quantity = appliance.quantity
+            total_quantity += quantity
+            for attr_name in cls.quantity_weighted_fields:
+                totals[attr_name] += getattr(appliance, attr_name, 0) * quantity
+
+        new_appliance.quantity = total_quantity
+        for attr_name, total in totals.items():
+            setattr(new_appliance, attr_name, total / total_quantity)
 
         # -- User-Determine Loads (and PHIUS Multifamily)
-        if self.type == 11:
-            if self.reference_quantity == 5 or other.reference_quantity == 5:  # User defined
+        if first.type == 11:
+            if any(_.reference_quantity == 5 for _ in appliances):  # User defined
                 new_appliance.quantity = 1
                 new_appliance.reference_quantity = 5
-                new_appliance.energy_demand = float(self.energy_demand) + float(other.energy_demand)
+                new_appliance.energy_demand = sum(float(_.energy_demand) for _ in appliances)
                 new_appliance.energy_demand_per_use = 0
 
-        # -- PHIUS Non-Res Kitchen
-        new_appliance.name = self.name
-        # print("here", new_appliance, new_appliance.name, new_appliance.quantity)
-        # new_appliance.num_meals_per_day = _set_quantity_weighted_average(
-        #     new_appliance, self, other, "num_meals_per_day"
-        # )
-
         return new_appliance
 
+    def __add__(self, other):
+        # type: (Appliance, Appliance) -> Appliance
+        if self and not other:
+            return self
+
+        return self.merge([self, other])
+
     def __radd__(self, other):
         if other == 0:
             return self
@@ -564,6 +586,7 @@ class ApplianceSet(PHX._base._Base):
                 raise UnknownApplianceError(appliance)
 
             self.appliance_dict[app_type_name].append(appliance)
+        PHX.metrics_cache.changed(self)
 
     def remove_type_from_set(self, _type_name):
         # type: (str) -> None
@@ -571,6 +594,7 @@ class ApplianceSet(PHX._base._Base):
             raise UnknownApplianceError(_type_name)
 
         self.appliance_dict.pop(_type_name, None)
+        PHX.metrics_cache.changed(self)
 
     @property
     def appliances(self):
@@ -597,53 +621,57 @@ class ApplianceSet(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._ApplianceSet(cls, _dict)
 
-    def __add__(self, other):
-        # type: (ApplianceSet, ApplianceSet) -> ApplianceSet
-        if other is None:
-            return self
-
-        new_set = self.__class__()
+    @classmethod
+    def merge_many(cls, _appliance_sets):
+        # type: (Iterable[ApplianceSet | None]) -> ApplianceSet
+        """Merge any number of ApplianceSets together into a single new ApplianceSet.
+
+        All the Appliances are grouped by type, 'comment' and 'name' once, and each group
+        is merged into a single Appliance with Appliance.merge(). This gives the same result
+        as adding the sets together two at a time (s1 + s2 + ...), without re-grouping and
+        re-merging all the Appliances at each step.
+
+        Arguments:
+        ----------
+            * _appliance_sets (Iterable[ApplianceSet | None]): The ApplianceSets to merge. Any None are ignored.
+
+        Returns:
+        --------
+            * (ApplianceSet): The new merged ApplianceSet.
+        """
+
+        # ----------------------------------------------------------------------
+        # -- Break up the appliances of each Type based on the 'comment'. This
+        # -- allows for multiple instances of a single type to be included
+        # -- in the ApplianceSet, if the user gives each a different 'comment' attr.
+        # -- Break up by Name as well, esp for Non-Res
+        # -- {type_name: {comment: {name: [Appliance, ...]}}}
+        groups = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        for appliance_set in _appliance_sets:
+            if appliance_set is None:
+                continue
 
-        # -- Merge together Appliance Lists one Type at a time
-        for app_type_name in self.known_types.values():
-            self_appliances = self.appliance_dict.get(app_type_name, [])
-            other_appliances = other.appliance_dict.get(app_type_name, [])
+            for app_type_name, appliances in appliance_set.appliance_dict.items():
+                by_comment = groups[app_type_name]
+                for app in appliances:
+                    by_comment[app.comment][app.name].append(app)
 
-            appliances = []
-            appliances.extend(self_appliances)
-            appliances.extend(other_appliances)
+        # ----------------------------------------------------------------------
+        # -- Merge all the appliances of each group into a single instance
+        new_set = cls()
+        for app_type_name in cls.known_types.values():
+            for by_name in groups.get(app_type_name, {}).values():
+                for app_list in by_name.values():
+                    new_set.add_appliances_to_set(Appliance.merge(app_list))
 
-            if not appliances:
-                continue
+        return new_set
 
-            # ------------------------------------------------------------------
-            # -- Also Breakup/Sort the appliance of this type based on the 'comment'. This
-            # -- allows for multiple instances of a single type to be included
-            # -- in the ApplianceSet, if the user gives each a different 'comment' attr
-            appliances_by_comment_type = defaultdict(list)
-            for app in appliances:
-                appliances_by_comment_type[app.comment].append(app)
-
-            # -- Break up by Name as well, esp for Non-Res
-            appliances_by_comment_and_name = defaultdict(list)
-            for k, app_list in appliances_by_comment_type.items():
-                for app in app_list:
-                    appliances_by_comment_and_name["{}_{}".format(k, app.name)].append(app)
-
-            # ------------------------------------------------------------------
-            # -- Merge all the appliances of that Type into a single instance,
-            for app_list in appliances_by_comment_and_name.values():
-                merged_appliance = sum(app_list)
-                new_set.add_appliances_to_set(merged_appliance)
-
-            # ------------------------------------------------------------------
-            # -- Keep track of the count
-            #
-            #
-            #
-            # TODO
+    def __add__(self, other):
+        # type: (ApplianceSet, ApplianceSet) -> ApplianceSet
+        if other is None:
+            return self
 
-        return new_set
+        return self.merge_many([self, other])
 
     def __radd__(self, other):
         if other == 0:
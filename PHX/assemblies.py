@@ -6,6 +6,8 @@ PHX Material and Assembly / Construction Classes.
 """
 
 import PHX._base
+import PHX.id_allocator
+import PHX.metrics_cache
 import PHX.serialization.from_dict
 
 
@@ -35,7 +37,7 @@ class Material(PHX._base._Base):
 
     def __init__(self):
         super(Material, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.idDB = None
         self.name = None
         self.tConD = None
@@ -64,11 +66,6 @@ class Material(PHX._base._Base):
         self.nWCtCondGen = None
         self.TtCondGen = None
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Material, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Material(cls, _dict)
@@ -80,7 +77,7 @@ class Layer(PHX._base._Base):
 
     def __init__(self):
         super(Layer, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.thickness = 0.0254
         self._material = Material()
 
@@ -95,27 +92,17 @@ class Layer(PHX._base._Base):
 
         self._material = _in
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Layer, cls).__new__(cls, *args, **kwargs)
-
 
 class Assembly(PHX._base._Base):
     _count = 0
 
     def __init__(self):
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = "default_assembly"
         self.Order_Layers = 2
         self.Grid_Kind = 2
         self.Layers = []
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Assembly, cls).__new__(cls, *args, **kwargs)
-
     def add_layer(self, _layer):
         # type: (Layer) -> None
         """Add a new Layer to the Assembly
@@ -132,3 +119,4 @@ class Assembly(PHX._base._Base):
             raise LayerTypeError(_layer)
 
         self.Layers.append(_layer)
+        PHX.metrics_cache.changed(self)
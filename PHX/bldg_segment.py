@@ -8,11 +8,19 @@ These can be thought of as 'wings' or 'sections' of a full building structure. E
 Segment can have its own occupancy types / top-level attributes and has one or more Zones within it.
 """
 
+from array import array
 from collections import defaultdict
 from functools import reduce
 
 import PHX._base
 import PHX.component
+import PHX.geometry
+import PHX.geometry_kernel
+import PHX.geometry_store
+import PHX.id_allocator
+import PHX.identity_list
+import PHX.metrics_cache
+import PHX.spatial_index
 import PHX.spaces
 import PHX.summer_ventilation
 import PHX.programs.lighting
@@ -33,6 +41,14 @@ class ZoneTypeError(Exception):
         super(ZoneTypeError, self).__init__(self.message)
 
 
+class WindowHostNotFoundError(Exception):
+    def __init__(self, _p, _c):
+        self.message = 'Error: No host Polygon found for the window Polygon: "{}" of Component: "{}"'.format(
+            _p.id, _c.name
+        )
+        super(WindowHostNotFoundError, self).__init__(self.message)
+
+
 class GroupTypeNotImplementedError(Exception):
     def __init__(self, _in):
         self.message = 'Error: BuildingSegment grouping by Group Type: "{}" not implemented yet.'.format(str(_in))
@@ -41,15 +57,200 @@ class GroupTypeNotImplementedError(Exception):
 
 # ------------------------------------------------------------------------------
 class Geom(PHX._base._Base):
-    """Geometry Collection"""
+    """Geometry Collection
+
+    The Vertex data for all of the Polygons added with add_polygons() (or
+    add_component_polygons()) is held together in the Geom's VertexStore, as one contiguous array.
+    """
 
     def __init__(self):
         super(Geom, self).__init__()
         self.polygons = []
+        self.vertex_store = PHX.geometry_store.VertexStore()
+
+    @property
+    def polygons(self):
+        # type: () -> PHX.identity_list.IdentityList[PHX.geometry.Polygon]
+        return self._polygons
+
+    @polygons.setter
+    def polygons(self, _in):
+        # type: (list[PHX.geometry.Polygon]) -> None
+        self._polygons = PHX.identity_list.IdentityList(_in)
 
     @property
     def vertices(self):
-        return (v for p in self.polygons for v in p.vertices)
+        """Each of the Polygons' Vertices, in order. Welded Vertices (same id-number) are only included once."""
+        found = set()
+        for poly in self.polygons:
+            r = poly._vertex_range
+            for k, id_num in enumerate(r.store.ids[r.start : r.stop]):
+                if id_num in found:
+                    continue
+                found.add(id_num)
+                yield PHX.geometry.Vertex._view(r, k)
+
+    def _vertex_ranges(self):
+        # type: () -> list[PHX.geometry_store.VertexRange]
+        """Returns the VertexRange of each Polygon, once each, in order."""
+        ranges = []
+        found = set()
+        for poly in self.polygons:
+            r = poly._vertex_range
+            if id(r) not in found:
+                found.add(id(r))
+                ranges.append(r)
+        return ranges
+
+    def compact(self):
+        # type: () -> None
+        """Re-build the VertexStore with only the Polygons' data, in Polygon order, with no gaps."""
+
+        new_store = PHX.geometry_store.VertexStore()
+        for r in self._vertex_ranges():
+            if r.store is self.vertex_store:
+                r.move_to(new_store)
+        self.vertex_store = new_store
+
+    def vertex_coordinates_array(self):
+        # type: () -> numpy.ndarray
+        """Returns a copy of all the Polygons' Vertex coordinates, in order, as an (n, 3) NumPy array."""
+
+        # -- If the Polygons are in order, with no gaps, in the Geom's store, use it directly.
+        position = 0
+        for poly in self.polygons:
+            r = poly._vertex_range
+            if r.store is not self.vertex_store or r.start != position:
+                break
+            position = r.stop
+        else:
+            if position == len(self.vertex_store):
+                return self.vertex_store.as_array()
+
+        coords = array("d")
+        for poly in self.polygons:
+            coords.extend(poly.vertex_coordinates)
+        return PHX.geometry_store.coordinates_as_array(coords)
+
+    def weld_vertices(self, _tolerance=0.001):
+        # type: (float) -> int
+        """Merge the Polygons' Vertices which are at the same point, so that each is only written out once.
+
+        Each welded Vertex is given the id-number, and exact coordinates, of the first
+        Vertex (in Polygon order) within the tolerance of it. The Polygons' 'idVert' lists
+        then refer to the shared Vertex, and 'vertices' only includes it once.
+
+        Arguments:
+        ----------
+            * _tolerance (float): default=0.001. The max distance between Vertices at the 'same' point.
+
+        Returns:
+        --------
+            * (int): The number of Vertices newly welded to another.
+        """
+
+        ranges = self._vertex_ranges()
+
+        # -- All the Vertices, one after the other, so that Polygons from any store can be welded together
+        coords = array("d")
+        positions = []
+        for r in ranges:
+            coords.extend(r.store.coords[r.start * 3 : r.stop * 3])
+            positions.extend((r, i) for i in range(r.start, r.stop))
+
+        offsets = [0]
+        for r in ranges:
+            offsets.append(offsets[-1] + len(r))
+
+        welded_to = PHX.geometry_kernel.weld_vertices(coords, list(zip(offsets[:-1], offsets[1:])), _tolerance)
+
+        changed_ranges = {}
+        num_welded = 0
+        for index, target in enumerate(welded_to):
+            if index == target:
+                continue
+
+            r, i = positions[index]
+            store = r.store
+            target_store = positions[target][0].store
+            j = positions[target][1]
+            target_xyz = target_store.coords[j * 3 : j * 3 + 3]
+            if store.ids[i] == target_store.ids[j] and store.coords[i * 3 : i * 3 + 3] == target_xyz:
+                continue  # -- Welded already
+
+            store.set_id(i, target_store.ids[j])
+            store.coords[i * 3 : i * 3 + 3] = target_xyz
+            store.int_axes[i] = target_store.int_axes[j]
+            changed_ranges[id(r)] = r
+            num_welded += 1
+
+        for r in changed_ranges.values():
+            r.store.touch()
+            PHX.metrics_cache.changed(r)
+            r.sync_links()
+
+        return num_welded
+
+    def update_polygon_metrics(self):
+        # type: () -> None
+        """Calculate the area, normal and centroid of all the Polygons together, in one batch per VertexStore."""
+        PHX.geometry.update_polygon_metrics(self.polygons)
+
+    def transform(self, _factor=1.0, _offset=(0.0, 0.0, 0.0), _origin=(0.0, 0.0, 0.0)):
+        # type: (float, tuple[float, float, float], tuple[float, float, float]) -> None
+        """Scale all of the Polygons' Vertices about an origin, and then move them by the offset.
+
+        Arguments:
+        ----------
+            * _factor (float): The scale factor.
+            * _offset (tuple[float, float, float]): The x, y, z distance to move.
+            * _origin (tuple[float, float, float]): The x, y, z point to scale about.
+        """
+
+        ranges = self._vertex_ranges()
+        for r in ranges:
+            r.store.transform(r.start, r.stop, _factor, _offset, _origin)
+            PHX.metrics_cache.changed(r)
+
+        # -- Vertices shared with Polygons outside the Geom are moved there too
+        for r in ranges:
+            r.sync_links()
+
+    def translate(self, _x, _y, _z):
+        # type: (float, float, float) -> None
+        """Move all of the Polygons' Vertices."""
+        self.transform(_offset=(_x, _y, _z))
+
+    def scale(self, _factor, _origin=(0.0, 0.0, 0.0)):
+        # type: (float, tuple[float, float, float]) -> None
+        """Scale all of the Polygons' Vertices about the origin point."""
+        self.transform(_factor=_factor, _origin=_origin)
+
+    def add_polygons(self, _polygons):
+        # type: (list[PHX.geometry.Polygon]) -> None
+        """Adds Polygons to the Geometry's 'polygons' list, and their Vertex data to the VertexStore
+
+        Use this for Polygons which are not part of any Component. Polygons already in the
+        Geometry are skipped.
+
+        Arguments:
+        ----------
+            * _polygons (list[Polygon]): The Polygons to add
+        """
+
+        if not isinstance(_polygons, list):
+            _polygons = [_polygons]
+
+        for poly in _polygons:
+            if poly in self.polygons:
+                continue
+
+            self.polygons.append(poly)
+            poly._vertex_range.move_to(self.vertex_store)
+
+        # -- Polygons whose Vertices changed were moved to the end of the store, leaving gaps behind
+        if self.vertex_store.garbage > len(self.vertex_store) // 2:
+            self.compact()
 
     def add_component_polygons(self, _compos):
         # type: (list[PHX.component.Component]) -> None
@@ -63,12 +264,7 @@ class Geom(PHX._base._Base):
         if not isinstance(_compos, list):
             _compos = [_compos]
 
-        for compo in _compos:
-            for poly in compo.polygons:
-                if poly in self.polygons:
-                    continue
-
-                self.polygons.append(poly)
+        self.add_polygons([poly for compo in _compos for poly in compo.polygons])
 
 
 class PHIUSCertification(PHX._base._Base):
@@ -117,7 +313,7 @@ class Room(PHX._base._Base):
 
     def __init__(self):
         super(Room, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.volume_gross = 0.0
         self.spaces = []
@@ -128,10 +324,17 @@ class Room(PHX._base._Base):
         self.electric_equipment = PHX.programs.electric_equipment.RoomElectricEquipment()
         self.mechanicals = PHX.mechanicals.systems.Mechanicals()
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Room, cls).__new__(cls, *args, **kwargs)
+    @property
+    def mechanicals(self):
+        # type: () -> PHX.mechanicals.systems.Mechanicals
+        return self._mechanicals
+
+    @mechanicals.setter
+    def mechanicals(self, _in):
+        # type: (PHX.mechanicals.systems.Mechanicals) -> None
+        old = getattr(self, "_mechanicals", None)
+        self._mechanicals = _in
+        PHX.metrics_cache.children_changed(self, [_in], [old] if old is not None and old is not _in else [])
 
     def add_spaces(self, _spaces):
         # type: (list[PHX.spaces.Space]) -> None
@@ -142,6 +345,7 @@ class Room(PHX._base._Base):
 
         for space in _spaces:
             self.spaces.append(space)
+        PHX.metrics_cache.changed(self)
 
     def __str__(self):
         return "PHX_{}: {}".format(self.__class__.__name__, self.name)
@@ -164,7 +368,7 @@ class Zone(PHX._base._Base):
 
     def __init__(self):
         super(Zone, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = None
         self.typeZ = 1
 
@@ -186,15 +390,55 @@ class Zone(PHX._base._Base):
         self.summer_ventilation = PHX.summer_ventilation.SummerVent()
         self.occupancy = PHX.programs.occupancy.ZoneOccupancy()
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Zone, cls).__new__(cls, *args, **kwargs)
+    @property
+    def volume_gross(self):
+        return self._volume_gross
+
+    @volume_gross.setter
+    def volume_gross(self, _in):
+        self._volume_gross = _in
+        PHX.metrics_cache.changed(self)
+
+    @property
+    def volume_net(self):
+        return self._volume_net
+
+    @volume_net.setter
+    def volume_net(self, _in):
+        self._volume_net = _in
+        PHX.metrics_cache.changed(self)
+
+    @property
+    def rooms(self):
+        # type: () -> PHX.identity_list.IdentityList[Room]
+        return self._rooms
+
+    @rooms.setter
+    def rooms(self, _in):
+        # type: (list[Room]) -> None
+        old = getattr(self, "_rooms", ())
+        self._rooms = PHX.identity_list.IdentityList(_in, self._rooms_changed)
+        PHX.metrics_cache.children_changed(self, (), [_ for _ in old if _ not in self._rooms])
+
+    def _rooms_changed(self, _added, _removed):
+        # type: (list[Room], list[Room]) -> None
+        """Called by the 'rooms' list after any Rooms are added or removed."""
+        PHX.metrics_cache.children_changed(self, _added, [_ for _ in _removed if _ not in self._rooms])
+
+    @PHX.metrics_cache.cached_metric("Zone.mechanicals")
+    def _merged_mechanicals(self):
+        # type: () -> PHX.mechanicals.systems.Mechanicals
+        return PHX.mechanicals.systems.Mechanicals.merge(room.mechanicals for room in self.rooms)
 
     @property
     def mechanicals(self):
-        """Return a single Mechanical Object which is a sum of all the Room Mechanicals"""
-        return sum(room.mechanicals for room in self.rooms)
+        # type: () -> PHX.mechanicals.systems.Mechanicals
+        """Return a single new Mechanical Object which is a sum of all the Room Mechanicals.
+
+        The sum is cached, and a copy of it is returned each time. Adding Systems to the
+        copy does not change the Rooms: add them to the Room's Mechanicals instead.
+        """
+        return PHX.mechanicals.systems.Mechanicals.merge([self._merged_mechanicals()])
 
     def add_rooms(self, _new_rooms):
         # type: (list[PHX.bldg_segment.Room]) -> None
@@ -217,62 +461,76 @@ class Zone(PHX._base._Base):
                 self.floor_area_selection = 6  # user-defined
 
     @staticmethod
-    def _floor_area_weighted_join(_a, _b, _attr_str):
-        # type: (Zone, Zone, str) -> float
+    def _floor_area_weighted_average(_zones, _attr_str):
+        # type: (list[Zone], str) -> float
         """
-        Util function to cleanly join together two Zone attributes, weighted
-        by floor area handles ZeroDivisionErrors and None values
+        Util function to cleanly join together any number of Zone attributes, weighted
+        by floor area. Returns 0 if the Zones have no floor area.
         """
 
-        val_a = getattr(_a, _attr_str)
-        val_b = getattr(_b, _attr_str)
-
         try:
-            return ((val_a * _a.floor_area) + (val_b * _b.floor_area)) / (_a.floor_area + _b.floor_area)
+            return sum(getattr(_, _attr_str) * _.floor_area for _ in _zones) / sum(_.floor_area for _ in _zones)
         except ZeroDivisionError:
             return 0
 
-    def __add__(self, other):
-        # type: (Zone, Zone) -> Zone
-        new_obj = self.__class__()
+    @classmethod
+    def merge(cls, _zones):
+        # type: (Iterable[Zone]) -> Zone
+        """Merge any number of Zones together into a single new Zone, in one pass.
+
+        The sums and weighted values are the same as adding the Zones together two at a
+        time (z1 + z2 + ...), without making a new Zone for each step.
+
+        Arguments:
+        ----------
+            * _zones (Iterable[Zone]): The Zones to merge.
+
+        Returns:
+        --------
+            * (Zone): The new merged Zone.
+        """
+
+        zones = list(_zones)
+        new_obj = cls()
 
         # -- Add basic parameters
         new_obj.name = "Merged Zone"
         # -- Protect from None
-        new_obj.volume_gross = (self.volume_gross or 0) + (other.volume_gross or 0)
-        new_obj.volume_net = (self.volume_net or 0) + (other.volume_net or 0)
-        new_obj.floor_area = (self.floor_area or 0) + (other.floor_area or 0)
+        new_obj.volume_gross = sum((_.volume_gross or 0) for _ in zones)
+        new_obj.volume_net = sum((_.volume_net or 0) for _ in zones)
+        new_obj.floor_area = sum((_.floor_area or 0) for _ in zones)
         new_obj.floor_area_selection = 6  # user-defined
         new_obj.volume_net_selection = 6  # user-defined
         new_obj.volume_gross_selection = 6  # user-defined
 
         # -- Combine weighted paramaters
-        new_obj.clearance_height = self._floor_area_weighted_join(self, other, "clearance_height")
-        new_obj.spec_heat_cap = self._floor_area_weighted_join(self, other, "spec_heat_cap")
+        new_obj.clearance_height = cls._floor_area_weighted_average(zones, "clearance_height")
+        new_obj.spec_heat_cap = cls._floor_area_weighted_average(zones, "spec_heat_cap")
 
         # -- Combine Summer Ventilation, weighted by Zone volume
-        new_obj.summer_ventilation = PHX.summer_ventilation.SummerVent.weighted_join(
-            self.summer_ventilation,
-            self.volume_gross,
-            other.summer_ventilation,
-            other.volume_gross,
+        new_obj.summer_ventilation = PHX.summer_ventilation.SummerVent.weighted_join_all(
+            [_.summer_ventilation for _ in zones], [(_.volume_gross or 0) for _ in zones]
         )
 
         # -- Extend rooms ventilation
-        new_obj.rooms.extend(self.rooms)
-        new_obj.rooms.extend(other.rooms)
-        new_obj.source_zone_identifiers.extend([self.identifier, other.identifier])
-        new_obj.source_zone_identifiers.extend(self.source_zone_identifiers)
-        new_obj.source_zone_identifiers.extend(other.source_zone_identifiers)
+        new_obj.rooms = [room for zone in zones for room in zone.rooms]
+        new_obj.source_zone_identifiers.extend(_.identifier for _ in zones)
+        for zone in zones:
+            new_obj.source_zone_identifiers.extend(zone.source_zone_identifiers)
 
         # -- Combine ApplianceSets
-        new_obj.appliance_set = self.appliance_set + other.appliance_set
+        new_obj.appliance_set = PHX.appliances.ApplianceSet.merge_many(_.appliance_set for _ in zones)
 
         # -- Combine Occupancies
-        new_obj.occupancy = self.occupancy + other.occupancy
+        for zone in zones:
+            new_obj.occupancy = new_obj.occupancy + zone.occupancy
 
         return new_obj
 
+    def __add__(self, other):
+        # type: (Zone, Zone) -> Zone
+        return self.merge([self, other])
+
     def __radd__(self, other):
         if other == 0:
             return self
@@ -280,6 +538,48 @@ class Zone(PHX._base._Base):
             return self.__add__(other)
 
 
+class ZoneIndex(object):
+    """The Zones of a BldgSegment, by identifier, for BldgSegment.get_zone_by_identifier()
+
+    Attributes:
+    -----------
+        * exact (dict[str, Zone]): The first Zone with each identifier or source_zone_identifier.
+        * sources (list[tuple[str, Zone]]): Each Zone's source_zone_identifiers, in Zone order.
+        * num_zones (int): The number of Zones added.
+    """
+
+    def __init__(self, _zones=()):
+        # type: (Iterable[Zone]) -> None
+        self.exact = {}
+        self.sources = []
+        self.num_zones = 0
+        for zone in _zones:
+            self.add(zone)
+
+    def add(self, _zone):
+        # type: (Zone) -> None
+        """Add the Zone's identifier and source_zone_identifiers to the end of the index."""
+        self.num_zones += 1
+        self.exact.setdefault(str(_zone.identifier), _zone)
+        for identifier in _zone.source_zone_identifiers:
+            self.exact.setdefault(str(identifier), _zone)
+            self.sources.append((str(identifier), _zone))
+
+    def find(self, _lookup):
+        # type: (str) -> Zone | None
+        """Returns the Zone with the lookup as its identifier, else the first Zone with a source id containing it."""
+
+        zone = self.exact.get(_lookup)
+        if zone is not None:
+            return zone
+
+        # -- Only a partial identifier gets this far
+        for identifier, source_zone in self.sources:
+            if _lookup in identifier:
+                return source_zone
+        return None
+
+
 class BldgSegment(PHX._base._Base):
     """A Segment/Part/Wing of a Project with one or more PHX-Zones inside.
 
@@ -312,7 +612,7 @@ class BldgSegment(PHX._base._Base):
         self.HaMT = {}
         self.has_been_changed_since_last_gen = False
         self.has_been_generated = False
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.infiltration = PHX.infiltration.Infiltration(self)
         self.name = ""
         self.numerics = None
@@ -325,11 +625,6 @@ class BldgSegment(PHX._base._Base):
         self.target_room_names = []
         self.zones = []
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(BldgSegment, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls):
         if cls._default:
@@ -342,21 +637,82 @@ class BldgSegment(PHX._base._Base):
         return new_obj
 
     @property
+    def components(self):
+        # type: () -> PHX.identity_list.IdentityList[PHX.component.Component]
+        return self._components
+
+    @components.setter
+    def components(self, _in):
+        # type: (list[PHX.component.Component]) -> None
+        old = getattr(self, "_components", ())
+        self._components = PHX.identity_list.IdentityList(_in, self._components_changed)
+        PHX.metrics_cache.children_changed(self, (), [_ for _ in old if _ not in self._components])
+
+    def _components_changed(self, _added, _removed):
+        # type: (list[PHX.component.Component], list[PHX.component.Component]) -> None
+        """Called by the 'components' list after any Components are added or removed."""
+        PHX.metrics_cache.children_changed(self, _added, [_ for _ in _removed if _ not in self._components])
+
+    @property
+    def zones(self):
+        # type: () -> PHX.identity_list.IdentityList[Zone]
+        return self._zones
+
+    @zones.setter
+    def zones(self, _in):
+        # type: (list[Zone]) -> None
+        old = getattr(self, "_zones", ())
+        self._zone_index = None
+        self._zones = PHX.identity_list.IdentityList(_in, self._zones_changed)
+        PHX.metrics_cache.children_changed(self, (), [_ for _ in old if _ not in self._zones])
+
+    def _zones_changed(self, _added, _removed):
+        # type: (list[Zone], list[Zone]) -> None
+        """Called by the 'zones' list after any Zones are added, removed or re-ordered."""
+
+        # -- Zones added to the end can go on the end of the index, any other change re-builds it
+        index = self._zone_index
+        if index is not None:
+            num_zones = index.num_zones + len(_added)
+            appended = num_zones == len(self._zones) and self._zones[index.num_zones :] == list(_added)
+            if _removed or not _added or not appended:
+                self._zone_index = None
+            else:
+                for zone in _added:
+                    index.add(zone)
+
+        PHX.metrics_cache.children_changed(self, _added, [_ for _ in _removed if _ not in self._zones])
+
+    @property
+    @PHX.metrics_cache.cached_metric("BldgSegment.total_envelope_area")
     def total_envelope_area(self):
+        PHX.geometry.update_polygon_metrics(p for c in self.components for p in c.polygons)
         return sum((_.exposed_area or 0) for _ in self.components)
 
     @property
+    @PHX.metrics_cache.cached_metric("BldgSegment.total_volume_net")
     def total_volume_net(self):
         return sum((_.volume_net or 0) for _ in self.zones)
 
     @property
+    @PHX.metrics_cache.cached_metric("BldgSegment.total_volume_gross")
     def total_volume_gross(self):
         return sum((_.volume_gross or 0) for _ in self.zones)
 
+    @PHX.metrics_cache.cached_metric("BldgSegment.mechanicals")
+    def _merged_mechanicals(self):
+        # type: () -> PHX.mechanicals.systems.Mechanicals
+        return PHX.mechanicals.systems.Mechanicals.merge(zone.mechanicals for zone in self.zones)
+
     @property
     def mechanicals(self):
-        """Return a single Mechanical Object which is a sum of all the Zone Mechanicals"""
-        return sum(zone.mechanicals for zone in self.zones)
+        # type: () -> PHX.mechanicals.systems.Mechanicals
+        """Return a single new Mechanical Object which is a sum of all the Zone Mechanicals.
+
+        The sum is cached, and a copy of it is returned each time. Adding Systems to the
+        copy does not change the Zones: add them to the Room's Mechanicals instead.
+        """
+        return PHX.mechanicals.systems.Mechanicals.merge([self._merged_mechanicals()])
 
     def add_zones(self, _zones):
         # type: (list[PHX.bldg_segment.Zone]) -> None
@@ -408,6 +764,119 @@ class BldgSegment(PHX._base._Base):
             self.components.append(c)
             self.geom.add_component_polygons(c)
 
+    def weld_vertices(self, _tolerance=0.001):
+        # type: (float) -> int
+        """Merge the Vertices at the same point (within the tolerance) in the BldgSegment's geometry.
+
+        Shared corners (ie: between adjacent walls, floors and windows) are then only written out once.
+
+        Arguments:
+        ----------
+            * _tolerance (float): default=0.001. The max distance between Vertices at the 'same' point.
+
+        Returns:
+        --------
+            * (int): The number of Vertices welded to another.
+        """
+        return self.geom.weld_vertices(_tolerance)
+
+    @property
+    @PHX.metrics_cache.cached_metric("BldgSegment.polygon_index")
+    def polygon_index(self):
+        # type: () -> PHX.spatial_index.PolygonIndex
+        """A spatial index of all the Components' Polygons. Re-built after any change to the geometry or envelope."""
+        return PHX.spatial_index.PolygonIndex.from_components(self.components)
+
+    def get_polygons_in_region(self, _box):
+        # type: (PHX.spatial_index.BoundingBox) -> list[PHX.geometry.Polygon]
+        """Returns the Polygons whose bounding box intersects the region (ie: for shading assignment).
+
+        Arguments:
+        ----------
+            * _box (PHX.spatial_index.BoundingBox): The region to search.
+
+        Returns:
+        --------
+            * (list[PHX.geometry.Polygon]): The Polygons found.
+        """
+        return self.polygon_index.query_region(_box)
+
+    def get_adjacent_polygons(self, _polygon, _tolerance=0.001):
+        # type: (PHX.geometry.Polygon, float) -> list[PHX.geometry.Polygon]
+        """Returns the Polygons in the same plane as the Polygon, facing the opposite way, which touch it.
+
+        ie: the other side of an interior wall or floor.
+
+        Arguments:
+        ----------
+            * _polygon (PHX.geometry.Polygon): The Polygon to find the adjacent Polygons of.
+            * _tolerance (float): default=0.001. The max distance out of the plane.
+
+        Returns:
+        --------
+            * (list[PHX.geometry.Polygon]): The adjacent Polygons.
+        """
+        return self.polygon_index.coplanar_neighbours(_polygon, _tolerance, _facing=-1)
+
+    def get_window_host(self, _window_polygon, _tolerance=0.001):
+        # type: (PHX.geometry.Polygon, float) -> tuple[PHX.component.Component, PHX.geometry.Polygon] | None
+        """Returns the opaque Component and Polygon the window Polygon sits on.
+
+        The host is the nearest parallel Polygon, of an opaque Component, within the
+        tolerance of the window's centroid.
+
+        Arguments:
+        ----------
+            * _window_polygon (PHX.geometry.Polygon): The window's Polygon.
+            * _tolerance (float): default=0.001. The max distance from the window's centroid to the host.
+
+        Returns:
+        --------
+            * (tuple[Component, Polygon] | None): The host Component and Polygon, or None if none is found.
+        """
+
+        index = self.polygon_index
+        metrics = _window_polygon._metrics
+        nx, ny, nz = metrics.normal
+
+        def is_host(_poly):
+            if _poly is _window_polygon:
+                return False
+            compo = index.component(_poly)
+            if compo is None or compo.type != 1:  # -- Only opaque Components
+                return False
+            ox, oy, oz = _poly._metrics.normal
+            return abs(abs(nx * ox + ny * oy + nz * oz) - 1.0) <= _tolerance
+
+        result = index.nearest(metrics.centroid, _tolerance, is_host)
+        if result is None:
+            return None
+        return index.component(result[0]), result[0]
+
+    def add_window_as_child(self, _window_component, _tolerance=0.001):
+        # type: (PHX.component.Component, float) -> PHX.component.Component
+        """Adds a Window's Polygons as 'children' of the opaque Polygons they sit on, found with the spatial index.
+
+        Arguments:
+        ----------
+            * _window_component (PHX.component.Component): The Window Component.
+            * _tolerance (float): default=0.001. The max distance from each window Polygon to its host.
+
+        Returns:
+        --------
+            * (PHX.component.Component): The host Component of the (first) window Polygon.
+        """
+
+        host_compo = None
+        for window_poly in _window_component.polygons:
+            host = self.get_window_host(window_poly, _tolerance)
+            if host is None:
+                raise WindowHostNotFoundError(window_poly, _window_component)
+            host_compo = host_compo or host[0]
+            host[1].add_children(window_poly)
+
+        return host_compo
+
     def get_component_groups(self, group_by=None):
         # type: (str) -> dict[PHX.component.Component]
         """Gets the BldgSegment's components, grouped by some category
@@ -438,33 +907,95 @@ class BldgSegment(PHX._base._Base):
 
         return compo_groups
 
-    def get_zone_by_identifier(self, _zone_identifier_lookup):
-        # type: (str) -> Zone | None
+    def index_zones(self):
+        # type: () -> ZoneIndex
+        """Re-build the index of the Zones' identifiers used by get_zone_by_identifier().
+
+        The index is kept up to date by any change to the 'zones' list. Call
+        this after changing the identifier (or source_zone_identifiers) of a Zone which was already added.
+        """
+        self._zone_index = ZoneIndex(self.zones)
+        return self._zone_index
+
+    def get_zone_by_identifier(self, _zone_identifier_lookup, _exact=False):
+        # type: (str, bool) -> Zone | None
         """Returns a Zone from the BldgSegment's Zone list if it matches the specified Identifier
 
+        A Zone with the lookup as its identifier (or as one of the identifiers of the Zones
+        merged into it: source_zone_identifiers) is returned first. If there is none, the first
+        Zone, in Zone order, with a source_zone_identifier which contains the lookup is returned.
+
         Arguments:
         ----------
             * _zone_identifier_looup (str): The zone Identifier to lookup.
                 ie: "4ef23cb3-89c5-4590-8069-dc395a183ac2"
+            * _exact (bool): default=False. Set True to only match identifiers and
+                source_zone_identifiers which are the same as the lookup. The first Zone with an
+                exact match is returned.
 
         Returns:
         --------
             * (Zone | None): The Zone, if found, or None if no matches are found
         """
 
-        for zone in self.zones:
-            if str(zone.identifier) == str(_zone_identifier_lookup):
-                return zone
-            else:
-                # -- If the zone has been joined previouslyz
-                for identifier in zone.source_zone_identifiers:
-                    if str(_zone_identifier_lookup) in str(identifier):
-                        return zone
-        else:
-            return None
+        index = self._zone_index
+        if index is None:
+            index = self.index_zones()
+        lookup = str(_zone_identifier_lookup)
+
+        if _exact:
+            return index.exact.get(lookup)
+
+        # -- Includes if the zone has been joined previously
+        return index.find(lookup)
+
+    def merge_coplanar_polygons(self, _tolerance=0.001):
+        # type: (float) -> int
+        """Merge each opaque Component's neighbouring Polygons in the same plane into single Polygons.
+
+        Window Components are left as they are, so each window keeps its own frame. Any
+        'children' id-numbers which pointed to a removed Polygon are re-linked to the
+        Polygon it was merged into, and the removed Polygons are taken out of the Geom.
+
+        Arguments:
+        ----------
+            * _tolerance (float): default=0.001. The max distance between Vertices at the 'same' point.
+
+        Returns:
+        --------
+            * (int): The number of Polygons removed.
+        """
+
+        merged_ids = {}
+        removed = set()
+        for compo in self.components:
+            if compo.type != 1:  # -- Only opaque Components
+                continue
+            polygons = list(compo.polygons)
+            merged_ids.update(compo.merge_coplanar_polygons(_tolerance))
+            removed.update(id(_) for _ in polygons if _ not in compo.polygons)
+
+        if not merged_ids:
+            return 0
 
-    def merge_components(self, by="assembly"):
-        # type: (str) -> None
+        # -- Re-link any children (ie: doors) which were merged
+        for poly in [p for c in self.components for p in c.polygons] + list(self.geom.polygons):
+            if not any(_ in merged_ids for _ in poly.children):
+                continue
+            children = []
+            for child_id in poly.children:
+                child_id = merged_ids.get(child_id, child_id)
+                if child_id not in children:
+                    children.append(child_id)
+            poly.children = children
+
+        self.geom.polygons = [_ for _ in self.geom.polygons if id(_) not in removed]
+        self.geom.compact()
+
+        return len(merged_ids)
+
+    def merge_components(self, by="assembly", merge_polygons=False, tolerance=0.001):
+        # type: (str, bool, float) -> None
         """Groups (joins) Components by the desginated characteristic.
 
         Note: this function will edit/change the BldgSegment.components list and
@@ -473,6 +1004,9 @@ class BldgSegment(PHX._base._Base):
         Arguments:
         ----------
             * by (str): default='assembly', ...
+            * merge_polygons (bool): default=False. Also merge the neighbouring Polygons in the
+                same plane of each new Component into single Polygons. See merge_coplanar_polygons()
+            * tolerance (float): default=0.001. The tolerance used to merge the Polygons.
 
         Returns:
         --------
@@ -513,6 +1047,9 @@ class BldgSegment(PHX._base._Base):
         else:
             raise GroupTypeNotImplementedError(by)
 
+        if merge_polygons:
+            self.merge_coplanar_polygons(tolerance)
+
     def merge_zones(self):
         # type: (None) -> None
         """Merges all of the Zones together into a single Zone"""
@@ -520,7 +1057,7 @@ class BldgSegment(PHX._base._Base):
         if len(self.zones) <= 1:
             return None
         else:
-            merged_zone = reduce(lambda a, b: a + b, self.zones)
+            merged_zone = Zone.merge(self.zones)
             merged_zone.id = 1
             self.zones = [merged_zone]
 
@@ -5,8 +5,14 @@
 PHX Component Classes
 """
 
+from array import array
+
 import PHX._base
 import PHX.geometry
+import PHX.geometry_kernel
+import PHX.id_allocator
+import PHX.identity_list
+import PHX.metrics_cache
 
 
 class ComponentTypeError(Exception):
@@ -23,9 +29,10 @@ class WindowHostNotFoundError(Exception):
         super(WindowHostNotFoundError, self).__init__(self.message)
 
 
-class WP_Color(PHX._base._Base):
+class WP_Color(PHX._base._ValueBase):
+    __slots__ = ("alpha", "red", "green", "blue")
+
     def __init__(self, _a=255, _r=255, _g=255, _b=255):
-        super(WP_Color, self).__init__()
         self.alpha = _a
         self.red = _r
         self.green = _g
@@ -38,8 +45,8 @@ class Component(PHX._base._Base):
 
     def __init__(self):
         super(Component, self).__init__()
-        self.id = self._count
-        self.idSKP = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
+        self.idSKP = self.id
         self.name = "No Name"
         self.visC = True
         self.type = 1
@@ -57,6 +64,50 @@ class Component(PHX._base._Base):
         self.win_type_id_num = -1
 
     @property
+    def polygons(self):
+        # type: () -> PHX.identity_list.IdentityList[PHX.geometry.Polygon]
+        return self._polygons
+
+    @polygons.setter
+    def polygons(self, _in):
+        # type: (list[PHX.geometry.Polygon]) -> None
+        old = getattr(self, "_polygons", ())
+        self._polygons = PHX.identity_list.IdentityList(_in, self._polygons_changed)
+        PHX.metrics_cache.children_changed(self, (), [_._vertex_range for _ in old if _ not in self._polygons])
+
+    def _polygons_changed(self, _added, _removed):
+        # type: (list[PHX.geometry.Polygon], list[PHX.geometry.Polygon]) -> None
+        """Called by the 'polygons' list after any Polygons are added or removed.
+
+        The Component's cached values depend on the Polygons' Vertices, so it is registered
+        with each Polygon's VertexRange.
+        """
+        PHX.metrics_cache.children_changed(
+            self,
+            [_._vertex_range for _ in _added],
+            [_._vertex_range for _ in _removed if _ not in self._polygons],
+        )
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, _in):
+        self._type = _in
+        PHX.metrics_cache.changed(self)
+
+    @property
+    def ext_exposure_zone_id(self):
+        return self._ext_exposure_zone_id
+
+    @ext_exposure_zone_id.setter
+    def ext_exposure_zone_id(self, _in):
+        self._ext_exposure_zone_id = _in
+        PHX.metrics_cache.changed(self)
+
+    @property
+    @PHX.metrics_cache.cached_metric("Component.exposed_area")
     def exposed_area(self):
         # Note: Excludes windows and door area, since that would double count
         # Opaque areas are not 'punched' areas (yet).
@@ -82,11 +133,6 @@ class Component(PHX._base._Base):
         self.int_exposure_zone_id = _zone.id
         self.int_exposure_zone_name = "Zone {}: {}".format(_zone.id, _zone.name)
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Component, cls).__new__(cls, *args, **kwargs)
-
     def __add__(self, _other):
         self.polygons.extend(_other.polygons)
         return self
@@ -113,6 +159,59 @@ class Component(PHX._base._Base):
 
             self.polygons.append(p)
 
+    def merge_coplanar_polygons(self, _tolerance=0.001):
+        # type: (float) -> dict[int, int]
+        """Merge the Component's neighbouring Polygons which are in the same plane into single Polygons.
+
+        Polygons which face the same way and share a whole edge are joined, and replaced by a
+        single Polygon around their outline (see PHX.geometry_kernel.merge_coplanar_polygons).
+        The first Polygon of each group is kept, with the new outline, and takes on the
+        'children' of the others.
+
+        Arguments:
+        ----------
+            * _tolerance (float): default=0.001. The max distance between Vertices at the 'same' point.
+
+        Returns:
+        --------
+            * (dict[int, int]): The id-number of each Polygon removed, and of the Polygon it was merged into.
+        """
+
+        coords = array("d")
+        ranges = []
+        sources = []  # -- The (VertexRange, k) of each Vertex, in order
+        for poly in self.polygons:
+            r = poly._vertex_range
+            start = len(sources)
+            coords.extend(r.store.coords[r.start * 3 : r.stop * 3])
+            sources.extend((r, k) for k in range(len(r)))
+            ranges.append((start, len(sources)))
+
+        merged_ids = {}
+        removed = set()
+        for group, outline in PHX.geometry_kernel.merge_coplanar_polygons(coords, ranges, _tolerance):
+            host = self.polygons[group[0]]
+            # -- The host's own Vertices keep any links to other Polygons, the removed Polygons' are copied
+            host_range = host._vertex_range
+            host.vertices = [
+                PHX.geometry.Vertex._view(*sources[_])
+                if sources[_][0] is host_range
+                else PHX.geometry.Vertex._detached(*sources[_])
+                for _ in outline
+            ]
+
+            for other in (self.polygons[_] for _ in group[1:]):
+                for child_id in other.children:
+                    if child_id not in host.children:
+                        host.children.append(child_id)
+                merged_ids[other.id] = host.id
+                removed.add(id(other))
+
+        if removed:
+            self.polygons = [_ for _ in self.polygons if id(_) not in removed]
+
+        return merged_ids
+
     def add_window_as_child(self, _window_component, _poly_identifier):
         # type (Component, str) -> None
         """Adds a Window's Polygons as 'children' of a Component's existing Polygon
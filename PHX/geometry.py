@@ -5,7 +5,18 @@
 PHX Geometry Classes
 """
 
+from array import array
+
+try:
+    from collections.abc import MutableSequence
+except ImportError:  # will be 2.x series
+    from collections import MutableSequence
+
 import PHX._base
+import PHX.geometry_kernel
+import PHX.geometry_store
+import PHX.id_allocator
+import PHX.metrics_cache
 
 
 class PolygonTypeError(Exception):
@@ -23,7 +34,7 @@ class PolygonNormalError(Exception):
         super(PolygonNormalError, self).__init__(self.message)
 
 
-class Vector(PHX._base._Base):
+class Vector(PHX._base._ValueBase):
     """Simple Vector class used to represent Surface Normal
 
     Attributes:
@@ -33,8 +44,9 @@ class Vector(PHX._base._Base):
         * z (float):
     """
 
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x=0.0, y=0.0, z=0.0):
-        super(Vector, self).__init__()
         self.x = x
         self.y = y
         self.z = z
@@ -57,12 +69,25 @@ class Vector(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Vector(cls, _dict)
 
-class Vertex(PHX._base._Base):
+
+class VertexTypeError(Exception):
+    def __init__(self, _in):
+        self.message = 'Error: Expected input of type: "PHX.geometry.Vertex" Got: "{}"::"{}"?'.format(_in, type(_in))
+        super(VertexTypeError, self).__init__(self.message)
+
+
+class Vertex(PHX._base._BaseMixin):
     """A single Vertex object with x, y, z positions and an ID number
 
     Will keep a running tally as objects are created, increments in the 'id'
     attribute.
 
+    The Vertex data is not held on the object itself. A new Vertex holds it in a small
+    PHX.geometry_store.VertexRecord, and once it is added to a Polygon it becomes a light
+    'view' onto its position in the Polygon's PHX.geometry_store.VertexRange instead. A
+    Vertex added to more than one Polygon is linked to each of its positions, so that it
+    is still the same Vertex in all of them.
+
     Attributes:
     -----------
         * id (int): The running tally of number of objects created
@@ -71,52 +96,272 @@ class Vertex(PHX._base._Base):
         * z (float): z position
     """
 
+    __slots__ = ("_range", "_k")
     _count = 0
 
+    # -- Changes to the Vertex data are recorded by its VertexRange
+    __setattr__ = object.__setattr__
+
     def __init__(self, x=0.0, y=0.0, z=0.0):
-        super(Vertex, self).__init__()
-        self.id = self._count
-        self.x = x
-        self.y = y
-        self.z = z
+        # -- Note: the identifier and user_data are only created when used.
+        self._range = PHX.geometry_store.VertexRecord(x, y, z, PHX.id_allocator.next_id(self.__class__))
+        self._k = 0
+
+    @classmethod
+    def _view(cls, _range, _k):
+        # type: (PHX.geometry_store.VertexRange, int) -> Vertex
+        """Returns a new view onto an existing Vertex, without incrementing the running tally."""
+        obj = object.__new__(cls)
+        obj._range = _range
+        obj._k = _k
+        return obj
+
+    @classmethod
+    def _detached(cls, _range, _k):
+        # type: (PHX.geometry_store.VertexRange, int) -> Vertex
+        """Returns a new stand-alone copy of an existing Vertex, without incrementing the running tally."""
+        xyz, id_num, identifier, data = _range.vertex_data(_k)
+        return cls._view(PHX.geometry_store.VertexRecord(xyz[0], xyz[1], xyz[2], id_num, identifier, data), 0)
+
+    @property
+    def x(self):
+        return self._range.coordinate(self._k, 0)
+
+    @x.setter
+    def x(self, _in):
+        self._range.set_coordinate(self._k, 0, _in)
+
+    @property
+    def y(self):
+        return self._range.coordinate(self._k, 1)
+
+    @y.setter
+    def y(self, _in):
+        self._range.set_coordinate(self._k, 1, _in)
+
+    @property
+    def z(self):
+        return self._range.coordinate(self._k, 2)
+
+    @z.setter
+    def z(self, _in):
+        self._range.set_coordinate(self._k, 2, _in)
+
+    @property
+    def id(self):
+        return self._range.get_id(self._k)
+
+    @id.setter
+    def id(self, _in):
+        self._range.set_id(self._k, _in)
+
+    @property
+    def identifier(self):
+        return self._range.get_identifier(self._k)
+
+    @identifier.setter
+    def identifier(self, _in):
+        self._range.set_identifier(self._k, _in)
+
+    @property
+    def user_data(self):
+        return self._range.get_user_data(self._k)
+
+    @user_data.setter
+    def user_data(self, _in):
+        self._range.set_user_data(self._k, _in)
+
+    def __eq__(self, other):
+        if not isinstance(other, Vertex):
+            return NotImplemented
+        return (self._range is other._range and self._k == other._k) or self._range.is_linked(
+            self._k, other._range, other._k
+        )
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(self._range.link_key(self._k))
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Vertex, cls).__new__(cls, *args, **kwargs)
-    
     @classmethod
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Vertex(cls, _dict)
 
-class Polygon(PHX._base._Base):
+
+def _int_axes(_xyz):
+    # type: (tuple[float | int, float | int, float | int]) -> int
+    """Returns the int coordinate flags (1=x, 2=y, 4=z, added together) for the x, y, z values."""
+    return (type(_xyz[0]) is int) | (type(_xyz[1]) is int) << 1 | (type(_xyz[2]) is int) << 2
+
+
+class PolygonVertices(MutableSequence):
+    """The list of a Polygon's Vertices. Reads and writes go straight through to the Polygon's VertexRange.
+
+    Items are Vertex 'views' onto a position in the Polygon. Any Vertex added is copied into the
+    Polygon's range and then becomes a view onto that position. A Vertex which is already part of
+    another Polygon (or of this one) is linked to its new position, so that it stays a single Vertex.
+    """
+
+    __slots__ = ("_range",)
+
+    def __init__(self, _range):
+        # type: (PHX.geometry_store.VertexRange) -> None
+        self._range = _range
+
+    def __len__(self):
+        return len(self._range)
+
+    def __getitem__(self, _i):
+        if isinstance(_i, slice):
+            return [Vertex._view(self._range, k) for k in range(*_i.indices(len(self)))]
+
+        k = _i + len(self) if _i < 0 else _i
+        if not 0 <= k < len(self):
+            raise IndexError("Polygon vertex index out of range")
+        return Vertex._view(self._range, k)
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield Vertex._view(self._range, k)
+
+    def _rewrite(self, _vertices):
+        # type: (list[Vertex]) -> None
+        """Replace all of the Polygon's Vertex data with the data from the Vertices, then bind them to it."""
+
+        coords = array("d")
+        ids = []
+        identifiers = {}
+        user_data = {}
+        int_axes = array("B")
+        sources = {}  # -- The new indices of each Vertex added, by where its data came from
+        for k, vert in enumerate(_vertices):
+            if not isinstance(vert, Vertex):
+                raise VertexTypeError(vert)
+            xyz, id_num, identifier, data = vert._range.vertex_data(vert._k)
+            coords.extend(xyz)
+            ids.append(id_num)
+            if identifier is not None:
+                identifiers[k] = identifier
+            if data is not None:
+                user_data[k] = data
+            int_axes.append(_int_axes(xyz))
+            sources.setdefault((id(vert._range), vert._k), (vert._range, vert._k, []))[2].append(k)
+
+        r = self._range
+        r.replace(coords, ids, identifiers, user_data, int_axes)
+        r.move_links({source_k: new_ks for source, source_k, new_ks in sources.values() if source is r})
+        for source, source_k, new_ks in sources.values():
+            if isinstance(source, PHX.geometry_store.VertexRange) and source is not r:
+                r.link(new_ks[0], source, source_k)
+            for k in new_ks[1:]:
+                r.link(k, r, new_ks[0])
+
+        for k, vert in enumerate(_vertices):
+            vert._range = r
+            vert._k = k
+
+    def __setitem__(self, _i, _value):
+        vertices = list(self)
+        vertices[_i] = _value
+        self._rewrite(vertices)
+
+    def __delitem__(self, _i):
+        vertices = list(self)
+        del vertices[_i]
+        self._rewrite(vertices)
+
+    def insert(self, _i, _value):
+        vertices = list(self)
+        vertices.insert(_i, _value)
+        self._rewrite(vertices)
+
+    def append(self, _value):
+        # -- Fast path: only the new Vertex's data needs to be added
+        r = self._range
+        if r.stop != len(r.store):
+            return self.insert(len(self), _value)
+        if not isinstance(_value, Vertex):
+            raise VertexTypeError(_value)
+
+        xyz, id_num, identifier, data = _value._range.vertex_data(_value._k)
+        r.store.allocate(
+            array("d", xyz),
+            [id_num],
+            {0: identifier} if identifier is not None else None,
+            {0: data} if data is not None else None,
+            array("B", [_int_axes(xyz)]),
+        )
+        r.stop += 1
+        PHX.metrics_cache.changed(r)
+        if isinstance(_value._range, PHX.geometry_store.VertexRange):
+            r.link(len(r) - 1, _value._range, _value._k)
+        _value._range = r
+        _value._k = len(r) - 1
+
+    def pop(self, _i=-1):
+        """Remove the Vertex at the index and return it.
+
+        The Vertex returned is still linked to its positions in any other Polygons. If it
+        has none, it is a new stand-alone Vertex.
+        """
+
+        k = _i + len(self) if _i < 0 else _i
+        if not 0 <= k < len(self):
+            raise IndexError("pop index out of range")
+
+        r = self._range
+        others = [_ for _ in r.positions(k) if _[0] is not r]
+        vertex = Vertex._view(*others[0]) if others else Vertex._detached(r, k)
+        del self[k]
+        return vertex
+
+    def reverse(self):
+        self._rewrite(list(reversed(list(self))))
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, list(self))
+
+
+class Polygon(PHX._base._ValueBase):
     """A Single Polygon Object, part of a Component
 
+    Polygons are made in large numbers, so they use __slots__, and the identifier,
+    user_data, nVec, idPolyI and children are only made when they are first used.
+
     Attributes:
     -----------
         * id (int): Polygon id number
         * nVec (Vector): The Polygon surface normal Vector
         * idPolyI (list):
         * idVert (list[int]): A list of the Polygon's Vertices' ID numbers
-        * vertices (list[Vertex]): The Polygon's Vertices in a list
+        * vertices (PolygonVertices): The Polygon's Vertices in a list. The data is held in a VertexRange.
         * children (list[int]): A list of the Child Poly IdentNrs (ie: for Windows)
     """
 
-    _count = 10000000 - 1
+    __slots__ = ("id", "_nVec", "_idPolyI", "_vertex_range", "_children")
+    _count_start = 10000000 - 1
+    _count = _count_start
 
     def __init__(self):
         super(Polygon, self).__init__()
-        self.id = self._count
-        self._nVec = Vector()
-        self._area = None
-        self.idPolyI = []
-        self.vertices = []
-        self.children = []  # IdentNr of the children
-
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Polygon, cls).__new__(cls, *args, **kwargs)
+        self.id = PHX.id_allocator.next_id(self.__class__)
+        self._vertex_range = PHX.geometry_store.VertexRange()
 
     @staticmethod
     def det_matrix(a):
@@ -141,38 +386,48 @@ class Polygon(PHX._base._Base):
 
         return Vector(x / magnitude, y / magnitude, z / magnitude)
 
+    @property
+    def _metrics(self):
+        # type: () -> PHX.geometry_kernel.PolygonMetrics
+        """The Polygon's area, normal and centroid, as held in its VertexStore."""
+        r = self._vertex_range
+        return r.store.polygon_metrics(r.start, r.stop)
+
     @property
     def area(self):
         """The area of the 2D Polygon.
 
-        Taken right from:
-        https://stackoverflow.com/questions/12642256/find-area-of-polygon-from-xyz-coordinates
+        Half the length of the Polygon's Newell normal, see PHX.geometry_kernel. The value
+        is held in the Polygon's VertexStore until any Vertex changes. Geom.update_polygon_metrics()
+        will calculate the areas of all the Geom's Polygons at once.
         """
 
-        if len(self.vertices) < 3:  # not a plane - no area
+        if len(self._vertex_range) < 3:  # not a plane - no area
             return 0
 
-        total = [0, 0, 0]
-        total = Vector(0, 0, 0)
-        for i, vi1 in enumerate(self.vertices):
+        return self._metrics.area
 
-            if i is len(self.vertices) - 1:
-                vi2 = self.vertices[0]
-            else:
-                vi2 = self.vertices[i + 1]
+    @property
+    def normal(self):
+        """The unit normal Vector, calculated from the Polygon's Vertices.
 
-            prod = Vector.cross(vi1, vi2)
+        Note: this is not the same as 'nVec', which is set by the user.
 
-            total.x += prod.x
-            total.y += prod.y
-            total.z += prod.z
+        Returns:
+        --------
+            * (Vector): The calculated normal. (0, 0, 0) if the Polygon has no area.
+        """
+        return Vector(*self._metrics.normal)
 
-        result = Vector.dot(
-            total,
-            self.unit_normal_vector(self.vertices[0], self.vertices[1], self.vertices[2]),
-        )
+    @property
+    def centroid(self):
+        """The area-weighted centroid of the Polygon.
 
-        return abs(result / 2)
+        Returns:
+        --------
+            * (Vector): The x, y, z position of the centroid.
+        """
+        return Vector(*self._metrics.centroid)
 
     @property
     def nVec(self):
@@ -182,7 +437,11 @@ class Polygon(PHX._base._Base):
         --------
             * (Vector): The polygon's Surface Normal
         """
-        return self._nVec
+        try:
+            return self._nVec
+        except AttributeError:
+            self._nVec = Vector()
+            return self._nVec
 
     @nVec.setter
     def nVec(self, _in):
@@ -191,6 +450,66 @@ class Polygon(PHX._base._Base):
 
         self._nVec = _in
 
+    @property
+    def idPolyI(self):
+        # type: () -> list
+        try:
+            return self._idPolyI
+        except AttributeError:
+            self._idPolyI = []
+            return self._idPolyI
+
+    @idPolyI.setter
+    def idPolyI(self, _in):
+        self._idPolyI = _in
+
+    @property
+    def children(self):
+        # type: () -> list[int]
+        """IdentNr of the children"""
+        try:
+            return self._children
+        except AttributeError:
+            self._children = []
+            return self._children
+
+    @children.setter
+    def children(self, _in):
+        self._children = _in
+
+    @property
+    def vertices(self):
+        # type: () -> PolygonVertices
+        return PolygonVertices(self._vertex_range)
+
+    @vertices.setter
+    def vertices(self, _in):
+        # type: (list[Vertex]) -> None
+        PolygonVertices(self._vertex_range)._rewrite(list(_in))
+
+    @property
+    def vertex_coordinates(self):
+        # type: () -> array
+        """
+        Returns:
+        --------
+            * array[float]: A copy of the Polygon's flat Vertex coordinates (x0, y0, z0, x1, y1, z1, ...)
+        """
+        r = self._vertex_range
+        return r.store.coords[r.start * 3 : r.stop * 3]
+
+    @property
+    def vertex_values(self):
+        # type: () -> array | list[float | int]
+        """
+        Returns:
+        --------
+            * array[float] | list[float | int]: The same as 'vertex_coordinates', but with the
+                coordinates which were set as ints given back as ints.
+        """
+        r = self._vertex_range
+        return r.store.coordinate_values(r.start, r.stop)
+
     @property
     def idVert(self):
         """
@@ -198,7 +517,8 @@ class Polygon(PHX._base._Base):
         --------
             * list[int]: A list of the Polygon's Vertex ID numbers
         """
-        return [vert.id for vert in self.vertices]
+        r = self._vertex_range
+        return r.store.id_values(r.start, r.stop)
 
     def add_children(self, _child_polys):
         # type: (list[Polygon]) -> None
@@ -222,7 +542,29 @@ class Polygon(PHX._base._Base):
                 continue
 
             self.children.append(child_poly.id)
+        PHX.metrics_cache.changed(self)
     
     @classmethod
     def from_dict(cls, _dict):
-        return PHX.serialization.from_dict._Polygon(cls, _dict)
\ No newline at end of file
+        return PHX.serialization.from_dict._Polygon(cls, _dict)
+
+
+def update_polygon_metrics(_polygons):
+    # type: (Iterable[Polygon]) -> None
+    """Calculate the area, normal and centroid of all the Polygons together, in one batch per VertexStore.
+
+    The values are held in each VertexStore until its coordinates change, and are then
+    used by Polygon.area, Polygon.normal and Polygon.centroid.
+
+    Arguments:
+    ----------
+        * _polygons (Iterable[Polygon]): The Polygons to calculate.
+    """
+
+    stores = {}
+    for poly in _polygons:
+        r = poly._vertex_range
+        stores.setdefault(id(r.store), (r.store, []))[1].append((r.start, r.stop))
+
+    for store, ranges in stores.values():
+        store.update_polygon_metrics(ranges)
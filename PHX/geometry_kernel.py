@@ -0,0 +1,500 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 2.7 -*-
+
+"""
+Polygon area, normal and centroid calculations, on flat Vertex coordinates.
+
+The coordinates are the flat (x0, y0, z0, x1, y1, z1, ...) array of a
+PHX.geometry_store.VertexStore, and each Polygon is a (start, stop) range of
+Vertex positions in it. batch_polygon_metrics() calculates the values for many
+Polygons (ie: all of a BldgSegment's) in one NumPy pass. If NumPy isn't available
+(ie: IronPython in Rhino) each Polygon is calculated in turn, in pure Python.
+
+Normals use Newell's method, so they are correct for any planar Polygon, convex or
+not, whatever the order of its first three Vertices. The area is half the length of
+the (non-unit) Newell normal. The centroid is the area-weighted centroid of the
+Polygon's surface, or the average of its Vertices if it has no area.
+
+point_polygon_distance() finds the shortest distance from a point to anywhere on a
+Polygon's surface, used by PHX.spatial_index for nearest-Polygon queries.
+
+weld_vertices() finds the Vertices which are at the same point (within a tolerance),
+using a spatial hash grid, so that they can be written out as a single Vertex.
+
+merge_coplanar_polygons() finds the groups of neighbouring Polygons in the same plane,
+and the single outline around each, so they can be written out as a single Polygon.
+"""
+
+from array import array
+from collections import namedtuple
+from math import floor, sqrt
+
+try:
+    import numpy as np
+except ImportError:  # ie: IronPython in Rhino
+    np = None
+
+
+# -- The smallest batch of Polygons worth calculating with NumPy
+NUMPY_MIN_POLYGONS = 16
+
+
+class WeldToleranceError(Exception):
+    def __init__(self, _in):
+        self.message = "Error: The Vertex welding tolerance must be greater than 0. Got: {}".format(_in)
+        super(WeldToleranceError, self).__init__(self.message)
+
+
+class PolygonMetrics(namedtuple("PolygonMetrics", ["area", "normal", "centroid"])):
+    """The calculated values for one Polygon.
+
+    Attributes:
+    -----------
+        * area (float): The Polygon's surface area.
+        * normal (tuple[float, float, float]): The unit normal. (0, 0, 0) if the Polygon has no area.
+        * centroid (tuple[float, float, float]): The area-weighted centroid.
+    """
+
+    __slots__ = ()
+
+
+def _vertex_average(_coords, _start, _stop):
+    # type: (array, int, int) -> tuple[float, float, float]
+    num_verts = _stop - _start
+    if not num_verts:
+        return (0.0, 0.0, 0.0)
+    xyz = _coords[_start * 3 : _stop * 3]
+    return (sum(xyz[0::3]) / num_verts, sum(xyz[1::3]) / num_verts, sum(xyz[2::3]) / num_verts)
+
+
+def polygon_metrics(_coords, _start, _stop):
+    # type: (array, int, int) -> PolygonMetrics
+    """Returns the area, unit normal and centroid of a single Polygon, in pure Python.
+
+    Arguments:
+    ----------
+        * _coords (array[float]): The flat x, y, z coordinates of all the Vertices.
+        * _start (int): The position of the Polygon's first Vertex.
+        * _stop (int): The position after the Polygon's last Vertex.
+
+    Returns:
+    --------
+        * (PolygonMetrics): The Polygon's area, normal and centroid.
+    """
+
+    num_verts = _stop - _start
+    if num_verts < 3:  # not a plane - no area
+        return PolygonMetrics(0.0, (0.0, 0.0, 0.0), _vertex_average(_coords, _start, _stop))
+
+    xyz = _coords[_start * 3 : _stop * 3]
+
+    # -- Newell's method
+    nx = ny = nz = 0.0
+    for i in range(num_verts):
+        j = (i + 1) % num_verts
+        ax, ay, az = xyz[i * 3 : i * 3 + 3]
+        bx, by, bz = xyz[j * 3 : j * 3 + 3]
+        nx += (ay - by) * (az + bz)
+        ny += (az - bz) * (ax + bx)
+        nz += (ax - bx) * (ay + by)
+
+    magnitude = (nx ** 2 + ny ** 2 + nz ** 2) ** 0.5
+    if not magnitude:
+        return PolygonMetrics(0.0, (0.0, 0.0, 0.0), _vertex_average(_coords, _start, _stop))
+    ux, uy, uz = nx / magnitude, ny / magnitude, nz / magnitude
+
+    # -- Fan of triangles from the first Vertex, weighted by their area (signed, along the normal)
+    ox, oy, oz = xyz[0:3]
+    total_weight = cx = cy = cz = 0.0
+    for i in range(1, num_verts - 1):
+        ax, ay, az = xyz[i * 3 : i * 3 + 3]
+        bx, by, bz = xyz[i * 3 + 3 : i * 3 + 6]
+        ax, ay, az = ax - ox, ay - oy, az - oz
+        bx, by, bz = bx - ox, by - oy, bz - oz
+        weight = (ay * bz - az * by) * ux + (az * bx - ax * bz) * uy + (ax * by - ay * bx) * uz
+
+        total_weight += weight
+        cx += weight * (ax + bx)
+        cy += weight * (ay + by)
+        cz += weight * (az + bz)
+
+    if not total_weight:
+        centroid = _vertex_average(_coords, _start, _stop)
+    else:
+        centroid = (
+            ox + cx / (3 * total_weight),
+            oy + cy / (3 * total_weight),
+            oz + cz / (3 * total_weight),
+        )
+
+    return PolygonMetrics(magnitude / 2, (ux, uy, uz), centroid)
+
+
+def _batch_polygon_metrics_numpy(_coords, _ranges):
+    # type: (array, list[tuple[int, int]]) -> list[PolygonMetrics]
+    """NumPy version of batch_polygon_metrics(), for ranges with 3 or more Vertices only."""
+
+    points = np.frombuffer(_coords, dtype=np.float64).reshape(-1, 3)
+    starts = np.array([r[0] for r in _ranges], dtype=np.intp)
+    counts = np.array([r[1] - r[0] for r in _ranges], dtype=np.intp)
+    offsets = np.zeros(len(counts), dtype=np.intp)
+    np.cumsum(counts[:-1], out=offsets[1:])
+
+    # -- Every edge (a -> b) of every Polygon, end to end. Each Polygon's last edge closes back to its start.
+    a_index = np.arange(counts.sum(), dtype=np.intp) + np.repeat(starts - offsets, counts)
+    b_index = a_index + 1
+    b_index[offsets + counts - 1] = starts
+    a = points[a_index]
+    b = points[b_index]
+
+    # -- Newell's method
+    edge_normals = np.empty_like(a)
+    edge_normals[:, 0] = (a[:, 1] - b[:, 1]) * (a[:, 2] + b[:, 2])
+    edge_normals[:, 1] = (a[:, 2] - b[:, 2]) * (a[:, 0] + b[:, 0])
+    edge_normals[:, 2] = (a[:, 0] - b[:, 0]) * (a[:, 1] + b[:, 1])
+    normals = np.add.reduceat(edge_normals, offsets, axis=0)
+    magnitudes = np.sqrt((normals ** 2).sum(axis=1))
+    has_area = magnitudes > 0
+    unit_normals = np.zeros_like(normals)
+    unit_normals[has_area] = normals[has_area] / magnitudes[has_area, None]
+
+    # -- Each edge with the Polygon's first Vertex makes one triangle of a fan. The first and last are empty.
+    origins = np.repeat(points[starts], counts, axis=0)
+    a -= origins
+    b -= origins
+    weights = (np.cross(a, b) * np.repeat(unit_normals, counts, axis=0)).sum(axis=1)
+    total_weights = np.add.reduceat(weights, offsets)
+    weighted = np.add.reduceat((a + b) * weights[:, None], offsets, axis=0)
+
+    has_weight = total_weights != 0
+    centroids = np.add.reduceat(a, offsets, axis=0) / counts[:, None]  # -- Vertex average, if no area
+    centroids[has_weight] = weighted[has_weight] / (3 * total_weights[has_weight, None])
+    centroids += points[starts]
+
+    return [
+        PolygonMetrics(area, tuple(normal), tuple(centroid))
+        for area, normal, centroid in zip((magnitudes / 2).tolist(), unit_normals.tolist(), centroids.tolist())
+    ]
+
+
+def batch_polygon_metrics(_coords, _ranges):
+    # type: (array, list[tuple[int, int]]) -> list[PolygonMetrics]
+    """Returns the area, unit normal and centroid of many Polygons, calculated together.
+
+    Arguments:
+    ----------
+        * _coords (array[float]): The flat x, y, z coordinates of all the Vertices.
+        * _ranges (list[tuple[int, int]]): The (start, stop) Vertex positions of each Polygon.
+
+    Returns:
+    --------
+        * (list[PolygonMetrics]): The values for each Polygon, in the same order as the ranges.
+    """
+
+    # -- For only a few Polygons, the NumPy set-up costs more than it saves
+    if np is None or len(_ranges) < NUMPY_MIN_POLYGONS:
+        return [polygon_metrics(_coords, start, stop) for start, stop in _ranges]
+
+    # -- Polygons without at least 3 Vertices have no area, and would be empty 'reduceat' groups
+    results = [None] * len(_ranges)
+    planes = []
+    for i, (start, stop) in enumerate(_ranges):
+        if stop - start < 3:
+            results[i] = polygon_metrics(_coords, start, stop)
+        else:
+            planes.append(i)
+
+    if planes:
+        for i, metrics in zip(planes, _batch_polygon_metrics_numpy(_coords, [_ranges[i] for i in planes])):
+            results[i] = metrics
+
+    return results
+
+
+def _point_segment_distance_2(_p, _a, _b):
+    # type: (tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]) -> float
+    """Returns the squared distance from point p to the line segment a-b."""
+
+    abx, aby, abz = _b[0] - _a[0], _b[1] - _a[1], _b[2] - _a[2]
+    apx, apy, apz = _p[0] - _a[0], _p[1] - _a[1], _p[2] - _a[2]
+    length_2 = abx * abx + aby * aby + abz * abz
+    t = 0.0 if not length_2 else max(0.0, min(1.0, (apx * abx + apy * aby + apz * abz) / length_2))
+
+    dx, dy, dz = apx - t * abx, apy - t * aby, apz - t * abz
+    return dx * dx + dy * dy + dz * dz
+
+
+def point_polygon_distance(_coords, _start, _stop, _normal, _point):
+    # type: (array, int, int, tuple[float, float, float], tuple[float, float, float]) -> float
+    """Returns the shortest distance from a point to the surface of a planar Polygon.
+
+    Arguments:
+    ----------
+        * _coords (array[float]): The flat x, y, z coordinates of all the Vertices.
+        * _start (int): The position of the Polygon's first Vertex.
+        * _stop (int): The position after the Polygon's last Vertex.
+        * _normal (tuple[float, float, float]): The Polygon's unit normal (see polygon_metrics).
+        * _point (tuple[float, float, float]): The x, y, z point to measure from.
+
+    Returns:
+    --------
+        * (float): The distance. Infinity if the Polygon has no Vertices.
+    """
+
+    num_verts = _stop - _start
+    if not num_verts:
+        return float("inf")
+
+    xyz = _coords[_start * 3 : _stop * 3]
+    points = [tuple(xyz[i * 3 : i * 3 + 3]) for i in range(num_verts)]
+    nx, ny, nz = _normal
+
+    if any(_normal):
+        # -- If the point is 'over' the Polygon, the distance is straight to its plane.
+        ox, oy, oz = points[0]
+        height = (_point[0] - ox) * nx + (_point[1] - oy) * ny + (_point[2] - oz) * nz
+
+        # -- Drop the normal's largest axis, and test the point in the remaining 2D plane
+        drop = max(range(3), key=lambda i: abs(_normal[i]))
+        u, v = [i for i in range(3) if i != drop]
+        pu, pv = _point[u], _point[v]
+        inside = False
+        for i in range(num_verts):
+            au, av = points[i][u], points[i][v]
+            bu, bv = points[i - 1][u], points[i - 1][v]
+            if (av > pv) != (bv > pv) and pu < (bu - au) * (pv - av) / (bv - av) + au:
+                inside = not inside
+
+        if inside:
+            return abs(height)
+
+    # -- Otherwise, it is to the nearest edge
+    return min(_point_segment_distance_2(_point, points[i - 1], points[i]) for i in range(num_verts)) ** 0.5
+
+
+def weld_vertices(_coords, _ranges, _tolerance):
+    # type: (array, list[tuple[int, int]], float) -> list[int]
+    """Find the Vertices which are within the tolerance of an earlier Vertex, in O(n).
+
+    Vertices are hashed into a grid of cubes, the size of the tolerance, so each Vertex
+    only needs to be checked against the ones in its own and the 26 neighbouring cubes.
+    Each Vertex is welded to the first earlier Vertex within the tolerance, unless that
+    Vertex is already used by the same Polygon (which would repeat a point in the Polygon).
+
+    Arguments:
+    ----------
+        * _coords (array[float]): The flat x, y, z coordinates of all the Vertices.
+        * _ranges (list[tuple[int, int]]): The (start, stop) Vertex positions of each Polygon.
+        * _tolerance (float): The max distance between two Vertices at the 'same' point.
+
+    Returns:
+    --------
+        * (list[int]): For every Vertex in the ranges (counting from 0, in order), the index
+            of the Vertex it is welded to. This is its own index if it is not welded.
+    """
+
+    if not _tolerance > 0:
+        raise WeldToleranceError(_tolerance)
+
+    scale = 1.0 / _tolerance
+    max_distance = _tolerance * _tolerance
+    # -- A Vertex's own cell first, since coincident Vertices are almost always in the same one
+    neighbours = sorted(((i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)), key=any)
+
+    grid = {}  # -- cell -> the index of each un-welded Vertex in it
+    points = []  # -- (x, y, z) of each Vertex, by index
+    polygons = {}  # -- un-welded Vertex index -> the Polygons using it
+    welded_to = []
+
+    for polygon, (start, stop) in enumerate(_ranges):
+        for position in range(start, stop):
+            x, y, z = _coords[position * 3 : position * 3 + 3]
+            cx, cy, cz = int(floor(x * scale)), int(floor(y * scale)), int(floor(z * scale))
+
+            target = None
+            for i, j, k in neighbours:
+                for index in grid.get((cx + i, cy + j, cz + k), ()):
+                    px, py, pz = points[index]
+                    if (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2 > max_distance:
+                        continue
+                    if polygon in polygons[index]:
+                        continue
+                    target = index
+                    break
+                if target is not None:
+                    break
+
+            index = len(points)
+            points.append((x, y, z))
+            if target is None:
+                grid.setdefault((cx, cy, cz), []).append(index)
+                polygons[index] = {polygon}
+                welded_to.append(index)
+            else:
+                polygons[target].add(polygon)
+                welded_to.append(target)
+
+    return welded_to
+
+
+def _is_collinear(_coords, _a, _b, _c, _tolerance):
+    # type: (array, int, int, int, float) -> bool
+    """Returns True if Vertex b is on the straight line from Vertex a to c (within the tolerance)."""
+    ax, ay, az = _coords[_a * 3 : _a * 3 + 3]
+    bx, by, bz = _coords[_b * 3 : _b * 3 + 3]
+    cx, cy, cz = _coords[_c * 3 : _c * 3 + 3]
+    ux, uy, uz = bx - ax, by - ay, bz - az
+    vx, vy, vz = cx - ax, cy - ay, cz - az
+
+    length_2 = vx * vx + vy * vy + vz * vz
+    if ux * vx + uy * vy + uz * vz <= 0 or ux * ux + uy * uy + uz * uz >= length_2:
+        return False  # -- b is not between a and c
+
+    # -- The distance from b to the line, from the cross product
+    wx, wy, wz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+    return wx * wx + wy * wy + wz * wz <= _tolerance * _tolerance * length_2
+
+
+def _outline(_edges):
+    # type: (list[tuple[int, int]]) -> list[int] | None
+    """Returns the Vertices of the single closed loop made by the edges, or None if they make more than one."""
+    next_vertex = {}
+    for a, b in _edges:
+        if a in next_vertex:
+            return None  # -- Two loops touch at a corner
+        next_vertex[a] = b
+
+    start = _edges[0][0]
+    loop = [start]
+    while next_vertex[loop[-1]] != start:
+        loop.append(next_vertex[loop[-1]])
+        if len(loop) > len(_edges):
+            return None
+    if len(loop) != len(_edges):
+        return None  # -- More than one loop (ie: a hole)
+    return loop
+
+
+def merge_coplanar_polygons(_coords, _ranges, _tolerance):
+    # type: (array, list[tuple[int, int]], float) -> list[tuple[list[int], list[int]]]
+    """Find the groups of coplanar Polygons which share edges, and the single outline around each group.
+
+    Polygons are joined if they face the same way, are in the same plane, and share a
+    whole edge (running in opposite directions, as for any two neighbouring faces of a
+    surface). The shared edges are then removed, and the ones left over make the
+    outline. Vertices in the middle of a straight run of the outline are left out.
+
+    A group is not merged if the edges left over do not make a single loop (ie: the
+    Polygons go all the way around a hole) or if the outline's area is not the total of
+    the Polygons' areas (ie: some of them overlap).
+
+    Arguments:
+    ----------
+        * _coords (array[float]): The flat x, y, z coordinates of all the Vertices.
+        * _ranges (list[tuple[int, int]]): The (start, stop) Vertex positions of each Polygon.
+        * _tolerance (float): The max distance between two Vertices at the 'same' point, and out of the plane.
+
+    Returns:
+    --------
+        * (list[tuple[list[int], list[int]]]): For each group of 2 or more Polygons to merge: the
+            numbers of the Polygons (in order) and the Vertex positions of the new outline.
+    """
+
+    metrics = batch_polygon_metrics(_coords, _ranges)
+    welded_to = weld_vertices(_coords, _ranges, _tolerance)
+
+    # -- The Vertex position of each welded point, so that shared edges have the same ends
+    positions = [p for start, stop in _ranges for p in range(start, stop)]
+    point = [positions[i] for i in welded_to]
+
+    polygon_edges = []
+    edge_owner = {}  # -- (a, b) -> the Polygon using the edge
+    offset = 0
+    for polygon, (start, stop) in enumerate(_ranges):
+        ends = point[offset : offset + stop - start]
+        offset += stop - start
+        if metrics[polygon].area <= _tolerance * _tolerance:
+            polygon_edges.append([])
+            continue
+
+        polygon_edges.append([(a, b) for a, b in zip(ends, ends[1:] + ends[:1]) if a != b])
+        for edge in polygon_edges[-1]:
+            edge_owner.setdefault(edge, polygon)
+
+    def coplanar(_p, _q):
+        n, c = metrics[_p].normal, metrics[_q].centroid
+        if abs(sum(a * b for a, b in zip(n, metrics[_q].normal)) - 1.0) > _tolerance:
+            return False
+        return abs(sum(a * (b - d) for a, b, d in zip(n, c, metrics[_p].centroid))) <= _tolerance
+
+    # -- Join the Polygons into groups (union-find)
+    parent = list(range(len(_ranges)))
+
+    def root(_p):
+        while parent[_p] != _p:
+            parent[_p] = parent[parent[_p]]
+            _p = parent[_p]
+        return _p
+
+    for polygon, polygon_edge_list in enumerate(polygon_edges):
+        for a, b in polygon_edge_list:
+            other = edge_owner.get((b, a))
+            if other is None or other == polygon or root(other) == root(polygon):
+                continue
+            if coplanar(polygon, other):
+                parent[max(root(polygon), root(other))] = min(root(polygon), root(other))
+
+    groups = {}
+    for polygon in range(len(_ranges)):
+        groups.setdefault(root(polygon), []).append(polygon)
+
+    merged = []
+    for group in sorted(groups.values()):
+        if len(group) < 2:
+            continue
+
+        # -- Remove the shared edges
+        remaining = {}
+        for polygon in group:
+            for a, b in polygon_edges[polygon]:
+                if remaining.get((b, a)):
+                    remaining[(b, a)] -= 1
+                else:
+                    remaining[(a, b)] = remaining.get((a, b), 0) + 1
+        outline_edges = [e for p in group for e in polygon_edges[p] if remaining.get(e)]
+        if not outline_edges or any(n > 1 for n in remaining.values()):
+            continue
+
+        loop = _outline(outline_edges)
+        if loop is None:
+            continue
+
+        # -- Leave out the Vertices in the middle of a straight run
+        simplified = list(loop)
+        changed = True
+        while changed and len(simplified) > 3:
+            changed = False
+            for i in range(len(simplified)):
+                a, b, c = simplified[i - 1], simplified[i], simplified[(i + 1) % len(simplified)]
+                if _is_collinear(_coords, a, b, c, _tolerance):
+                    del simplified[i]
+                    changed = True
+                    break
+
+        # -- Check the outline covers the same area (no overlaps). Each Vertex left out
+        # -- can change the area by up to the tolerance times the length of its run.
+        outline_coords = array("d")
+        for p in simplified:
+            outline_coords.extend(_coords[p * 3 : p * 3 + 3])
+        area = polygon_metrics(outline_coords, 0, len(simplified)).area
+        total = sum(metrics[p].area for p in group)
+        perimeter = sum(
+            sqrt(sum((_coords[a * 3 + i] - _coords[b * 3 + i]) ** 2 for i in range(3)))
+            for a, b in zip(loop, loop[1:] + loop[:1])
+        )
+        if abs(area - total) > _tolerance * perimeter + 1e-9 * total:
+            continue
+
+        merged.append((group, simplified))
+
+    return merged
@@ -0,0 +1,698 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 2.7 -*-
+
+"""
+Compact storage for Vertex data.
+
+All of the Vertex coordinates are held in a single flat, contiguous, float64 array
+(x0, y0, z0, x1, y1, z1, ...) with the Vertex id-numbers in a matching int array. Each
+Polygon's Vertices are a single VertexRange (start, stop) in a VertexStore, and a
+PHX.geometry.Vertex is only a light 'view' onto one position in a VertexRange.
+
+Every Polygon starts out with its own small store. When the Polygon is added to a
+Geom (a BldgSegment's geometry), its range is moved into the Geom's store, so that
+all the Vertices of the segment are together in one array and can be operated on
+in bulk (translate, scale, area, ...).
+
+The Vertex 'identifier' (uuid) and 'user_data' are only created when they are first
+used, and are held in the store's sparse dicts. Coordinates which were set as ints are
+flagged in a byte array (one byte per Vertex), and are read back as ints.
+
+A stand-alone Vertex, which is not part of any Polygon yet, holds its data in a small
+VertexRecord instead. A Vertex added to more than one Polygon has its data in each of
+the Polygons' ranges, and the positions are joined by a VertexLink so that changing
+the Vertex through any of them changes them all.
+
+Each Polygon's area, normal and centroid (PHX.geometry_kernel.PolygonMetrics) are kept
+in the store once calculated, and are all thrown away as soon as any of the store's
+coordinates change. Their hits and misses are counted as "Polygon.metrics" in PHX.metrics_cache.
+"""
+
+import uuid
+import weakref
+from array import array
+
+import PHX.geometry_kernel
+import PHX.metrics_cache
+
+try:
+    import numpy as np
+except ImportError:  # ie: IronPython in Rhino
+    np = None
+
+
+_METRICS_STATS = PHX.metrics_cache.get_stats("Polygon.metrics")
+
+
+class NumpyNotAvailableError(Exception):
+    def __init__(self):
+        self.message = "Error: NumPy is required for this operation but could not be imported."
+        super(NumpyNotAvailableError, self).__init__(self.message)
+
+
+def coordinates_as_array(_coords, _start=0, _stop=None):
+    # type: (array, int, int | None) -> np.ndarray
+    """Returns a copy of the flat x, y, z coordinates (for Vertex _start to _stop) as an (n, 3) NumPy array.
+
+    Raises:
+    -------
+        * NumpyNotAvailableError: If NumPy can't be imported.
+    """
+
+    if np is None:
+        raise NumpyNotAvailableError()
+
+    stop = len(_coords) // 3 if _stop is None else _stop
+    return np.frombuffer(_coords, dtype=np.float64)[_start * 3 : stop * 3].reshape(-1, 3).copy()
+
+
+def _id_array(_ids):
+    # type: (Iterable) -> array | list
+    """Returns the id-numbers as an int array, or as a list if any of them is not an int (ie: None)."""
+
+    ids = _ids if isinstance(_ids, (list, tuple, array)) else list(_ids)
+    if isinstance(ids, array) or all(type(_) is int for _ in ids):
+        try:
+            return array("l", ids)
+        except OverflowError:
+            pass
+    return list(ids)
+
+
+class VertexStore(object):
+    """Flat, contiguous storage for the coordinates and ids of many Vertices.
+
+    Attributes:
+    -----------
+        * coords (array[float]): The x, y, z coordinates of every Vertex, one after the other.
+        * ids (array[int] | list): The id-number of every Vertex. A list, once any id is not an int.
+        * identifiers (dict[int, uuid.UUID]): The identifiers created so far, by Vertex position.
+        * user_data (dict[int, dict]): The user_data dicts created so far, by Vertex position.
+        * int_axes (array[int]): The coordinates set as ints, for every Vertex: 1=x, 2=y, 4=z, added together.
+        * version (int): Incremented every time any of the coordinates change.
+        * garbage (int): The number of positions which are no longer used by any range.
+        * metrics (dict[tuple[int, int], PolygonMetrics]): The Polygon values calculated so far, by range.
+        * metrics_version (int): The store version the metrics were calculated for.
+    """
+
+    __slots__ = (
+        "coords",
+        "ids",
+        "identifiers",
+        "user_data",
+        "int_axes",
+        "version",
+        "garbage",
+        "metrics",
+        "metrics_version",
+    )
+
+    def __init__(self, _coords=(), _ids=()):
+        self.coords = array("d", _coords)
+        self.ids = _id_array(_ids)
+        self.identifiers = {}
+        self.user_data = {}
+        self.int_axes = array("B", [0]) * len(self.ids)
+        self.version = 0
+        self.garbage = 0
+        self.metrics = {}
+        self.metrics_version = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        # type: () -> int
+        """The size of the coordinate array, in bytes."""
+        return self.coords.itemsize * len(self.coords)
+
+    def allocate(self, _coords, _ids, _identifiers=None, _user_data=None, _int_axes=None):
+        # type: (array, list, dict, dict, array) -> int
+        """Add a block of new Vertices to the end of the store.
+
+        Arguments:
+        ----------
+            * _coords (array[float]): The flat x, y, z coordinates of the new Vertices.
+            * _ids (list[int]): The id-number for each of the new Vertices.
+            * _identifiers (dict[int, uuid.UUID]): Optional identifiers, by position in the new block.
+            * _user_data (dict[int, dict]): Optional user_data, by position in the new block.
+            * _int_axes (array[int]): Optional int coordinate flags, for each of the new Vertices.
+
+        Returns:
+        --------
+            * (int): The position of the first new Vertex in the store.
+        """
+
+        start = len(self.ids)
+        ids = _id_array(_ids)
+        if type(ids) is list and type(self.ids) is not list:
+            self.ids = list(self.ids)
+        self.coords.extend(_coords)
+        self.ids.extend(ids)
+        if _int_axes:
+            self.int_axes.extend(_int_axes)
+        else:
+            self.int_axes.extend(array("B", [0]) * len(ids))
+
+        for i, identifier in (_identifiers or {}).items():
+            self.identifiers[start + i] = identifier
+        for i, data in (_user_data or {}).items():
+            self.user_data[start + i] = data
+
+        self.touch()
+        return start
+
+    def release(self, _start, _stop):
+        # type: (int, int) -> None
+        """Mark the positions as no longer in use, and drop their identifiers and user_data."""
+
+        self.garbage += _stop - _start
+        for i in range(_start, _stop):
+            self.identifiers.pop(i, None)
+            self.user_data.pop(i, None)
+
+    def extract(self, _start, _stop):
+        # type: (int, int) -> tuple[array, array | list, dict, dict, array]
+        """Returns a copy of the data for a block of Vertices: coords, ids, identifiers, user_data and int_axes.
+
+        The identifiers and user_data are keyed by position in the block.
+        """
+
+        identifiers = {i - _start: self.identifiers[i] for i in range(_start, _stop) if i in self.identifiers}
+        user_data = {i - _start: self.user_data[i] for i in range(_start, _stop) if i in self.user_data}
+
+        return (
+            self.coords[_start * 3 : _stop * 3],
+            self.ids[_start:_stop],
+            identifiers,
+            user_data,
+            self.int_axes[_start:_stop],
+        )
+
+    def coordinate(self, _i, _axis):
+        # type: (int, int) -> float | int
+        """Returns one coordinate of the Vertex at position _i. An int, if it was set as an int."""
+
+        value = self.coords[_i * 3 + _axis]
+        if self.int_axes[_i] & (1 << _axis):
+            return int(value)
+        return value
+
+    def set_coordinate(self, _i, _axis, _value):
+        # type: (int, int, float | int) -> None
+        """Set one coordinate of the Vertex at position _i."""
+
+        self.coords[_i * 3 + _axis] = _value
+        axes = self.int_axes[_i] & ~(1 << _axis)
+        if type(_value) is int:
+            axes |= 1 << _axis
+        self.int_axes[_i] = axes
+        self.touch()
+
+    def set_id(self, _i, _value):
+        # type: (int, int) -> None
+        """Set the id-number of the Vertex at position _i."""
+
+        if type(_value) is not int and type(self.ids) is not list:
+            self.ids = list(self.ids)
+        try:
+            self.ids[_i] = _value
+        except OverflowError:
+            self.ids = list(self.ids)
+            self.ids[_i] = _value
+
+    def id_values(self, _start, _stop):
+        # type: (int, int) -> list
+        """Returns the id-numbers of Vertex _start to _stop, as a list."""
+
+        ids = self.ids[_start:_stop]
+        return ids if type(ids) is list else ids.tolist()
+
+    def coordinate_values(self, _start, _stop):
+        # type: (int, int) -> array | list[float | int]
+        """Returns the flat x, y, z coordinates of Vertex _start to _stop, with the ones set as ints as ints."""
+
+        coords = self.coords[_start * 3 : _stop * 3]
+        flags = self.int_axes[_start:_stop]
+        if flags.count(0) == len(flags):
+            return coords
+
+        values = coords.tolist()
+        for k, axes in enumerate(flags):
+            for axis in range(3):
+                if axes & (1 << axis):
+                    j = k * 3 + axis
+                    values[j] = int(values[j])
+        return values
+
+    def as_array(self, _start=0, _stop=None):
+        # type: (int, int | None) -> np.ndarray
+        """Returns a copy of the coordinates (for Vertex _start to _stop) as an (n, 3) NumPy array."""
+        return coordinates_as_array(self.coords, _start, _stop)
+
+    def touch(self):
+        # type: () -> None
+        """Mark the coordinates as changed. Call after any change to the coords array.
+
+        Note: this only clears the store's own Polygon metrics. The code making the change also
+        calls PHX.metrics_cache.changed() with each VertexRange changed.
+        """
+        self.version += 1
+
+    def _current_metrics(self):
+        # type: () -> dict[tuple[int, int], PHX.geometry_kernel.PolygonMetrics]
+        """Returns the metrics dict, after clearing it out if any coordinates have changed since it was filled."""
+        if self.metrics_version != self.version:
+            self.metrics.clear()
+            self.metrics_version = self.version
+        return self.metrics
+
+    def polygon_metrics(self, _start, _stop):
+        # type: (int, int) -> PHX.geometry_kernel.PolygonMetrics
+        """Returns the area, normal and centroid of the Polygon with Vertices _start to _stop.
+
+        The values are calculated (on their own) only if they aren't already in the store.
+        """
+
+        metrics = self._current_metrics()
+        key = (_start, _stop)
+        try:
+            result = metrics[key]
+        except KeyError:
+            _METRICS_STATS.misses += 1
+            result = metrics[key] = PHX.geometry_kernel.polygon_metrics(self.coords, _start, _stop)
+        else:
+            _METRICS_STATS.hits += 1
+
+        return result
+
+    def update_polygon_metrics(self, _ranges):
+        # type: (list[tuple[int, int]]) -> None
+        """Calculate the area, normal and centroid of all the Polygons not already in the store, in one batch.
+
+        Arguments:
+        ----------
+            * _ranges (list[tuple[int, int]]): The (start, stop) Vertex positions of each Polygon.
+        """
+
+        metrics = self._current_metrics()
+        missing = [key for key in _ranges if key not in metrics]
+        if missing:
+            _METRICS_STATS.misses += len(missing)
+            metrics.update(zip(missing, PHX.geometry_kernel.batch_polygon_metrics(self.coords, missing)))
+
+    def transform(self, _start, _stop, _factor=1.0, _offset=(0.0, 0.0, 0.0), _origin=(0.0, 0.0, 0.0)):
+        # type: (int, int, float, tuple[float, float, float], tuple[float, float, float]) -> None
+        """Scale the block of Vertices about an origin, and then move them by the offset.
+
+        The new coordinates are all floats.
+
+        Arguments:
+        ----------
+            * _start (int): The position of the first Vertex.
+            * _stop (int): The position after the last Vertex.
+            * _factor (float): The scale factor.
+            * _offset (tuple[float, float, float]): The x, y, z distance to move.
+            * _origin (tuple[float, float, float]): The x, y, z point to scale about.
+        """
+
+        if _stop <= _start:
+            return
+
+        if np is not None:
+            # -- The buffer view must be released before the array can be resized again
+            view = np.frombuffer(self.coords, dtype=np.float64)[_start * 3 : _stop * 3].reshape(-1, 3)
+            view -= _origin
+            view *= _factor
+            view += np.add(_origin, _offset)
+            del view
+        else:
+            for axis in range(3):
+                s = slice(_start * 3 + axis, _stop * 3, 3)
+                o = _origin[axis]
+                d = o + _offset[axis]
+                self.coords[s] = array("d", ((v - o) * _factor + d for v in self.coords[s]))
+
+        self.int_axes[_start:_stop] = array("B", [0]) * (_stop - _start)
+        self.touch()
+
+
+class VertexRecord(object):
+    """The data of a single stand-alone Vertex, which is not part of any Polygon yet.
+
+    Has the same Vertex methods as a VertexRange (for its only Vertex, k=0), so that a
+    PHX.geometry.Vertex can use either one.
+
+    Attributes:
+    -----------
+        * x (float): x position
+        * y (float): y position
+        * z (float): z position
+        * id (int): The Vertex id-number.
+        * identifier (uuid.UUID | None): The identifier, once created.
+        * user_data (dict | None): The user_data, once created.
+    """
+
+    __slots__ = ("x", "y", "z", "id", "identifier", "user_data")
+
+    def __init__(self, _x, _y, _z, _id, _identifier=None, _user_data=None):
+        self.x = _x
+        self.y = _y
+        self.z = _z
+        self.id = _id
+        self.identifier = _identifier
+        self.user_data = _user_data
+
+    def __len__(self):
+        return 1
+
+    def coordinate(self, _k, _axis):
+        # type: (int, int) -> float | int
+        return (self.x, self.y, self.z)[_axis]
+
+    def set_coordinate(self, _k, _axis, _value):
+        # type: (int, int, float | int) -> None
+        setattr(self, "xyz"[_axis], _value)
+
+    def get_id(self, _k):
+        # type: (int) -> int
+        return self.id
+
+    def set_id(self, _k, _value):
+        # type: (int, int) -> None
+        self.id = _value
+
+    def get_identifier(self, _k):
+        # type: (int) -> uuid.UUID
+        if self.identifier is None:
+            self.identifier = uuid.uuid4()
+        return self.identifier
+
+    def set_identifier(self, _k, _value):
+        # type: (int, uuid.UUID) -> None
+        self.identifier = _value
+
+    def get_user_data(self, _k):
+        # type: (int) -> dict
+        if self.user_data is None:
+            self.user_data = {}
+        return self.user_data
+
+    def set_user_data(self, _k, _value):
+        # type: (int, dict) -> None
+        self.user_data = _value
+
+    def vertex_data(self, _k):
+        # type: (int) -> tuple[tuple[float | int, float | int, float | int], int, uuid.UUID | None, dict | None]
+        return (self.x, self.y, self.z), self.id, self.identifier, self.user_data
+
+    def is_linked(self, _k, _other, _other_k):
+        # type: (int, VertexRange | VertexRecord, int) -> bool
+        return False
+
+    def link_key(self, _k):
+        # type: (int) -> int
+        return id(self)
+
+
+class VertexLink(object):
+    """The positions, in one or more VertexRanges, which all hold the same (shared) Vertex.
+
+    Attributes:
+    -----------
+        * members (list[list]): A [weakref to the VertexRange, k] pair for each position.
+    """
+
+    __slots__ = ("members",)
+
+    def __init__(self):
+        self.members = []
+
+    def __getstate__(self):
+        # -- Weak references can't be pickled
+        return [(r, k) for r, k in self.positions()]
+
+    def __setstate__(self, _state):
+        self.members = [[weakref.ref(r), k] for r, k in _state]
+
+    def add(self, _range, _k):
+        # type: (VertexRange, int) -> None
+        self.members.append([weakref.ref(_range), _k])
+        if _range.links is None:
+            _range.links = {}
+        _range.links[_k] = self
+
+    def discard(self, _range):
+        # type: (VertexRange) -> None
+        """Remove all of the range's positions. The range's own 'links' are left for the caller to reset."""
+        self.members = [_ for _ in self.members if _[0]() is not _range]
+
+    def positions(self):
+        # type: () -> list[tuple[VertexRange, int]]
+        """Returns the (VertexRange, k) of each position, and removes the link once it joins less than 2 positions."""
+
+        positions = []
+        for member in self.members:
+            r = member[0]()
+            if r is not None:
+                positions.append((r, member[1]))
+
+        if len(positions) < 2:
+            self.members = []
+            for r, k in positions:
+                if r.links.get(k) is self:
+                    del r.links[k]
+        elif len(positions) != len(self.members):
+            self.members = [[weakref.ref(r), k] for r, k in positions]
+
+        return positions
+
+
+class VertexRange(object):
+    """A block of positions in a VertexStore, holding one Polygon's Vertices.
+
+    The range is moved (to the end of its store, or to a different store) whenever
+    the block has to grow. Vertex 'views' hold onto the range and their index within
+    it, so they always see the Polygon's current data.
+
+    The methods which take a Vertex index 'k' (coordinate, set_id, ...) read and write a
+    single Vertex. Writes are made to every position linked to the Vertex as well.
+
+    Attributes:
+    -----------
+        * store (VertexStore): The store holding the data.
+        * start (int): The position of the first Vertex in the store.
+        * stop (int): The position after the last Vertex in the store.
+        * links (dict[int, VertexLink] | None): The Vertices shared with other positions, by index in the range.
+    """
+
+    __slots__ = ("store", "start", "stop", "links", "__weakref__")
+
+    def __init__(self, _store=None, _start=0, _stop=0):
+        self.store = _store if _store is not None else VertexStore()
+        self.start = _start
+        self.stop = _stop
+        self.links = None
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def position(self, _k):
+        # type: (int) -> int
+        """Returns the position of Vertex k in the store."""
+
+        i = self.start + _k
+        if not self.start <= i < self.stop:
+            raise IndexError("Vertex index {} is no longer part of its Polygon".format(_k))
+        return i
+
+    def positions(self, _k):
+        # type: (int) -> list[tuple[VertexRange, int]] | tuple[tuple[VertexRange, int]]
+        """Returns the (VertexRange, k) of Vertex k, and of all the positions linked to it."""
+
+        if self.links:
+            link = self.links.get(_k)
+            if link is not None:
+                return link.positions() or ((self, _k),)
+        return ((self, _k),)
+
+    def coordinate(self, _k, _axis):
+        # type: (int, int) -> float | int
+        return self.store.coordinate(self.position(_k), _axis)
+
+    def set_coordinate(self, _k, _axis, _value):
+        # type: (int, int, float | int) -> None
+        for r, k in self.positions(_k):
+            r.store.set_coordinate(r.position(k), _axis, _value)
+            PHX.metrics_cache.changed(r)
+
+    def get_id(self, _k):
+        # type: (int) -> int
+        return self.store.ids[self.position(_k)]
+
+    def set_id(self, _k, _value):
+        # type: (int, int) -> None
+        for r, k in self.positions(_k):
+            r.store.set_id(r.position(k), _value)
+            PHX.metrics_cache.touched(r)
+
+    def get_identifier(self, _k):
+        # type: (int) -> uuid.UUID
+        try:
+            return self.store.identifiers[self.position(_k)]
+        except KeyError:
+            self.set_identifier(_k, uuid.uuid4())
+            return self.store.identifiers[self.position(_k)]
+
+    def set_identifier(self, _k, _value):
+        # type: (int, uuid.UUID) -> None
+        for r, k in self.positions(_k):
+            r.store.identifiers[r.position(k)] = _value
+            PHX.metrics_cache.touched(r)
+
+    def get_user_data(self, _k):
+        # type: (int) -> dict
+        try:
+            return self.store.user_data[self.position(_k)]
+        except KeyError:
+            self.set_user_data(_k, {})
+            return self.store.user_data[self.position(_k)]
+
+    def set_user_data(self, _k, _value):
+        # type: (int, dict) -> None
+        for r, k in self.positions(_k):
+            r.store.user_data[r.position(k)] = _value
+            PHX.metrics_cache.touched(r)
+
+    def vertex_data(self, _k):
+        # type: (int) -> tuple[tuple[float | int, float | int, float | int], int, uuid.UUID | None, dict | None]
+        """Returns Vertex k's (x, y, z), id, identifier and user_data, without creating any new ones."""
+
+        store = self.store
+        i = self.position(_k)
+        return (
+            (store.coordinate(i, 0), store.coordinate(i, 1), store.coordinate(i, 2)),
+            store.ids[i],
+            store.identifiers.get(i),
+            store.user_data.get(i),
+        )
+
+    def is_linked(self, _k, _other, _other_k):
+        # type: (int, VertexRange | VertexRecord, int) -> bool
+        """Returns True if Vertex k and the other range's Vertex _other_k are linked together."""
+        return bool(self.links) and _k in self.links and self.links[_k] is (_other.links or {}).get(_other_k)
+
+    def link_key(self, _k):
+        # type: (int) -> tuple[int, int] | int
+        """Returns a value which is the same for Vertex k and all the positions linked to it."""
+
+        if self.links and _k in self.links:
+            return id(self.links[_k])
+        return (id(self), _k)
+
+    def link(self, _k, _other, _other_k):
+        # type: (int, VertexRange, int) -> None
+        """Link Vertex k to Vertex _other_k of the other range (or this range), so that they are one Vertex.
+
+        The two positions must already hold the same data.
+        """
+
+        if _other is self and _other_k == _k:
+            return
+
+        mine = self.links.get(_k) if self.links else None
+        theirs = _other.links.get(_other_k) if _other.links else None
+        if mine is not None and mine is theirs:
+            return
+
+        if theirs is None:
+            theirs = VertexLink()
+            theirs.add(_other, _other_k)
+        if mine is None:
+            theirs.add(self, _k)
+        else:
+            for r, k in mine.positions():
+                theirs.add(r, k)
+            mine.members = []
+
+    def move_links(self, _moves):
+        # type: (dict[int, list[int]]) -> None
+        """Update the links after the range's Vertices are re-ordered.
+
+        Arguments:
+        ----------
+            * _moves (dict[int, list[int]]): The new indices of each Vertex kept. Vertices
+                not included are no longer part of the range.
+        """
+
+        if not self.links:
+            return
+
+        old_links = self.links
+        self.links = None
+        for link in old_links.values():
+            link.discard(self)
+        for k, link in old_links.items():
+            for new_k in _moves.get(k, ()):
+                link.add(self, new_k)
+        for link in old_links.values():
+            link.positions()
+
+    def sync_links(self):
+        # type: () -> None
+        """Copy the data of each of the range's linked Vertices out to all the other positions linked to it.
+
+        For use after the range's data is changed in bulk (Geom.transform, Geom.weld_vertices, ...).
+        """
+
+        if not self.links:
+            return
+
+        for k, link in list(self.links.items()):
+            xyz, id_num, _, _ = self.vertex_data(k)
+            for r, other_k in link.positions():
+                if r is self and other_k == k:
+                    continue
+                i = r.position(other_k)
+                for axis, value in enumerate(xyz):
+                    r.store.set_coordinate(i, axis, value)
+                r.store.set_id(i, id_num)
+                PHX.metrics_cache.changed(r)
+
+    def extract(self):
+        # type: () -> tuple[array, array | list, dict, dict, array]
+        return self.store.extract(self.start, self.stop)
+
+    def replace(self, _coords, _ids, _identifiers=None, _user_data=None, _int_axes=None, _store=None):
+        # type: (array, list, dict, dict, array, VertexStore | None) -> None
+        """Replace all the data in the range with new data, in the same store or a new one.
+
+        If the range is the last block in its store, the data is re-written in place.
+        Otherwise a new block is added at the end of the store and the old one is released.
+        """
+
+        store = _store if _store is not None else self.store
+        if store is self.store and self.stop == len(store):
+            # -- At the end of the store already, just cut it back off and re-add it
+            self.store.release(self.start, self.stop)
+            self.store.garbage -= self.stop - self.start
+            del self.store.coords[self.start * 3 :]
+            del self.store.ids[self.start :]
+            del self.store.int_axes[self.start :]
+        else:
+            self.store.release(self.start, self.stop)
+
+        self.store = store
+        self.start = store.allocate(_coords, _ids, _identifiers, _user_data, _int_axes)
+        self.stop = self.start + len(_ids)
+        PHX.metrics_cache.changed(self)
+
+    def move_to(self, _store):
+        # type: (VertexStore) -> None
+        """Move the data to the end of another VertexStore."""
+
+        if _store is self.store:
+            return
+
+        self.replace(*self.extract(), _store=_store)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 2.7 -*-
+
+"""
+ID numbers ('IdentNr') for the PHX objects.
+
+By default, each class keeps a running tally in its '_count' class attribute, shared by
+the whole process. To get the same ID numbers every time a project is converted (no
+matter what else has run before, or is running at the same time in another thread) use
+an IDAllocator and an id_scope() around the conversion. Inside the scope, all new objects
+take their ID numbers from the allocator instead of from the class, and each thread has
+its own scope.
+
+To share the numbering with other processes, pass the allocator's state() (a plain dict,
+or current_state() for whichever numbering is in use) along with the work, and re-build the allocator there with IDAllocator(state). Use
+reserve() to give each worker its own block of ID numbers ahead of time.
+
+Usage:
+------
+    >>> allocator = IDAllocator()
+    >>> with id_scope(allocator):
+    ...     seg = PHX.bldg_segment.BldgSegment()
+    >>> seg.id
+    1
+"""
+
+from contextlib import contextmanager
+import threading
+
+# -- Guards the class '_count' attributes, outside of any id_scope()
+_LOCK = threading.Lock()
+_CLASSES = set()
+
+# -- The active IDAllocators, for each thread
+_LOCAL = threading.local()
+
+
+class IDAllocatorError(Exception):
+    def __init__(self, _cls, _count):
+        self.message = "Error: Cannot set the {} count to {}. The count cannot be less than {}.".format(
+            _cls.__name__, _count, start_count(_cls)
+        )
+        super(IDAllocatorError, self).__init__(self.message)
+
+
+def class_key(_cls):
+    # type: (type) -> str
+    """Returns the name used for the class's count. ie: 'PHX.bldg_segment.Zone'"""
+    return "{}.{}".format(_cls.__module__, _cls.__name__)
+
+
+def start_count(_cls):
+    # type: (type) -> int
+    """Returns the count before the class's first object. ID numbers start at 1 more than this."""
+    return getattr(_cls, "_count_start", 0)
+
+
+class IDAllocator(object):
+    """A separate set of running tallies, one for each class, for numbering a single project.
+
+    Arguments:
+    ----------
+        * _state (dict[str, int] | None): Optional counts to start from, as returned by state().
+    """
+
+    def __init__(self, _state=None):
+        # type: (dict[str, int] | None) -> None
+        self._lock = threading.Lock()
+        self._counts = dict(_state or {})  # type: dict[str, int]
+
+    def _current(self, _cls):
+        # type: (type) -> int
+        return self._counts.get(class_key(_cls), start_count(_cls))
+
+    def next_id(self, _cls):
+        # type: (type) -> int
+        """Returns the next ID number for the class."""
+        with self._lock:
+            count = self._current(_cls) + 1
+            self._counts[class_key(_cls)] = count
+            return count
+
+    def reserve(self, _cls, _number):
+        # type: (type, int) -> range
+        """Returns a block of the next ID numbers for the class, so they can be handed out elsewhere.
+
+        Arguments:
+        ----------
+            * _cls (type): The class to reserve the ID numbers for.
+            * _number (int): The number of ID numbers to reserve.
+
+        Returns:
+        --------
+            * (range): The reserved ID numbers. This allocator will not hand them out again.
+        """
+        with self._lock:
+            first = self._current(_cls) + 1
+            self._counts[class_key(_cls)] = first + _number - 1
+            return range(first, first + _number)
+
+    def count(self, _cls):
+        # type: (type) -> int
+        """Returns the last ID number handed out for the class."""
+        with self._lock:
+            return self._current(_cls)
+
+    def set_count(self, _cls, _count):
+        # type: (type, int) -> None
+        """Set the class's count. The next ID number handed out will be _count + 1."""
+        if _count < start_count(_cls):
+            raise IDAllocatorError(_cls, _count)
+        with self._lock:
+            self._counts[class_key(_cls)] = _count
+
+    def reset(self, _cls=None):
+        # type: (type | None) -> None
+        """Start the numbering over, for the class or (if None) for every class."""
+        with self._lock:
+            if _cls is None:
+                self._counts.clear()
+            else:
+                self._counts.pop(class_key(_cls), None)
+
+    def remap(self, _objects):
+        # type: (Iterable[Any]) -> dict[int, int]
+        """Give new ID numbers to existing objects, in order, starting over from the class's first ID number.
+
+        Use this to number objects made elsewhere (ie: in other threads or processes) in a
+        set order. Resets the count for the classes of the objects first.
+
+        Arguments:
+        ----------
+            * _objects (Iterable[Any]): The objects to re-number. Each must have an 'id' attribute.
+
+        Returns:
+        --------
+            * (dict[int, int]): The old ID numbers, and the new ID number for each.
+        """
+        objects = list(_objects)
+        for cls in {obj.__class__ for obj in objects}:
+            self.reset(cls)
+
+        id_map = {}
+        for obj in objects:
+            new_id = self.next_id(obj.__class__)
+            id_map[obj.id] = new_id
+            obj.id = new_id
+        return id_map
+
+    def state(self):
+        # type: () -> dict[str, int]
+        """Returns the counts of all the classes, as a dict which can be sent to another process."""
+        with self._lock:
+            return dict(self._counts)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.state())
+
+
+def _scopes():
+    # type: () -> list[IDAllocator]
+    try:
+        return _LOCAL.scopes
+    except AttributeError:
+        _LOCAL.scopes = []
+        return _LOCAL.scopes
+
+
+def active_allocator():
+    # type: () -> IDAllocator | None
+    """Returns the IDAllocator of the current thread's id_scope(), or None if not in one."""
+    scopes = _scopes()
+    return scopes[-1] if scopes else None
+
+
+@contextmanager
+def id_scope(_allocator=None):
+    # type: (IDAllocator | None) -> Iterator[IDAllocator]
+    """Context manager: Take all the new ID numbers in this thread from the allocator.
+
+    Arguments:
+    ----------
+        * _allocator (IDAllocator | None): The allocator to use. If None, a new one is made.
+
+    Yields:
+    -------
+        * (IDAllocator): The allocator in use.
+    """
+    allocator = _allocator if _allocator is not None else IDAllocator()
+    scopes = _scopes()
+    scopes.append(allocator)
+    try:
+        yield allocator
+    finally:
+        scopes.pop()
+
+
+def next_id(_cls):
+    # type: (type) -> int
+    """Returns the next ID number for a new object of the class.
+
+    Inside an id_scope(), the number comes from the scope's IDAllocator. Otherwise
+    the class's own '_count' is incremented.
+    """
+    allocator = active_allocator()
+    if allocator is not None:
+        return allocator.next_id(_cls)
+
+    with _LOCK:
+        _CLASSES.add(_cls)
+        _cls._count += 1
+        return _cls._count
+
+
+def current_state():
+    # type: () -> dict[str, int]
+    """Returns the counts the next ID numbers will follow on from, as a dict which can be sent to another process.
+
+    Inside an id_scope(), these are the scope's IDAllocator counts. Otherwise they are
+    the classes' own '_count', for every class used so far.
+    """
+    allocator = active_allocator()
+    if allocator is not None:
+        return allocator.state()
+
+    with _LOCK:
+        return {class_key(cls): cls._count for cls in _CLASSES}
+
+
+def reset_counts(*_classes):
+    # type: (*type) -> None
+    """Start the numbering over for the classes' own '_count', or (if none given) for every class used so far."""
+    with _LOCK:
+        for cls in _classes or list(_CLASSES):
+            cls._count = start_count(cls)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 2.7 -*-
+
+"""
+A list with a fast 'in' test, used for the long lists of PHX objects (ie: a
+BldgSegment's Components, or a Geom's Polygons) which are checked for each new item
+added to them.
+"""
+
+
+class IdentityList(list):
+    """A list which keeps an index of the id() of each item, so that 'in' takes O(1) instead of O(n).
+
+    The index is kept in sync by every method which adds or removes items, and the items
+    keep their order. Note: 'in' only finds the same object (is), not an equal one (==),
+    which is the same as a plain list for objects without an __eq__ (ie: Components, Polygons).
+
+    Arguments:
+    ----------
+        * _items (Iterable): The starting items.
+        * _on_change (Callable[[list, list], None] | None): Optional function called after every
+            change to the list, with the items added and the items removed (both empty if the items
+            were only re-ordered, by reverse() or sort()). The owner of the list
+            uses this to keep track of changes (ie: to clear its cached values).
+    """
+
+    __slots__ = ("_index", "_on_change")
+
+    def __init__(self, _items=(), _on_change=None):
+        super(IdentityList, self).__init__(_items)
+        self._index = {}
+        self._on_change = _on_change
+        self._add_to_index(self)
+
+    def _add_to_index(self, _items):
+        index = self._index
+        for item in _items:
+            key = id(item)
+            index[key] = index.get(key, 0) + 1
+
+        if _items and self._on_change is not None:
+            self._on_change(_items, ())
+
+    def _remove_from_index(self, _items):
+        index = self._index
+        for item in _items:
+            key = id(item)
+            if index[key] == 1:
+                del index[key]
+            else:
+                index[key] -= 1
+
+        if _items and self._on_change is not None:
+            self._on_change((), _items)
+
+    def _reordered(self):
+        # -- The same items, in a new order
+        if self._on_change is not None:
+            self._on_change((), ())
+
+    def __contains__(self, _item):
+        return id(_item) in self._index
+
+    def __reduce__(self):
+        # -- Only the items are pickled, not the _on_change function
+        return (self.__class__, (list(self),))
+
+    def append(self, _item):
+        super(IdentityList, self).append(_item)
+        self._add_to_index([_item])
+
+    def extend(self, _items):
+        items = list(_items)
+        super(IdentityList, self).extend(items)
+        self._add_to_index(items)
+
+    def __iadd__(self, _items):
+        self.extend(_items)
+        return self
+
+    def __imul__(self, _n):
+        if _n <= 0:
+            del self[:]
+        else:
+            self.extend(list(self) * (_n - 1))
+        return self
+
+    def insert(self, _i, _item):
+        super(IdentityList, self).insert(_i, _item)
+        self._add_to_index([_item])
+
+    def remove(self, _item):
+        self.pop(self.index(_item))
+
+    def pop(self, _i=-1):
+        item = super(IdentityList, self).pop(_i)
+        self._remove_from_index([item])
+        return item
+
+    def clear(self):
+        del self[:]
+
+    def reverse(self):
+        super(IdentityList, self).reverse()
+        self._reordered()
+
+    def sort(self, *args, **kwargs):
+        super(IdentityList, self).sort(*args, **kwargs)
+        self._reordered()
+
+    def __setitem__(self, _i, _value):
+        if isinstance(_i, slice):
+            old, new = list(self[_i]), list(_value)
+        else:
+            old, new = [self[_i]], [_value]
+        super(IdentityList, self).__setitem__(_i, new if isinstance(_i, slice) else _value)
+        self._remove_from_index(old)
+        self._add_to_index(new)
+
+    def __delitem__(self, _i):
+        old = list(self[_i]) if isinstance(_i, slice) else [self[_i]]
+        super(IdentityList, self).__delitem__(_i)
+        self._remove_from_index(old)
+
+    # -- Python 2.7 uses these for simple slices: a[i:j]
+    def __setslice__(self, _i, _j, _values):
+        self.__setitem__(slice(max(_i, 0), max(_j, 0)), _values)
+
+    def __delslice__(self, _i, _j):
+        self.__delitem__(slice(max(_i, 0), max(_j, 0)))
@@ -1,4 +1,5 @@
 import PHX._base
+import PHX.metrics_cache
 import PHX.serialization.from_dict
 
 
@@ -39,6 +40,7 @@ class Distribution(PHX._base._Base):
 
         for el in _elements:
             self._elements[el.identifier] = el
+        PHX.metrics_cache.changed(self)
 
     def get_all_elements_by_type(self, _type_number=1):
         # type: (int) -> list[DistributionElement]
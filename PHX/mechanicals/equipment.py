@@ -6,6 +6,8 @@ PHX Mechanical Equipment Classes
 """
 
 import PHX._base
+import PHX.id_allocator
+import PHX.metrics_cache
 import PHX.serialization.from_dict
 
 # ------------------------------------------------------------------------------
@@ -16,13 +18,9 @@ class EquipmentSet(PHX._base._Base):
 
     def __init__(self):
         super(EquipmentSet, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self._equipment = {}
 
-    def __new__(cls, *args, **kwargs):
-        cls._count += 1
-        return super(EquipmentSet, cls).__new__(cls, *args, **kwargs)
-
     @property
     def equipment(self):
         return self._equipment.values()
@@ -48,6 +46,7 @@ class EquipmentSet(PHX._base._Base):
 
         for device in _devices:
             self._equipment[device.identifier] = device
+        PHX.metrics_cache.changed(self)
 
     def get_all_devices_by_type(self, _type_number=1):
         # type: (int) -> list[HVAC_Device]
@@ -95,7 +94,8 @@ class HVAC_Device(PHX._base._Base):
     def __new__(cls, *args, **kwargs):
         """
         Developer Note: _count and .id is NOT implemented in this base class but should be implemented
-        by all sublcasses directly instead. Otherwise you will end up with funny results.
+        by all sublcasses directly instead (using PHX.id_allocator.next_id). Otherwise you will end up
+        with funny results.
         """
         return super(HVAC_Device, cls).__new__(cls, *args, **kwargs)
 
@@ -137,7 +137,7 @@ class HVAC_Ventilator(HVAC_Device):
     def __init__(self):
         super(HVAC_Ventilator, self).__init__()
         self.name = ""
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.device_type = 1
         self.system_type = 1
         self.properties = HVAC_Device_Properties()
@@ -147,11 +147,6 @@ class HVAC_Ventilator(HVAC_Device):
         for k, v in self._default_properties.items():
             setattr(self.properties, k, v.get(_type))
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(HVAC_Ventilator, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls, *args, **kwargs):
         """Returns a new HVAC_Device for a default Ventilator (HRV/ERV)"""
@@ -191,7 +186,7 @@ class HW_Tank(HVAC_Device):
     def __init__(self):
         super(HW_Tank, self).__init__()
         self.name = ""
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.device_type = 8  # water storage
         self.system_type = 8
         self.properties = HVAC_Device_Properties()
@@ -201,11 +196,6 @@ class HW_Tank(HVAC_Device):
         for k, v in self._default_properties.items():
             setattr(self.properties, k, v.get(_type))
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(HW_Tank, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls, *args, **kwargs):
         """Returns a new HVAC_Device for a default HW Tank"""
@@ -240,7 +230,7 @@ class HW_Heater_Direct_Elec(HVAC_Device):
     def __init__(self):
         super(HW_Heater_Direct_Elec, self).__init__()
         self.name = ""
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.device_type = 2  # Electric resistance space heat / DHW
         self.system_type = 2
         self.properties = HVAC_Device_Properties()
@@ -250,11 +240,6 @@ class HW_Heater_Direct_Elec(HVAC_Device):
         for k, v in self._default_properties.items():
             setattr(self.properties, k, v.get(_type))
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(HW_Heater_Direct_Elec, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls, *args, **kwargs):
         """Returns a new HVAC_Device for a default HW Direct Electtric Heater"""
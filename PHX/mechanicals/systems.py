@@ -7,6 +7,8 @@ PHX Mechanical System Classes
 
 from collections import defaultdict
 import PHX._base
+import PHX.id_allocator
+import PHX.metrics_cache
 import PHX.mechanicals.equipment
 import PHX.mechanicals.distribution
 import PHX.serialization.from_dict
@@ -53,6 +55,7 @@ class Mechanicals(PHX._base._Base):
     def add_system(self, _system_to_add):
         if _system_to_add:
             self._systems[_system_to_add.identifier] = _system_to_add
+            PHX.metrics_cache.changed(self)
 
     @property
     def systems(self):
@@ -62,14 +65,32 @@ class Mechanicals(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Mechanicals(cls, _dict)
 
-    def __add__(self, _other):
-        # type: (Mechanicals, Mechanicals) -> Mechanicals
-        new_obj = self.__class__()
-        new_obj._systems.update(self._systems)
-        new_obj._systems.update(_other._systems)
+    @classmethod
+    def merge(cls, _mechanicals):
+        # type: (Iterable[Mechanicals]) -> Mechanicals
+        """Join any number of Mechanicals together into a single new Mechanicals, in one pass.
+
+        Systems are de-duplicated by their identifier, the same as adding the Mechanicals
+        together two at a time (m1 + m2 + ...).
+
+        Arguments:
+        ----------
+            * _mechanicals (Iterable[Mechanicals]): The Mechanicals to join.
+
+        Returns:
+        --------
+            * (Mechanicals): The new joined Mechanicals.
+        """
+        new_obj = cls()
+        for mechanicals in _mechanicals:
+            new_obj._systems.update(mechanicals._systems)
 
         return new_obj
 
+    def __add__(self, _other):
+        # type: (Mechanicals, Mechanicals) -> Mechanicals
+        return self.merge([self, _other])
+
     def __radd__(self, other):
         if other == 0:
             return self
@@ -86,7 +107,7 @@ class MechanicalSystem(PHX._base._Base):
 
     def __init__(self):
         super(MechanicalSystem, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.system_group_type_number = 1  # __Mech_System :: Type :: Ideal Air
         self.lZoneCover = []
@@ -95,10 +116,6 @@ class MechanicalSystem(PHX._base._Base):
         self.distribution = PHX.mechanicals.distribution.Distribution()
         self.system_usage = HVAC_System_Usage()
 
-    def __new__(cls, *args, **kwargs):
-        cls._count += 1
-        return super(MechanicalSystem, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default_ventilation(cls):
         if cls._default_ventilation:
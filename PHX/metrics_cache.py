@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 2.7 -*-
+
+"""
+Cached values (areas, volumes, ...) calculated from the PHX model, and their hit counters.
+
+Each cached value belongs to a single object, and depends on that object and on the
+objects it is made from: its 'children'. ie:
+
+    * BldgSegment: its Components and Zones.
+    * Component: the VertexRange of each of its Polygons.
+    * Zone: its Rooms.
+    * Room: its Mechanicals.
+
+Each object registers itself as the parent of its children with add_parent() (or
+children_changed()). Whenever an object changes, the code making the change calls
+changed(obj). This throws away the cached values of that object and of its parents,
+their parents, and so on up, and they are re-calculated the next time they are used.
+The cached values of every other object are kept: changing one Room's Mechanicals
+only clears that Room's Zone, and that Zone's BldgSegment.
+
+The values, and the links to the parents, are held here (by weak reference), not on
+the objects themselves, so they are never serialized or sent to another process along
+with the object.
+
+Objects can also be watched (ie: by the PyPH_WUFI XMLFragmentCache), with watch(). Each
+watched object has a version() number, until the object, or any of the children it was
+watched with, is changed: by changed(), or by setting one of their attributes to a new
+value (see touched()). It is then no longer watched, and version() returns None. Watching
+it again (with its new children) gives it a new version number, never used before.
+
+Usage:
+------
+    >>> class Component(PHX._base._Base):
+    ...     @property
+    ...     @cached_metric("Component.exposed_area")
+    ...     def exposed_area(self):
+    ...         return sum(_.area for _ in self.polygons)
+    >>> cache_stats()
+    {'Component.exposed_area': {'hits': 12, 'misses': 3}}
+"""
+
+import functools
+import itertools
+import weakref
+
+# -- The cached values for each object: {name: value}
+_CACHE = weakref.WeakKeyDictionary()
+
+# -- The parents of each object: [weakref.ref(parent), ...], or {id(parent): weakref.ref(parent)} once it has many
+_PARENTS = weakref.WeakKeyDictionary()
+_MAX_PARENT_LIST = 8
+
+# -- The version number of each watched object: {obj: int}. From a single count, so that no
+# -- two versions of any objects are the same.
+_VERSIONS = weakref.WeakKeyDictionary()
+_VERSION_COUNT = itertools.count(1)
+
+
+class CacheStats(object):
+    """The number of times a cached value was found (hits) or had to be calculated (misses)."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        # type: () -> float
+        try:
+            return float(self.hits) / (self.hits + self.misses)
+        except ZeroDivisionError:
+            return 0.0
+
+    def to_dict(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def __repr__(self):
+        return "{}(hits={}, misses={})".format(self.__class__.__name__, self.hits, self.misses)
+
+
+_STATS = {}  # type: dict[str, CacheStats]
+
+
+def get_stats(_name):
+    # type: (str) -> CacheStats
+    """Returns the counters for the named value, adding new ones if needed."""
+    try:
+        return _STATS[_name]
+    except KeyError:
+        _STATS[_name] = CacheStats()
+        return _STATS[_name]
+
+
+def add_parent(_child, _parent):
+    # type: (Any, Any) -> None
+    """Register the parent's cached values as depending on the child. Any change to the child also clears them."""
+    refs = _PARENTS.get(_child)
+    if refs is None:
+        _PARENTS[_child] = [weakref.ref(_parent)]
+    elif isinstance(refs, dict):
+        ref = refs.get(id(_parent))
+        if ref is None or ref() is not _parent:
+            refs[id(_parent)] = weakref.ref(_parent)
+    elif not any(ref() is _parent for ref in refs):
+        refs.append(weakref.ref(_parent))
+        if len(refs) > _MAX_PARENT_LIST:
+            # -- ie: a Material used by many Assemblies. Find its parents by id, instead of one by one.
+            _PARENTS[_child] = {id(ref()): ref for ref in refs if ref() is not None}
+
+
+def remove_parent(_child, _parent):
+    # type: (Any, Any) -> None
+    """Un-register the parent from the child, once the child is no longer part of it."""
+    refs = _PARENTS.get(_child)
+    if isinstance(refs, dict):
+        for key, ref in list(refs.items()):
+            if ref() is _parent or ref() is None:
+                del refs[key]
+    elif refs:
+        refs[:] = [ref for ref in refs if ref() is not _parent and ref() is not None]
+
+
+def _parent_refs(_obj):
+    # type: (Any) -> Iterable[weakref.ref]
+    """Returns the weak references to each of the object's parents."""
+    refs = _PARENTS.get(_obj, ())
+    return refs.values() if isinstance(refs, dict) else refs
+
+
+def children_changed(_parent, _added=(), _removed=()):
+    # type: (Any, Iterable[Any], Iterable[Any]) -> None
+    """Register the parent with the children added to it, un-register it from the children removed, and
+    record the change to the parent.
+
+    Arguments:
+    ----------
+        * _parent (Any): The object whose children changed.
+        * _added (Iterable[Any]): The new children.
+        * _removed (Iterable[Any]): The children which are no longer part of the parent.
+    """
+    for child in _added:
+        add_parent(child, _parent)
+    for child in _removed:
+        remove_parent(child, _parent)
+    changed(_parent)
+
+
+def changed(_obj):
+    # type: (Any) -> None
+    """Mark the object as changed. Its cached values, and those of all its parents (and theirs...) will be re-calculated.
+
+    Arguments:
+    ----------
+        * _obj (Any): The object which changed.
+    """
+    if not _CACHE and not _VERSIONS:
+        return  # -- Nothing cached or watched, so nothing to clear
+
+    to_clear = [_obj]
+    cleared = set()
+    while to_clear:
+        obj = to_clear.pop()
+        if id(obj) in cleared:
+            continue
+        cleared.add(id(obj))
+
+        _CACHE.pop(obj, None)
+        _VERSIONS.pop(obj, None)
+        for ref in _parent_refs(obj):
+            parent = ref()
+            if parent is not None:
+                to_clear.append(parent)
+
+
+def touched(_obj):
+    # type: (Any) -> None
+    """Record a change to one of the object's attribute values. The object, and all of the objects watching
+    it, are no longer watched. Its cached values are kept, since they are only cleared by changed().
+
+    Arguments:
+    ----------
+        * _obj (Any): The object whose attribute was set.
+    """
+    if not _VERSIONS:
+        return
+
+    try:
+        if _obj not in _VERSIONS and _obj not in _PARENTS:
+            return
+    except TypeError:
+        return  # -- Objects which cannot be weak-referenced cannot be watched
+
+    to_update = [_obj]
+    updated = set()
+    while to_update:
+        obj = to_update.pop()
+        if id(obj) in updated:
+            continue
+        updated.add(id(obj))
+
+        _VERSIONS.pop(obj, None)
+        for ref in _parent_refs(obj):
+            parent = ref()
+            if parent is not None:
+                to_update.append(parent)
+
+
+def watch(_obj, _children=()):
+    # type: (Any, Iterable[Any]) -> int
+    """Give the object a version number, which it keeps until it, or any of the children, change.
+
+    Arguments:
+    ----------
+        * _obj (Any): The object to watch. It must allow weak references.
+        * _children (Iterable[Any]): The objects which the object is made from, at any depth.
+
+    Returns:
+    --------
+        * (int): The object's version number.
+    """
+    for child in _children:
+        try:
+            add_parent(child, _obj)
+        except TypeError:
+            pass  # -- Objects which cannot be weak-referenced cannot be watched
+
+    if _obj not in _VERSIONS:
+        _VERSIONS[_obj] = next(_VERSION_COUNT)
+    return _VERSIONS[_obj]
+
+
+def version(_obj):
+    # type: (Any) -> int | None
+    """Returns the object's version number, or None if the object is not watched, or has changed (see watch())."""
+    return _VERSIONS.get(_obj)
+
+
+def cached_metric(_name):
+    # type: (str) -> Callable
+    """Decorator: Keep the method's result until the object, or one of its children, changes.
+
+    Arguments:
+    ----------
+        * _name (str): The name of the value, used for its counters. ie: "Component.exposed_area"
+    """
+
+    stats = get_stats(_name)
+
+    def decorator(_func):
+        @functools.wraps(_func)
+        def wrapper(self):
+            values = _CACHE.get(self)
+            if values is None:
+                values = _CACHE[self] = {}
+
+            try:
+                result = values[_name]
+            except KeyError:
+                stats.misses += 1
+                result = values[_name] = _func(self)
+            else:
+                stats.hits += 1
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(_obj):
+    # type: (object) -> None
+    """Discard all of the cached values for the object (only), without clearing its parents."""
+    _CACHE.pop(_obj, None)
+
+
+def clear_cache():
+    # type: () -> None
+    """Discard all of the cached values, for every object."""
+    _CACHE.clear()
+
+
+def cache_stats():
+    # type: () -> dict[str, dict[str, int]]
+    """Returns the hits and misses of each cached value, by name."""
+    return {name: stats.to_dict() for name, stats in sorted(_STATS.items())}
+
+
+def reset_cache_stats():
+    # type: () -> None
+    """Set all of the hit and miss counters back to zero."""
+    for stats in _STATS.values():
+        stats.hits = 0
+        stats.misses = 0
@@ -6,6 +6,7 @@ PHX Program: Occupancy Classes
 """
 
 import PHX._base
+import PHX.id_allocator
 import PHX.programs.schedules
 import PHX.programs.loads
 import PHX.serialization.from_dict
@@ -29,7 +30,7 @@ class BldgSegmentOccupancy(PHX._base._Base):
     _count = 0
 
     def __init__(self):
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         super(BldgSegmentOccupancy, self).__init__()
         self.category = 1
         self.usage_type = 1
@@ -56,11 +57,6 @@ class BldgSegmentOccupancy(PHX._base._Base):
         else:
             return 'Error: Category of "{}" not allowed.'.format(self.category)
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(BldgSegmentOccupancy, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._BldgSegmentOccupancy(cls, _dict)
@@ -96,17 +92,12 @@ class ZoneOccupancy(PHX._base._Base):
     _count = 0
 
     def __init__(self):
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         super(ZoneOccupancy, self).__init__()
         self.num_occupants = 0
         self.num_bedrooms = 0
         self.num_dwelling_units = 0
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(ZoneOccupancy, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._ZoneOccupancy(cls, _dict)
@@ -150,17 +141,12 @@ class RoomOccupancy(PHX._base._Base):
     _default = None
 
     def __init__(self):
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         super(RoomOccupancy, self).__init__()
         self.name = ""
         self.schedule = PHX.programs.schedules.Schedule_Occupancy()
         self.loads = PHX.programs.loads.Load_Occupancy()
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(RoomOccupancy, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls):
         if cls._default is not None:
@@ -6,12 +6,14 @@ PHX Program: Schedule Classes
 """
 
 import PHX._base
+import PHX.id_allocator
 import PHX.serialization.from_dict
 
 # -- Ventilation Rates
-class Vent_UtilRate(PHX._base._Base):
+class Vent_UtilRate(PHX._base._ValueBase):
+    __slots__ = ("_daily_op_sched", "_frac_of_design_airflow")
+
     def __init__(self, _dos=0, _pdf=0):
-        super(Vent_UtilRate, self).__init__()
         self._daily_op_sched = _dos
         self._frac_of_design_airflow = _pdf
 
@@ -88,17 +90,12 @@ class Schedule_Ventilation(PHX._base._Base):
 
     def __init__(self):
         super(Schedule_Ventilation, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.operating_days = 7
         self.operating_weeks = 52
         self.utilization_rates = Vent_UtilRates()
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Schedule_Ventilation, cls).__new__(cls, *args, **kwargs)
-
     def validate_total_hours(self):
         # type: (Schedule_Ventilation) -> None | str
         """
@@ -197,7 +194,7 @@ class Schedule_Occupancy(PHX._base._Base):
 
     def __init__(self):
         super(Schedule_Occupancy, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.start_hour = 0
         self.end_hour = 1
@@ -236,11 +233,6 @@ class Schedule_Occupancy(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Schedule_Occupancy(cls, _dict)
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Schedule_Occupancy, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls):
         if cls._default:
@@ -273,7 +265,7 @@ class Schedule_Lighting(PHX._base._Base):
 
     def __init__(self):
         super(Schedule_Lighting, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.daily_operating_hours = 0
         self.annual_utilization_days = 0
@@ -308,11 +300,6 @@ class Schedule_Lighting(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Schedule_Lighting(cls, _dict)
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Schedule_Lighting, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls):
         if cls._default:
@@ -339,7 +326,7 @@ class Schedule_ElecEquip(PHX._base._Base):
 
     def __init__(self):
         super(Schedule_ElecEquip, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.annual_utilization_factor = 1.0
 
@@ -352,11 +339,6 @@ class Schedule_ElecEquip(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Schedule_ElecEquip(cls, _dict)
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Schedule_ElecEquip, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def default(cls):
         if cls._default:
@@ -384,7 +366,7 @@ class Schedule_NonResAppliance(PHX._base._Base):
 
     def __init__(self):
         super(Schedule_NonResAppliance, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.start_hour = 0
         self.end_hour = 24
@@ -430,11 +412,6 @@ class Schedule_NonResAppliance(PHX._base._Base):
         cls._default = new_obj
         return new_obj
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(Schedule_NonResAppliance, cls).__new__(cls, *args, **kwargs)
-
     @classmethod
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._Schedule_NonResAppliance(cls, _dict)
@@ -6,6 +6,7 @@ PHX Program: Ventilation Classes
 """
 
 import PHX._base
+import PHX.id_allocator
 import PHX.programs.schedules
 import PHX.programs.loads
 import PHX.serialization.from_dict
@@ -18,7 +19,7 @@ class RoomVentilation(PHX._base._Base):
 
     def __init__(self):
         super(RoomVentilation, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.name = ""
         self.loads = PHX.programs.loads.Load_Ventilation()
         self.schedule = PHX.programs.schedules.Schedule_Ventilation()
@@ -42,11 +43,6 @@ class RoomVentilation(PHX._base._Base):
     def from_dict(cls, _dict):
         return PHX.serialization.from_dict._RoomVentilation(cls, _dict)
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(RoomVentilation, cls).__new__(cls, *args, **kwargs)
-
     def __add__(self, _other):
         self.loads = self.loads.join(_other.loads)
 
@@ -267,7 +267,6 @@ def _Polygon(_cls, _input_dict):
     new_obj.identifier = _input_dict.get("identifier")
     new_obj.id = _input_dict.get("id")
     new_obj._nVec = PHX.geometry.Vector.from_dict(_input_dict.get("_nVec", {}))
-    new_obj._area = _input_dict.get("_area")
     new_obj.idPolyI = _input_dict.get("idPolyI")
     new_obj.children = _input_dict.get("children")
 
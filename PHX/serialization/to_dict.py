@@ -247,8 +247,7 @@ def _Polygon(_obj):
 
     d.update({"identifier": str(_obj.identifier)})
     d.update({"id": _obj.id})
-    d.update({"_nVec": _obj._nVec.to_dict()})
-    d.update({"_area": _obj._area})
+    d.update({"_nVec": _obj.nVec.to_dict()})
     d.update({"idPolyI": _obj.idPolyI})
     d.update({"children": _obj.children})
 
@@ -7,6 +7,7 @@ PHX Space (Room) and Floor Area (iCFA / TFA) Classes
 
 import PHX.programs.loads
 import PHX._base
+import PHX.metrics_cache
 import PHX.serialization.from_dict
 import PHX.programs.occupancy
 import PHX.programs.lighting
@@ -224,6 +225,7 @@ class Floor(PHX._base._Base):
                 return
 
             self.floor_segments.append(seg)
+            PHX.metrics_cache.changed(self)
 
             self.space_number = self._join_string_values(seg, "space_number")
             self.space_name = self._join_string_values(seg, "space_name")
@@ -485,6 +487,7 @@ class Space(PHX._base._Base):
 
         # -- Add the new Volume to Space's list
         self.volumes.append(_new_volume)
+        PHX.metrics_cache.changed(self)
 
         # -- Add the UD Ventilation Loads, if any
         if self.ventilation_loads:
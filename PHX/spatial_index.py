@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 2.7 -*-
+
+"""
+Bounding-Volume-Hierarchy (BVH) spatial index over Polygons.
+
+The index is built once from the bounding box of each Polygon, by splitting the
+Polygons in half (along the longest axis of their centers) over and over until only
+a few are left in each 'leaf'. Queries then only need to look at the Polygons in the
+branches whose boxes are close enough, rather than at every Polygon.
+
+The index is a snapshot: it does not see any change to the Polygons made after it was
+built. BldgSegment.polygon_index keeps an index which is re-built whenever the model's
+geometry or envelope changes.
+"""
+
+import heapq
+import itertools
+from collections import namedtuple
+
+import PHX.geometry
+import PHX.geometry_kernel
+
+# -- The max number of Polygons in a leaf of the tree
+LEAF_SIZE = 4
+
+
+class BoundingBox(namedtuple("BoundingBox", ["min_x", "min_y", "min_z", "max_x", "max_y", "max_z"])):
+    """An axis-aligned box around a region, or around a Polygon."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_coordinates(cls, _coords):
+        # type: (Sequence[float]) -> BoundingBox
+        """Returns a new BoundingBox around the flat x, y, z coordinates."""
+        xs, ys, zs = _coords[0::3], _coords[1::3], _coords[2::3]
+        return cls(min(xs), min(ys), min(zs), max(xs), max(ys), max(zs))
+
+    @classmethod
+    def from_points(cls, _points):
+        # type: (Iterable[tuple[float, float, float]]) -> BoundingBox
+        """Returns a new BoundingBox around the x, y, z points."""
+        xs, ys, zs = zip(*_points)
+        return cls(min(xs), min(ys), min(zs), max(xs), max(ys), max(zs))
+
+    @classmethod
+    def union(cls, _boxes):
+        # type: (Iterable[BoundingBox]) -> BoundingBox
+        """Returns a new BoundingBox around all of the boxes."""
+        min_x, min_y, min_z, max_x, max_y, max_z = zip(*_boxes)
+        return cls(min(min_x), min(min_y), min(min_z), max(max_x), max(max_y), max(max_z))
+
+    @property
+    def center(self):
+        # type: () -> tuple[float, float, float]
+        return (
+            (self.min_x + self.max_x) / 2.0,
+            (self.min_y + self.max_y) / 2.0,
+            (self.min_z + self.max_z) / 2.0,
+        )
+
+    def expanded(self, _distance):
+        # type: (float) -> BoundingBox
+        """Returns a new BoundingBox, grown by the distance in every direction."""
+        d = _distance
+        return self.__class__(
+            self.min_x - d, self.min_y - d, self.min_z - d, self.max_x + d, self.max_y + d, self.max_z + d
+        )
+
+    def intersects(self, _other):
+        # type: (BoundingBox) -> bool
+        """Returns True if the boxes overlap or touch."""
+        return (
+            self.min_x <= _other.max_x
+            and _other.min_x <= self.max_x
+            and self.min_y <= _other.max_y
+            and _other.min_y <= self.max_y
+            and self.min_z <= _other.max_z
+            and _other.min_z <= self.max_z
+        )
+
+    def distance_2(self, _point):
+        # type: (tuple[float, float, float]) -> float
+        """Returns the squared distance from the point to the box. 0 if the point is inside."""
+        x, y, z = _point
+        dx = max(self.min_x - x, 0.0, x - self.max_x)
+        dy = max(self.min_y - y, 0.0, y - self.max_y)
+        dz = max(self.min_z - z, 0.0, z - self.max_z)
+        return dx * dx + dy * dy + dz * dz
+
+
+class _Node(object):
+    """A branch of the tree (with left and right children) or a leaf (with item numbers)."""
+
+    __slots__ = ("box", "left", "right", "items")
+
+    def __init__(self, _box, _left=None, _right=None, _items=None):
+        self.box = _box
+        self.left = _left
+        self.right = _right
+        self.items = _items
+
+
+class PolygonIndex(object):
+    """A BVH spatial index over Polygons, and the Components which hold them.
+
+    Attributes:
+    -----------
+        * polygons (list[Polygon]): The Polygons in the index.
+        * components (list[Component | None]): The Component holding each Polygon, if known.
+        * boxes (list[BoundingBox]): The BoundingBox of each Polygon.
+    """
+
+    def __init__(self, _polygons, _components=None):
+        # type: (Iterable[PHX.geometry.Polygon], Iterable[PHX.component.Component | None] | None) -> None
+        self.polygons = list(_polygons)
+        self.components = list(_components) if _components is not None else [None] * len(self.polygons)
+
+        # -- Calculate all the areas, normals and centroids at once, for the queries
+        PHX.geometry.update_polygon_metrics(self.polygons)
+
+        self.boxes = []
+        items = []
+        for i, poly in enumerate(self.polygons):
+            coords = poly.vertex_coordinates
+            if not coords:
+                self.boxes.append(None)
+                continue
+            self.boxes.append(BoundingBox.from_coordinates(coords))
+            items.append(i)
+
+        self._numbers = {id(poly): i for i, poly in reversed(list(enumerate(self.polygons)))}
+
+        centers = {i: self.boxes[i].center for i in items}
+        self._root = self._build(items, centers) if items else None
+
+    @classmethod
+    def from_components(cls, _components):
+        # type: (Iterable[PHX.component.Component]) -> PolygonIndex
+        """Returns a new PolygonIndex of all the Components' Polygons."""
+        pairs = [(poly, compo) for compo in _components for poly in compo.polygons]
+        return cls((_[0] for _ in pairs), (_[1] for _ in pairs))
+
+    def __len__(self):
+        return len(self.polygons)
+
+    def _build(self, _items, _centers):
+        # type: (list[int], dict[int, tuple[float, float, float]]) -> _Node
+        box = BoundingBox.union(self.boxes[i] for i in _items)
+        if len(_items) <= LEAF_SIZE:
+            return _Node(box, _items=_items)
+
+        # -- Split in half along the axis where the centers are most spread out
+        spread = BoundingBox.from_points(_centers[i] for i in _items)
+        axis = max(range(3), key=lambda a: spread[a + 3] - spread[a])
+        _items.sort(key=lambda i: _centers[i][axis])
+        middle = len(_items) // 2
+
+        return _Node(box, self._build(_items[:middle], _centers), self._build(_items[middle:], _centers))
+
+    def _box_search(self, _box):
+        # type: (BoundingBox) -> Iterator[int]
+        """Yields the number of each Polygon whose BoundingBox intersects the box."""
+
+        if self._root is None:
+            return
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if not node.box.intersects(_box):
+                continue
+            if node.items is None:
+                stack.append(node.right)
+                stack.append(node.left)
+                continue
+            for i in node.items:
+                if self.boxes[i].intersects(_box):
+                    yield i
+
+    def _distance(self, _i, _point):
+        # type: (int, tuple[float, float, float]) -> float
+        poly = self.polygons[_i]
+        r = poly._vertex_range
+        normal = r.store.polygon_metrics(r.start, r.stop).normal
+        return PHX.geometry_kernel.point_polygon_distance(r.store.coords, r.start, r.stop, normal, _point)
+
+    def query_region(self, _box):
+        # type: (BoundingBox) -> list[PHX.geometry.Polygon]
+        """Returns all the Polygons whose BoundingBox intersects the region.
+
+        Arguments:
+        ----------
+            * _box (BoundingBox): The region to search.
+
+        Returns:
+        --------
+            * (list[Polygon]): The Polygons found, in the order they were added to the index.
+        """
+        return [self.polygons[i] for i in sorted(self._box_search(_box))]
+
+    def nearest(self, _point, _max_distance=None, _filter=None):
+        # type: (tuple[float, float, float], float | None, Callable[[Polygon], bool] | None) -> tuple[Polygon, float] | None
+        """Returns the Polygon nearest to the point, measured to anywhere on its surface.
+
+        Arguments:
+        ----------
+            * _point (tuple[float, float, float]): The x, y, z point to search from.
+            * _max_distance (float | None): Optional max distance to search.
+            * _filter (Callable[[Polygon], bool] | None): Optional test, only Polygons for which
+                this returns True are included.
+
+        Returns:
+        --------
+            * (tuple[Polygon, float] | None): The nearest Polygon and its distance, or None if none were found.
+        """
+
+        if self._root is None:
+            return None
+
+        best_i = None
+        best_distance = float("inf") if _max_distance is None else _max_distance
+        counter = itertools.count()  # -- so that heapq never compares two Nodes
+        heap = [(self._root.box.distance_2(_point), next(counter), self._root)]
+        while heap:
+            box_distance_2, _, node = heapq.heappop(heap)
+            if box_distance_2 > best_distance * best_distance:
+                break
+
+            if node.items is None:
+                for child in (node.left, node.right):
+                    heapq.heappush(heap, (child.box.distance_2(_point), next(counter), child))
+                continue
+
+            for i in node.items:
+                if self.boxes[i].distance_2(_point) > best_distance * best_distance:
+                    continue
+                if _filter is not None and not _filter(self.polygons[i]):
+                    continue
+                distance = self._distance(i, _point)
+                if distance <= best_distance and (best_i is None or distance < best_distance or i < best_i):
+                    best_i = i
+                    best_distance = distance
+
+        if best_i is None:
+            return None
+        return self.polygons[best_i], best_distance
+
+    def coplanar_neighbours(self, _polygon, _tolerance=0.001, _facing=None):
+        # type: (PHX.geometry.Polygon, float, int | None) -> list[PHX.geometry.Polygon]
+        """Returns the other Polygons in the same plane as the Polygon, whose BoundingBoxes touch it.
+
+        Arguments:
+        ----------
+            * _polygon (Polygon): The Polygon to find the neighbours of. Does not need to be in the index.
+            * _tolerance (float): default=0.001. The max distance out of the plane.
+            * _facing (int | None): default=None. 1 to only include Polygons facing the same way,
+                -1 for facing the opposite way (ie: the other side of an interior wall), None for either.
+
+        Returns:
+        --------
+            * (list[Polygon]): The coplanar Polygons, in the order they were added to the index.
+        """
+
+        coords = _polygon.vertex_coordinates
+        if not coords:
+            return []
+
+        metrics = _polygon._metrics
+        nx, ny, nz = metrics.normal
+        if not any(metrics.normal):
+            return []
+        cx, cy, cz = metrics.centroid
+
+        found = []
+        for i in sorted(self._box_search(BoundingBox.from_coordinates(coords).expanded(_tolerance))):
+            poly = self.polygons[i]
+            if poly is _polygon:
+                continue
+
+            other = poly._metrics
+            dot = nx * other.normal[0] + ny * other.normal[1] + nz * other.normal[2]
+            if abs(abs(dot) - 1.0) > _tolerance:
+                continue  # -- Not parallel
+            if _facing is not None and (dot > 0) != (_facing > 0):
+                continue
+
+            ox, oy, oz = other.centroid
+            if abs((ox - cx) * nx + (oy - cy) * ny + (oz - cz) * nz) > _tolerance:
+                continue  # -- In a parallel, but different, plane
+
+            found.append(poly)
+
+        return found
+
+    def component(self, _polygon):
+        # type: (PHX.geometry.Polygon) -> PHX.component.Component | None
+        """Returns the Component holding the Polygon, if known."""
+        i = self._numbers.get(id(_polygon))
+        return None if i is None else self.components[i]
@@ -77,3 +77,51 @@ class SummerVent(PHX._base._Base):
         new_obj.exhaust_spec_power = join(obj_1, vol_1, obj_2, vol_2, "exhaust_spec_power")
 
         return new_obj
+
+    @staticmethod
+    def _clean_volume_weighted_average(_objs, _volumes, _attr_str):
+        # type: (list[SummerVent], list[float], str) -> float | None
+        """
+        Util function to cleanly join together any number of SummerVent attributes,
+        weighted by volume. Gives the same result as joining them two at a time with
+        _clean_volume_weighted_join(): None if any value is None, 0 if the total volume is 0.
+        """
+
+        values = [getattr(_, _attr_str, None) for _ in _objs]
+        if any(_ is None for _ in values):
+            return None
+
+        try:
+            return sum(v * vol for v, vol in zip(values, _volumes)) / sum(_volumes)
+        except ZeroDivisionError:
+            return 0
+
+    @classmethod
+    def weighted_join_all(cls, _objs, _volumes):
+        # type: (list[SummerVent], list[float]) -> SummerVent
+        """Joins any number of SummerVent objects weighted by host PHX-Zone volume, in a single pass.
+
+        Arguments:
+        ----------
+            * _objs (list[SummerVent]): The SummerVent objects to join.
+            * _volumes (list[float]): The volume of each host PHX-Zone.
+
+        Returns:
+        --------
+            * (SummerVent): The new joined SummerVent object.
+        """
+        new_obj = cls()
+
+        objs, volumes = list(_objs), list(_volumes)
+        for attr_str in (
+            "avg_mech_ach",
+            "day_window_ach",
+            "night_window_ach",
+            "additional_mech_ach",
+            "additional_mech_spec_power",
+            "exhaust_ach",
+            "exhaust_spec_power",
+        ):
+            setattr(new_obj, attr_str, cls._clean_volume_weighted_average(objs, volumes, attr_str))
+
+        return new_obj
@@ -6,6 +6,8 @@ PHX Window Type Classes
 """
 
 import PHX._base
+import PHX.id_allocator
+import PHX.metrics_cache
 
 
 class WindowFrame(PHX._base._Base):
@@ -23,7 +25,7 @@ class WindowType(PHX._base._Base):
 
     def __init__(self):
         super(WindowType, self).__init__()
-        self.id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.idDB = None
         self.name = "default_window_type"
         self.detU = True
@@ -47,11 +49,6 @@ class WindowType(PHX._base._Base):
         self.lrtbGlPsi = [None, None, None, None]
         self.lrtbFrPsi = [None, None, None, None]
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(WindowType, cls).__new__(cls, *args, **kwargs)
-
     def add_new_frame_element(self, _frame, _edge_id="L"):
         if not _frame:
             return
@@ -70,3 +67,4 @@ class WindowType(PHX._base._Base):
         self.lrtbFrU[frame_pos] = _frame.frame_u_factor
         self.lrtbGlPsi[frame_pos] = _frame.frame_psi_glazing
         self.lrtbFrPsi[frame_pos] = _frame.frame_psi_install
+        PHX.metrics_cache.changed(self)
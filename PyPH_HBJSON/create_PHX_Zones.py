@@ -59,8 +59,8 @@ def get_host_PHX_Zone(
     zone_identifier = (_hb_room.user_data or {}).get("phx", {}).get("zone_id", {}).get("identifier", None)
     zone = _bldg_segment.get_zone_by_identifier(zone_identifier)
     if not zone:
-        # -- If not, try and use the Room's identifier to find any existing Zone
-        zone = _bldg_segment.get_zone_by_identifier(_hb_room.identifier)
+        # -- If not, try and use the Room's (full) identifier to find any existing Zone
+        zone = _bldg_segment.get_zone_by_identifier(_hb_room.identifier, _exact=True)
         if not zone:
             # -- If it still isn't found, make a new one
             zone = create_PHX_Zone_from_HB_room(_hb_room)
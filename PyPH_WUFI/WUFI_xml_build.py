@@ -3,13 +3,21 @@
 
 """Functions used to create the full WUFI XML file"""
 
+import concurrent.futures
+import io
 import logging
-from typing import Union
+from typing import Callable, Iterable, Optional, Union, TextIO
 from xml.dom.minidom import Document, Element
 
+import PHX.id_allocator
 import PHX.project
 import PyPH_WUFI.xml_node
+import PyPH_WUFI.xml_traversal
 import PyPH_WUFI.WUFI_xml_convert_phx
+from PyPH_WUFI.export_context import export_context
+from PyPH_WUFI.xml_fragment_cache import XMLFragmentCache
+from PyPH_WUFI.xml_geometry import GeometryColumns, is_columnar_geometry
+from PyPH_WUFI.xml_traversal import TraversalStats, XML_START, XML_END, XML_EMPTY, XML_TEXT, XML_FRAGMENT
 
 logging.basicConfig(filename="sample/EM_logs/example.log", filemode="w", encoding="utf-8", level=logging.DEBUG)
 
@@ -26,6 +34,12 @@ def _xml_str(_: Union[str, bool]) -> str:
         return str(_)
 
 
+def _xml_escape(_: str) -> str:
+    """Util: Escape text the same way xml.dom.minidom does when writing Text and Attribute data"""
+
+    return _.replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;").replace(">", "&gt;")
+
+
 def _add_node_attributes(_data: PyPH_WUFI.xml_node.xml_writable, _element: Element) -> None:
     """Sets in any Node Attribute data on the Element, if any is found.
 
@@ -56,11 +70,16 @@ def _add_text_node(_doc: Document, _parent_node: Element, _data: PyPH_WUFI.xml_n
     _parent_node.appendChild(el)  # 5) Add the Element to the parent
 
 
-def _add_children(_doc: Document, _parent_node: Element, _item: PyPH_WUFI.xml_node.xml_writable) -> None:
-    """Adds 'child' nodes to the document recursively.
+def _add_children(
+    _doc: Document,
+    _parent_node: Element,
+    _item: PyPH_WUFI.xml_node.xml_writable,
+    _stats: Optional[TraversalStats] = None,
+) -> None:
+    """Adds 'child' nodes to the document.
 
-    Will call PyPH_WUFI.phx_converters..get_PHX_object_as_xml_node_list() function on any input
-    objects and will walk through all the resulting lists or Objects recursively.
+    Uses PyPH_WUFI.xml_traversal.walk() to step through the input object and all the
+    resulting lists or Objects (without recursion), adding a new DOM Element for each.
 
     Arguments:
     ----------
@@ -68,51 +87,428 @@ def _add_children(_doc: Document, _parent_node: Element, _item: PyPH_WUFI.xml_no
         * _parent_node (xml.dom.minidom.Element): The element to use as the 'parent' node.
         * _item (PyPH_WUFI.xml_node.XML_Node | PyPH_WUFI.xml_node.XML_Object |
             PyPH_WUFI.xml_node.XML_List): The XML Data object to walk through.
+        * _stats (PyPH_WUFI.xml_traversal.TraversalStats | None): Optional traversal counters.
     """
 
-    if isinstance(_item, PyPH_WUFI.xml_node.XML_Node):
-        # -- Basic Node, write out the value
-        _add_text_node(_doc, _parent_node, _item)
+    _add_events(_doc, _parent_node, PyPH_WUFI.xml_traversal.walk(_item, _stats))
 
-    elif isinstance(_item, PyPH_WUFI.xml_node.XML_Object):
-        # -- Add a new node for the object, then try and add all its fields
-        _new_parent_node = _doc.createElementNS(None, _xml_str(_item.node_name))
-        _add_node_attributes(_item, _new_parent_node)
-        _parent_node.appendChild(_new_parent_node)
 
-        for item in PyPH_WUFI.WUFI_xml_convert_phx.get_PHX_object_as_xml_node_list(
-            _item.node_object, _item.schema_name
-        ):
-            _add_children(_doc, _new_parent_node, item)
+def _add_events(
+    _doc: Document, _parent_node: Element, _events: Iterable[tuple[int, PyPH_WUFI.xml_node.xml_writable, int]]
+) -> None:
+    """Adds a new DOM Element to the document for each of the XML events.
 
-    elif isinstance(_item, PyPH_WUFI.xml_node.XML_List):
-        # -- Add a new node for the 'container', and then add each item in the list
-        _new_parent_node = _doc.createElementNS(None, _xml_str(_item.node_name))
-        _add_node_attributes(_item, _new_parent_node)
-        _parent_node.appendChild(_new_parent_node)
+    Arguments:
+    ----------
+        * _doc (xml.dom.minidom.doc): The XML document to operate on.
+        * _parent_node (xml.dom.minidom.Element): The element to use as the 'parent' node.
+        * _events (Iterable[tuple[int, PyPH_WUFI.xml_node.xml_writable, int]]): The XML events, as produced
+            by PyPH_WUFI.xml_traversal.walk()
+    """
 
-        for each_item in _item.node_items:
-            _add_children(_doc, _new_parent_node, each_item)
+    parent_nodes = [_parent_node]
+    for event, item, _ in _events:
+        if event == XML_TEXT:
+            # -- Basic Node, write out the value
+            _add_text_node(_doc, parent_nodes[-1], item)
 
+        elif event == XML_END:
+            parent_nodes.pop()
 
-def create_project_xml_text(_project: PHX.project.Project) -> str:
+        else:
+            # -- Add a new node for the Object or List, its children will follow
+            _new_parent_node = _doc.createElementNS(None, _xml_str(item.node_name))
+            _add_node_attributes(item, _new_parent_node)
+            parent_nodes[-1].appendChild(_new_parent_node)
+
+            if event == XML_START:
+                parent_nodes.append(_new_parent_node)
+
+
+def create_project_xml_text(_project: PHX.project.Project, _stats: Optional[TraversalStats] = None) -> str:
     """Create all the XML Nodes as text for the input Project
 
     Arguments:
     ----------
         * _project (PHX.project.Project): the Project object to use as the 'source'
             for the xml text.
+        * _stats (PyPH_WUFI.xml_traversal.TraversalStats | None): Optional traversal counters.
 
     Returns:
     --------
         * (str) The XML Nodes as text.
     """
     doc = Document()
+    with export_context():
+        _add_children(doc, doc, PyPH_WUFI.xml_node.XML_Object("WUFIplusProject", _project), _stats)
 
-    root = doc.createElementNS(None, "WUFIplusProject")
-    doc.appendChild(root)
+    return doc.toprettyxml()
 
-    for item in PyPH_WUFI.WUFI_xml_convert_phx.get_PHX_object_as_xml_node_list(_project):
-        _add_children(doc, root, item)
 
-    return doc.toprettyxml()
+# ------------------------------------------------------------------------------
+# -- Streaming Writer
+def _xml_start_tag(_data: PyPH_WUFI.xml_node.xml_writable) -> str:
+    """Returns the un-closed start tag text (name and optional attribute) for the XML Data object.
+
+    ie: '<Assembly index="0"'
+    """
+
+    if _data.attr_value is None:
+        return "<{}".format(_xml_str(_data.node_name))
+
+    return '<{} {}="{}"'.format(_xml_str(_data.node_name), _data.attr_name, _xml_escape(str(_data.attr_value)))
+
+
+def _xml_id_text(_ids: list) -> list:
+    """Util: Returns the id values ready to write out. Integer ids (the usual case) are left as they are."""
+
+    if all(type(_) is int for _ in _ids):
+        return _ids
+
+    return [_xml_escape(_xml_str(_)) for _ in _ids]
+
+
+def _write_index_list(_writer: TextIO, _node_name: str, _ids: list, _indent: str) -> None:
+    """Writes a list of 'IdentNr' nodes, with 'count' and 'index' attributes, as the _Polygon schema does."""
+
+    if not _ids:
+        _writer.write('{}<{} count="0"/>\n'.format(_indent, _node_name))
+        return
+
+    template = _indent + '\t<IdentNr index="{}">{}</IdentNr>\n'
+    _writer.write('{}<{} count="{}">\n'.format(_indent, _node_name, len(_ids)))
+    _writer.write("".join(map(template.format, range(len(_ids)), _xml_id_text(_ids))))
+    _writer.write("{}</{}>\n".format(_indent, _node_name))
+
+
+def _write_geometry(
+    _writer: TextIO,
+    _item: PyPH_WUFI.xml_node.XML_Object,
+    _indent: str,
+    _depth: int,
+    _stats: Optional[TraversalStats] = None,
+) -> None:
+    """Writes a Geom (the 'Graphics_3D' node) in bulk, from flat lists of its Vertex and Polygon data.
+
+    Columnar fast-path for the _Geom schema: no XML_Object or XML_Node is created for any
+    Vertex or Polygon, and the text is exactly the same as the generic path writes.
+
+    Arguments:
+    ----------
+        * _writer (TextIO): The text stream to write to.
+        * _item (PyPH_WUFI.xml_node.XML_Object): The XML Data object holding the Geom.
+        * _indent (str): The indentation to use for the item.
+        * _depth (int): The depth of the item in the walk, used for the traversal counters.
+        * _stats (PyPH_WUFI.xml_traversal.TraversalStats | None): Optional traversal counters.
+    """
+
+    cols = GeometryColumns.from_geom(_item.node_object)
+    if _stats is not None:
+        cols.add_traversal_stats(_stats, _depth)
+
+    t1 = _indent + "\t"
+    t2 = t1 + "\t"
+    t3 = t2 + "\t"
+    _writer.write("{}{}>\n".format(_indent, _xml_start_tag(_item)))
+
+    # -- Vertices
+    if not cols.num_vertices:
+        _writer.write('{}<Vertices count="0"/>\n'.format(t1))
+    else:
+        template = (
+            '{t2}<Vertix index="{{}}">\n'
+            "{t3}<IdentNr>{{}}</IdentNr>\n"
+            "{t3}<X>{{}}</X>\n"
+            "{t3}<Y>{{}}</Y>\n"
+            "{t3}<Z>{{}}</Z>\n"
+            "{t2}</Vertix>\n"
+        ).format(t2=t2, t3=t3)
+        _writer.write('{}<Vertices count="{}">\n'.format(t1, cols.num_vertices))
+        _writer.write(
+            "".join(
+                map(
+                    template.format,
+                    range(cols.num_vertices),
+                    _xml_id_text(cols.vertex_ids),
+                    cols.vertex_x,
+                    cols.vertex_y,
+                    cols.vertex_z,
+                )
+            )
+        )
+        _writer.write("{}</Vertices>\n".format(t1))
+
+    # -- Polygons
+    if not cols.num_polygons:
+        _writer.write('{}<Polygons count="0"/>\n'.format(t1))
+    else:
+        template = (
+            '{t2}<Polygon index="{{}}">\n'
+            "{t3}<IdentNr>{{}}</IdentNr>\n"
+            "{t3}<NormalVectorX>{{}}</NormalVectorX>\n"
+            "{t3}<NormalVectorY>{{}}</NormalVectorY>\n"
+            "{t3}<NormalVectorZ>{{}}</NormalVectorZ>\n"
+        ).format(t2=t2, t3=t3)
+        vert_ids = cols.polygon_vertex_ids
+        vert_offsets = cols.polygon_vertex_offsets
+        children = cols.polygon_children
+        child_offsets = cols.polygon_child_offsets
+
+        _writer.write('{}<Polygons count="{}">\n'.format(t1, cols.num_polygons))
+        for i, poly_id in enumerate(_xml_id_text(cols.polygon_ids)):
+            _writer.write(template.format(i, poly_id, cols.normal_x[i], cols.normal_y[i], cols.normal_z[i]))
+            _write_index_list(_writer, "IdentNrPoints", vert_ids[vert_offsets[i] : vert_offsets[i + 1]], t3)
+            _write_index_list(_writer, "IdentNrPolygonsInside", children[child_offsets[i] : child_offsets[i + 1]], t3)
+            _writer.write("{}</Polygon>\n".format(t2))
+        _writer.write("{}</Polygons>\n".format(t1))
+
+    _writer.write("{}</{}>\n".format(_indent, _xml_str(_item.node_name)))
+
+
+def _is_fragment_function(_cache: Optional[XMLFragmentCache]) -> Callable[[PyPH_WUFI.xml_node.xml_writable], bool]:
+    """Returns the test for the items which the streaming writer handles as a whole."""
+
+    if _cache is None:
+        return is_columnar_geometry
+
+    def is_fragment(_item: PyPH_WUFI.xml_node.xml_writable) -> bool:
+        return is_columnar_geometry(_item) or _cache.is_cacheable(_item)
+
+    return is_fragment
+
+
+def _write_children(
+    _writer: TextIO,
+    _item: PyPH_WUFI.xml_node.xml_writable,
+    _indent: str = "",
+    _stats: Optional[TraversalStats] = None,
+    _cache: Optional[XMLFragmentCache] = None,
+) -> None:
+    """Writes 'child' nodes as indented XML text directly to the writer.
+
+    The streaming counterpart to _add_children(). Output matches xml.dom.minidom's
+    toprettyxml() exactly but no Document or Element objects are ever created.
+
+    Geometry (Geom) objects are written in bulk by _write_geometry().
+
+    If a cache is given, the text for each cacheable object is taken from the cache
+    when the object is unchanged, otherwise it is written and then stored in the cache.
+
+    Arguments:
+    ----------
+        * _writer (TextIO): The text stream to write to.
+        * _item (PyPH_WUFI.xml_node.XML_Node | PyPH_WUFI.xml_node.XML_Object |
+            PyPH_WUFI.xml_node.XML_List): The XML Data object to walk through.
+        * _indent (str): The indentation to use for the item.
+        * _stats (PyPH_WUFI.xml_traversal.TraversalStats | None): Optional traversal counters.
+        * _cache (PyPH_WUFI.xml_fragment_cache.XMLFragmentCache | None): Optional fragment cache.
+    """
+
+    is_fragment = _is_fragment_function(_cache)
+    for event, item, depth in PyPH_WUFI.xml_traversal.walk(_item, _stats, is_fragment):
+        indent = _indent + "\t" * depth
+
+        if event == XML_TEXT:
+            _writer.write(
+                "{}{}>{}</{}>\n".format(
+                    indent,
+                    _xml_start_tag(item),
+                    _xml_escape(_xml_str(item.node_value)),
+                    _xml_str(item.node_name),
+                )
+            )
+        elif event == XML_START:
+            _writer.write("{}{}>\n".format(indent, _xml_start_tag(item)))
+        elif event == XML_END:
+            _writer.write("{}</{}>\n".format(indent, _xml_str(item.node_name)))
+        elif event == XML_EMPTY:
+            _writer.write("{}{}/>\n".format(indent, _xml_start_tag(item)))
+        elif event == XML_FRAGMENT:
+            if is_columnar_geometry(item):
+                _write_geometry(_writer, item, indent, depth, _stats)
+                continue
+
+            key = _cache.key(item, indent)
+            fragment = _cache.get(key)
+            if fragment is None:
+                id_state = PHX.id_allocator.current_state()
+                fragment_writer = io.StringIO()
+                _write_children(fragment_writer, item, indent, _stats, _cache)
+                fragment = fragment_writer.getvalue()
+
+                # -- Text which changed the object, or handed out new ID numbers, would be wrong the next time
+                if _cache.key(item, indent) == key and PHX.id_allocator.current_state() == id_state:
+                    _cache.put(key, fragment)
+            _writer.write(fragment)
+
+
+def write_project_xml(
+    _project: PHX.project.Project,
+    _writer: TextIO,
+    _stats: Optional[TraversalStats] = None,
+    _cache: Optional[XMLFragmentCache] = None,
+) -> None:
+    """Write the XML Nodes for the input Project directly to a text stream.
+
+    Produces the exact same text as create_project_xml_text() but writes each node
+    out as it is generated, rather than building up a full xml.dom.minidom.Document
+    in memory first. Use this for large Projects.
+
+    The classes of the Project's objects are checked for a schema before anything is
+    written (see PyPH_WUFI.WUFI_xml_convert_phx.check_schemas()). Any other missing schema
+    raises a SchemaNotFoundError part-way through the writing, so pass this function to
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file() so that the target file is only
+    replaced once the whole Project has been written.
+
+    When re-exporting the same Project many times, pass in the same XMLFragmentCache
+    each time so that unchanged objects are written from the cache.
+
+    Arguments:
+    ----------
+        * _project (PHX.project.Project): the Project object to use as the 'source'
+            for the xml text.
+        * _writer (TextIO): The text stream (ie: an open file) to write the XML to.
+        * _stats (PyPH_WUFI.xml_traversal.TraversalStats | None): Optional traversal counters.
+        * _cache (PyPH_WUFI.xml_fragment_cache.XMLFragmentCache | None): Optional fragment cache.
+
+    Returns:
+    --------
+        * None
+    """
+
+    PyPH_WUFI.WUFI_xml_convert_phx.check_schemas(_project)
+
+    with export_context():
+        _writer.write('<?xml version="1.0" ?>\n')
+        _write_children(
+            _writer, PyPH_WUFI.xml_node.XML_Object("WUFIplusProject", _project), _stats=_stats, _cache=_cache
+        )
+
+
+# ------------------------------------------------------------------------------
+# -- Parallel Writer
+# -- The Project's list of Variants (one per BldgSegment). Each Variant is written by a worker process.
+VARIANTS_NODE_NAME = "Variants"
+
+
+def _write_fragment(
+    _item: PyPH_WUFI.xml_node.xml_writable, _indent: str, _id_state: Optional[dict[str, int]] = None
+) -> tuple[str, TraversalStats, bool]:
+    """Worker: Returns the XML text for a single XML Data object (ie: one Variant).
+
+    Arguments:
+    ----------
+        * _item (PyPH_WUFI.xml_node.XML_Node | PyPH_WUFI.xml_node.XML_Object |
+            PyPH_WUFI.xml_node.XML_List): The XML Data object to write.
+        * _indent (str): The indentation to use for the item.
+        * _id_state (dict[str, int] | None): Optional ID number counts to write the item with, as
+            returned by PHX.id_allocator.current_state(). If None, the process's own counts are used.
+
+    Returns:
+    --------
+        * (tuple[str, TraversalStats, bool]): The XML text, the traversal counters for the item,
+            and True if any new ID numbers were handed out while writing it.
+    """
+
+    stats = TraversalStats()
+    fragment = io.StringIO()
+    if _id_state is None:
+        with export_context():
+            _write_children(fragment, _item, _indent, stats)
+        return fragment.getvalue(), stats, False
+
+    # -- Every Variant starts from the same counts, not from wherever the worker's last Variant left off
+    allocator = PHX.id_allocator.IDAllocator(_id_state)
+    with PHX.id_allocator.id_scope(allocator), export_context():
+        _write_children(fragment, _item, _indent, stats)
+
+    return fragment.getvalue(), stats, allocator.state() != _id_state
+
+
+def write_project_xml_parallel(
+    _project: PHX.project.Project,
+    _writer: TextIO,
+    _max_workers: Optional[int] = None,
+    _stats: Optional[TraversalStats] = None,
+) -> None:
+    """Write the XML Nodes for the input Project to a text stream, building each Variant in parallel.
+
+    Each BldgSegment maps to its own WUFI 'Variant', and all the Variants are independent of
+    one another. So the Variants are written as separate text 'fragments' in a pool of worker
+    processes and then spliced into the output in their original order. Everything else
+    is written in the main process, exactly as in write_project_xml(), and the resulting
+    text is identical.
+
+    The Project-level schema (and so build_temp_Project) is always run in the main process
+    first, so that the Utilization Pattern ids it assigns to the Rooms are set on the
+    objects before they are sent to the workers.
+
+    The ID number counts are frozen in the main process before the Variants are sent out,
+    and every worker writes its Variant starting from those counts. A Variant which needs
+    any new ID numbers (ie: a default object made the first time it is used) would get
+    different numbers than in write_project_xml(), so it, and all the Variants after it,
+    are written again in the main process, in order.
+
+    Arguments:
+    ----------
+        * _project (PHX.project.Project): the Project object to use as the 'source'
+            for the xml text.
+        * _writer (TextIO): The text stream (ie: an open file) to write the XML to.
+        * _max_workers (int | None): The max number of worker processes to use. If None,
+            will use one per CPU. Projects with less than 2 Variants are written without any workers.
+        * _stats (PyPH_WUFI.xml_traversal.TraversalStats | None): Optional traversal counters.
+
+    Returns:
+    --------
+        * None
+    """
+
+    if len(_project.building_segments) < 2 or _max_workers == 1:
+        write_project_xml(_project, _writer, _stats)
+        return
+
+    PyPH_WUFI.WUFI_xml_convert_phx.check_schemas(_project)
+
+    with export_context():
+        stats = _stats or TraversalStats()
+        root = PyPH_WUFI.xml_node.XML_Object("WUFIplusProject", _project)
+        project_items = PyPH_WUFI.WUFI_xml_convert_phx.get_PHX_object_as_xml_node_list(_project)
+        stats.schema_calls += 1
+        stats.nodes += 1
+        stats.visits += 2
+
+        _writer.write('<?xml version="1.0" ?>\n')
+        _writer.write("{}>\n".format(_xml_start_tag(root)))
+        for item in project_items:
+            if not isinstance(item, PyPH_WUFI.xml_node.XML_List) or item.node_name != VARIANTS_NODE_NAME:
+                _write_children(_writer, item, "\t", stats)
+                continue
+
+            # -- Write each of the Variants in a separate process, splice them in order
+            variants = item.node_items
+            stats.nodes += 1
+            stats.visits += 2
+            _writer.write("\t{}>\n".format(_xml_start_tag(item)))
+            id_state = PHX.id_allocator.current_state()
+            with concurrent.futures.ProcessPoolExecutor(max_workers=_max_workers) as executor:
+                futures = [executor.submit(_write_fragment, _, "\t\t", id_state) for _ in variants]
+                for i, future in enumerate(futures):
+                    fragment, fragment_stats, new_ids = future.result()
+                    if new_ids:
+                        break
+                    _writer.write(fragment)
+                    stats.add(fragment_stats, _depth_offset=2)
+                else:
+                    i = len(variants)
+
+                for future in futures[i:]:
+                    future.cancel()
+
+            # -- Write the rest in order, with the main process's ID numbers
+            for variant in variants[i:]:
+                fragment, fragment_stats, _ = _write_fragment(variant, "\t\t")
+                _writer.write(fragment)
+                stats.add(fragment_stats, _depth_offset=2)
+            _writer.write("\t</{}>\n".format(_xml_str(item.node_name)))
+
+        _writer.write("</{}>\n".format(_xml_str(root.node_name)))
@@ -10,6 +10,7 @@ from collections import defaultdict
 from typing import Union
 from dataclasses import dataclass, field
 
+import PHX.id_allocator
 import PHX.spaces
 import PHX.programs.schedules
 import PHX.programs.lighting
@@ -28,7 +29,7 @@ class UtilizationPattern_NonRes:
     _count = 0
 
     def __init__(self):
-        self._id = self._count
+        self.id = PHX.id_allocator.next_id(self.__class__)
         self.occupancy = None
         self.lighting = None
 
@@ -48,10 +49,6 @@ class UtilizationPattern_NonRes:
 
         return 1 / self.occupancy.loads.people_per_area
 
-    def __new__(cls, *args, **kwargs):
-        cls._count += 1
-        return super(UtilizationPattern_NonRes, cls).__new__(cls, *args, **kwargs)
-
 
 class UtilizationPatternCollection_NonRes(PyPH_WUFI.type_collections.Collection):
     def __init__(self):
@@ -65,7 +62,7 @@ class UtilizationPattern_Vent:
     _count = 0
 
     def __init__(self):
-        self.id: int = self._count
+        self.id: int = PHX.id_allocator.next_id(self.__class__)
         self.name: str = None
         self.operating_days: float = None
         self.operating_weeks: float = None
@@ -85,11 +82,6 @@ class UtilizationPattern_Vent:
 
         self.utilization_rates.minimum.daily_op_sched = round(_max_hours - total, tolerance)
 
-    def __new__(cls, *args, **kwargs):
-        """Used so I can keep a running tally for the id variable"""
-        cls._count += 1
-        return super(UtilizationPattern_Vent, cls).__new__(cls, *args, **kwargs)
-
 
 class UtilizationPatternCollection_Vent(PyPH_WUFI.type_collections.Collection):
     def __init__(self):
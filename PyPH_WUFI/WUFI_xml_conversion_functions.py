@@ -14,6 +14,7 @@ from PHX.programs.lighting import RoomLighting
 from PHX.programs.occupancy import RoomOccupancy
 from PHX.mechanicals.systems import Mechanicals, MechanicalSystem
 from PHX.mechanicals.equipment import HVAC_Device
+from PyPH_WUFI.export_context import memoize_in_export
 from PyPH_WUFI.WUFI_xml_conversion_classes import (
     UtilizationPattern_Vent,
     UtilizationPatternCollection_Vent,
@@ -38,9 +39,12 @@ TOL = 2  # Value tolerance for rounding. ie; 9.84318191919 -> 9.84
 
 # ------------------------------------------------------------------------------
 # -- HRV ID
+@memoize_in_export(lambda _: _.mechanicals)
 def build_temp_RoomVentilation(_phx_object: Room) -> temp_RoomVentilation:
     """Find the Fresh-air Ventilator ID number which serves the PHX-Room
 
+    During an export, the result is shared by all the Spaces with the same mechanicals.
+
     Arguments:
     ----------
         * (PHX.bldg_segment.Room):
@@ -62,9 +66,12 @@ def build_temp_RoomVentilation(_phx_object: Room) -> temp_RoomVentilation:
 
 # ------------------------------------------------------------------------------
 # -- Build all the Spaces with the Room Program attributes
+@memoize_in_export()
 def build_temp_Zone(_phx_zone: Zone) -> temp_Zone:
     """Since Program and Equipment are only present at the 'Room' level, need to add
     that info to the Spaces so that can be written out properly to WUFI.
+
+    During an export, each Zone's temp_Zone is only built once.
     """
 
     temp_zone = temp_Zone()
@@ -3,8 +3,13 @@
 
 """Functions to oganize and prepare PHX Objects for WUFI-XML export"""
 
-# from typing import Optional
-from typing import Optional
+from collections.abc import Collection
+from types import FunctionType
+from typing import Callable, Iterable, Optional, Union
+import PHX.assemblies
+import PHX.bldg_segment
+import PHX.component
+import PHX.project
 import PyPH_WUFI.WUFI_xml_schemas_write
 import PyPH_WUFI.WUFI_xml_conversion_functions
 
@@ -13,6 +18,156 @@ from PyPH_WUFI.xml_node import xml_writable
 from PHX._base import _Base as PHX_Base
 
 
+class SchemaNotFoundError(Exception):
+    def __init__(self, _schema_nm, _phx_object):
+        self.schema_nm = _schema_nm
+        self.phx_object = _phx_object
+        self.message = (
+            'Error: No WUFI-XML schema function named "{}" found for object: "{}", type: "{}". '
+            "Please add the schema to the PyPH_WUFI.WUFI_xml_schemas_write module.".format(
+                _schema_nm, _phx_object, type(_phx_object)
+            )
+        )
+        super(SchemaNotFoundError, self).__init__(self.message)
+
+    def __reduce__(self):
+        # -- So the error can be passed back from the parallel writer's worker processes
+        return (self.__class__, (self.schema_nm, self.phx_object))
+
+
+# ------------------------------------------------------------------------------
+# -- Schema Registry
+# -- All the schema functions, by name. Built once, on first use.
+_SCHEMA_FUNCTIONS: dict[str, Callable] = {}
+
+# -- The schema function to use for each class, when no explicit schema-name is given.
+_CLASS_SCHEMA_FUNCTIONS: dict[type, Callable] = {}
+
+# -- The attributes of each class which hold the PHX Objects its schema writes with their own
+# -- class's schema (ie: a BldgSegment's 'zones'). Used by check_schemas() to find all the classes
+# -- an export will look up, without running any of the schemas. The Geom's Vertices are left
+# -- out since they are always PHX.geometry.Vertex objects.
+_CHILD_ATTRIBUTES: dict[type, tuple[str, ...]] = {
+    PHX.project.Project: ("projD", "lAssembly", "lWindow", "building_segments"),
+    PHX.project.ProjectData: ("date",),
+    PHX.assemblies.Assembly: ("Layers",),
+    PHX.assemblies.Layer: ("material",),
+    PHX.bldg_segment.BldgSegment: ("geom", "climate", "foundations", "components", "zones"),
+    PHX.bldg_segment.Geom: ("polygons",),
+    PHX.component.Component: ("int_UD_color", "ext_UD_color"),
+}
+
+
+def _load_schema_functions() -> dict[str, Callable]:
+    """Collect all the schema functions from PyPH_WUFI.WUFI_xml_schemas_write, by name."""
+
+    if not _SCHEMA_FUNCTIONS:
+        for name, obj in vars(PyPH_WUFI.WUFI_xml_schemas_write).items():
+            if name.startswith("_") and isinstance(obj, FunctionType):
+                _SCHEMA_FUNCTIONS[name] = obj
+
+    return _SCHEMA_FUNCTIONS
+
+
+def register_schema(
+    _phx_class: type, _schema: Union[str, Callable], _child_attributes: Optional[Iterable[str]] = None
+) -> None:
+    """Set the schema function to use for a class, overriding the default "_{ClassName}" lookup.
+
+    Arguments:
+    ----------
+        * _phx_class (type): The class to register the schema for.
+        * _schema (str | Callable): The name of a function in PyPH_WUFI.WUFI_xml_schemas_write,
+            or the schema function itself.
+        * _child_attributes (Iterable[str] | None): Optional names of the attributes holding the
+            PHX Objects which the schema writes with their own class's schema. Used by check_schemas().
+    """
+
+    if isinstance(_schema, str):
+        try:
+            _schema = _load_schema_functions()[_schema]
+        except KeyError:
+            raise SchemaNotFoundError(_schema, _phx_class)
+
+    _CLASS_SCHEMA_FUNCTIONS[_phx_class] = _schema
+    if _child_attributes is not None:
+        _CHILD_ATTRIBUTES[_phx_class] = tuple(_child_attributes)
+
+
+def get_schema_function(_phx_object: PHX_Base, _schema_nm: Optional[str] = None) -> Callable:
+    """Returns the XML Schema function for the object.
+
+    Arguments:
+    ----------
+        * _phx_object (PHX._base._Base): The PHX Object to find the WUFI-XML data schema for.
+        * _schema_nm (str | None): Optional schema-name to search for. If None, by default,
+            will use the name of the object's class preceded by an underscore.
+
+    Returns:
+    --------
+        * (Callable): The schema function.
+    """
+
+    if _schema_nm:
+        try:
+            return _SCHEMA_FUNCTIONS[_schema_nm]
+        except KeyError:
+            try:
+                return _load_schema_functions()[_schema_nm]
+            except KeyError:
+                raise SchemaNotFoundError(_schema_nm, _phx_object)
+
+    phx_class = _phx_object.__class__
+    try:
+        return _CLASS_SCHEMA_FUNCTIONS[phx_class]
+    except KeyError:
+        register_schema(phx_class, "_{}".format(phx_class.__name__))
+        return _CLASS_SCHEMA_FUNCTIONS[phx_class]
+
+
+def _child_attributes(_phx_class: type) -> tuple[str, ...]:
+    """Returns the names of the class's (or its nearest registered base class's) child attributes."""
+
+    for cls in _phx_class.__mro__:
+        if cls in _CHILD_ATTRIBUTES:
+            return _CHILD_ATTRIBUTES[cls]
+    return ()
+
+
+def check_schemas(_phx_object: PHX_Base) -> None:
+    """Check that there is a schema function for the class of every object the export will look up.
+
+    Runs before the export writes anything, so that a missing schema fails right away. Only the
+    classes are looked up: the objects are found through the _CHILD_ATTRIBUTES of each class, and
+    none of the schema functions are run. Objects written with an explicit schema-name, or through
+    the 'temp' conversion classes, are checked when they are written.
+
+    Arguments:
+    ----------
+        * _phx_object (PHX._base._Base): The top-level PHX Object (ie: the Project) to check.
+
+    Raises:
+    -------
+        * SchemaNotFoundError: If any of the classes has no schema function.
+    """
+
+    checked = set()
+    stack = [_phx_object]
+    while stack:
+        obj = stack.pop()
+        if obj.__class__ not in checked:
+            get_schema_function(obj)
+            checked.add(obj.__class__)
+
+        for attr_name in _child_attributes(obj.__class__):
+            value = getattr(obj, attr_name, None)
+            if isinstance(value, Collection):
+                # -- A list of objects. Once a class is checked, its objects are only needed if they have children
+                stack.extend(_ for _ in value if _.__class__ not in checked or _child_attributes(_.__class__))
+            elif value is not None:
+                stack.append(value)
+
+
 def get_PHX_object_as_xml_node_list(_phx_object: PHX_Base, _schema_nm: Optional[str] = None) -> list[xml_writable]:
     """Returns a list of the Object's Attributes in WUFI-XML format
 
@@ -37,13 +192,8 @@ def get_PHX_object_as_xml_node_list(_phx_object: PHX_Base, _schema_nm: Optional[
             ]
     """
 
-    # -- Figure out the right XML Write Schema to use
-    if not _schema_nm:
-        class_name = _phx_object.__class__.__name__
-        _schema_nm = "_{}".format(class_name)
-
-    # -- Convert the object to an XML Node List
-    xml_schema_function = getattr(PyPH_WUFI.WUFI_xml_schemas_write, _schema_nm)
+    # -- Figure out the right XML Write Schema to use, convert the object to an XML Node List
+    xml_schema_function = get_schema_function(_phx_object, _schema_nm)
     xml_node_list = xml_schema_function(_phx_object)
 
     return xml_node_list
@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Functions for reading a WUFI-Passive XML file back into a PHX Project.
+
+The file is read incrementally (xml.etree.ElementTree.iterparse) and each large
+item (Vertix, Polygon, Component, Zone, Variant, ...) is converted into its PHX
+Object and then removed from the parsed tree as soon as it is complete. This keeps
+the memory used by the XML itself flat, even for very large files.
+
+Reading is lossy. Only the data which maps directly onto the PHX Project, BldgSegment,
+Zone, Component and Geometry objects is read: Project and ProjectData values, Variant
+(BldgSegment) values, the Graphics_3D geometry, Components and the basic Zone values.
+The elements in NOT_READ (Assemblies, WindowTypes, HVAC, Climate, the Room loads,
+PassivehouseData, ...) are skipped, and the new Project has the PHX default values for
+them instead. The Components keep the IdentNr of their Assembly and WindowType.
+"""
+
+import gzip
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Optional, Union
+from xml.etree.ElementTree import Element, iterparse
+
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.project
+
+
+class WUFIXMLReadError(Exception):
+    def __init__(self, _source, _message):
+        self.message = 'Error reading WUFI-XML file "{}": {}'.format(_source, _message)
+        super().__init__(self.message)
+
+
+# -- Elements which are read as each of their children is completed. The children
+# -- of these elements are removed as soon as they are finished.
+_STREAMED_PARENTS = {
+    "WUFIplusProject",
+    "Variants",
+    "Variant",
+    "Graphics_3D",
+    "Vertices",
+    "Polygons",
+    "Building",
+    "Components",
+    "Zones",
+}
+
+
+# -- Elements which are in the file, but are not read (the PHX defaults are used instead)
+NOT_READ = (
+    "WUFIplusProject/Assemblies",
+    "WUFIplusProject/WindowTypes",
+    "WUFIplusProject/SolarProtectionTypes",
+    "WUFIplusProject/UtilisationPatternsVentilation",
+    "WUFIplusProject/UtilizationPatternsPH",
+    "Variant/ClimateLocation",
+    "Variant/PassivehouseData",
+    "Variant/HVAC",
+    "Zone/RoomsVentilation",
+    "Zone/LoadsPersonsPH",
+    "Zone/LoadsLightingsPH",
+    "Zone/LoadsOfficeEquipmentsPH",
+    "Zone/HomeDevice",
+    "Zone/LoadsAuxElectricitiesPH",
+)
+
+
+# ------------------------------------------------------------------------------
+# -- Text value conversion
+def _str(_text: Optional[str]) -> Optional[str]:
+    """Text, with 'None' as None (the writer outputs None values as 'None')"""
+
+    if _text is None:
+        return ""
+    if _text == "None":
+        return None
+    return _text
+
+
+def _num(_text: Optional[str]) -> Union[int, float, None]:
+    """Int or float, whichever the text was written as. So '2' stays 2 and '2.0' stays 2.0"""
+
+    if _text is None or _text == "None":
+        return None
+    try:
+        return int(_text)
+    except ValueError:
+        return float(_text)
+
+
+def _bool(_text: Optional[str]) -> Optional[bool]:
+    if _text is None or _text == "None":
+        return None
+    return _text.strip().lower() == "true"
+
+
+def _child_text(_element: Element, _tag: str) -> Optional[str]:
+    child = _element.find(_tag)
+    if child is None:
+        return None
+    return child.text or ""
+
+
+def _id_list(_element: Element, _tag: str) -> list[int]:
+    """Returns the IdentNr values from a list-node. ie: <IdentNrPolygons count="2"><IdentNr index="0">..."""
+
+    container = _element.find(_tag)
+    if container is None:
+        return []
+    return [int(_.text) for _ in container.findall("IdentNr")]
+
+
+def _set_attr_path(_obj: Any, _attr_path: str, _value: Any) -> None:
+    """setattr() which allows dotted paths. ie: 'summer_ventilation.avg_mech_ach'"""
+
+    *parent_names, attr_name = _attr_path.split(".")
+    for parent_name in parent_names:
+        _obj = getattr(_obj, parent_name)
+    setattr(_obj, attr_name, _value)
+
+
+def _set_attrs_from_children(_obj: Any, _element: Element, _fields: dict[str, tuple[str, Callable]]) -> None:
+    """Set the object's attributes from the element's child text-nodes.
+
+    Arguments:
+    ----------
+        * _obj (Any): The PHX object to set the attribute values on.
+        * _element (xml.etree.ElementTree.Element): The parent XML element.
+        * _fields (dict[str, tuple[str, Callable]]): The XML child tag name, and the
+            attribute name (path) and text-conversion function to use for each.
+    """
+
+    for child in _element:
+        try:
+            attr_path, convert = _fields[child.tag]
+        except KeyError:
+            continue
+        _set_attr_path(_obj, attr_path, convert(child.text or ""))
+
+
+# ------------------------------------------------------------------------------
+# -- Field maps: XML tag -> (PHX attribute, conversion function)
+PROJECT_FIELDS = {
+    "DataVersion": ("data_version", _num),
+    "UnitSystem": ("unit_system", _num),
+    "ProgramVersion": ("progVers", _str),
+    "Scope": ("calcScope", _num),
+    "DimensionsVisualizedGeometry": ("dimVisGeom", _num),
+}
+
+PROJECT_DATA_FIELDS = {
+    "Customer_Name": ("cN", _str),
+    "Customer_Locality": ("cLoc", _str),
+    "Customer_PostalCode": ("cPostC", _str),
+    "Customer_Street": ("cStr", _str),
+    "Customer_Tel": ("cTel", _str),
+    "Customer_Email": ("cEmail", _str),
+    "Building_Name": ("bN", _str),
+    "Year_Construction": ("bYCon", _str),
+    "Building_Locality": ("bLoc", _str),
+    "Building_PostalCode": ("bPostC", _str),
+    "Building_Street": ("bStr", _str),
+    "OwnerIsClient": ("oIsC", _bool),
+    "Owner_Name": ("oN", _str),
+    "Owner_Locality": ("oLoc", _str),
+    "Owner_PostalCode": ("oPostC", _str),
+    "Owner_Street": ("oStreet", _str),
+    "Responsible_Name": ("rN", _str),
+    "Responsible_Locality": ("rLoc", _str),
+    "Responsible_PostalCode": ("rPostC", _str),
+    "Responsible_Street": ("rStr", _str),
+    "Responsible_Tel": ("rTel", _str),
+    "Responsible_LicenseNr": ("rLic", _str),
+    "Responsible_Email": ("rEmail", _str),
+    "WhiteBackgroundPictureBuilding": ("wBkg", _bool),
+}
+
+DATE_FIELDS = {
+    "Year": ("Year", _num),
+    "Month": ("Month", _num),
+    "Day": ("Day", _num),
+    "Hour": ("Hour", _num),
+    "Minutes": ("Minutes", _num),
+}
+
+VARIANT_FIELDS = {
+    "IdentNr": ("id", _num),
+    "Name": ("name", _str),
+    "Remarks": ("remarks", _str),
+    "PlugIn": ("plugin", _str),
+}
+
+BUILDING_FIELDS = {
+    "Numerics": ("numerics", _str),
+    "AirFlowModel": ("airflow_model", _str),
+    "CountGenerated": ("count_generator", _num),
+    "HasBeenGenerated": ("has_been_generated", _bool),
+    "HasBeenChangedSinceLastGeneration": ("has_been_changed_since_last_gen", _bool),
+}
+
+COMPONENT_FIELDS = {
+    "IdentNr": ("id", _num),
+    "Name": ("name", _str),
+    "Visual": ("visC", _bool),
+    "InnerAttachment": ("int_exposure_zone_id", _num),
+    "OuterAttachment": ("ext_exposure_zone_id", _num),
+    "Type": ("type", _num),
+    "IdentNrColorI": ("int_color_id", _num),
+    "IdentNrColorE": ("ext_color_id", _num),
+    "IdentNr_ComponentInnerSurface": ("inner_srfc_compo_idNr", _num),
+    "IdentNrAssembly": ("assembly_id_num", _num),
+    "IdentNrWindowType": ("win_type_id_num", _num),
+}
+
+COLOR_FIELDS = {
+    "Alpha": ("alpha", _num),
+    "Red": ("red", _num),
+    "Green": ("green", _num),
+    "Blue": ("blue", _num),
+}
+
+ZONE_FIELDS = {
+    "Name": ("name", _str),
+    "IdentNr": ("id", _num),
+    "GrossVolume_Selection": ("volume_gross_selection", _num),
+    "GrossVolume": ("volume_gross", _num),
+    "NetVolume_Selection": ("volume_net_selection", _num),
+    "NetVolume": ("volume_net", _num),
+    "FloorArea_Selection": ("floor_area_selection", _num),
+    "FloorArea": ("floor_area", _num),
+    "ClearanceHeight_Selection": ("clearance_height_selection", _num),
+    "ClearanceHeight": ("clearance_height", _num),
+    "SpecificHeatCapacity_Selection": ("spec_heat_cap_selection", _num),
+    "SpecificHeatCapacity": ("spec_heat_cap", _num),
+    "SummerMechanicalVentilationNight": ("summer_ventilation.avg_mech_ach", _num),
+    "SummerNaturalVentilationDay": ("summer_ventilation.day_window_ach", _num),
+    "SummerNaturalVentilationNight": ("summer_ventilation.night_window_ach", _num),
+    "MechanicalAutomaticControlledVentilation": ("summer_ventilation.additional_mech_ach", _num),
+    "SpecificPowerConsumptionAdditionalVentCooling": ("summer_ventilation.additional_mech_spec_power", _num),
+    "ACHViaMechanicalVentilationExhaustAir": ("summer_ventilation.exhaust_ach", _num),
+    "SpecificPowerConsumption": ("summer_ventilation.exhaust_spec_power", _num),
+    "NumberBedrooms": ("occupancy.num_bedrooms", _num),
+    "OccupantQuantityUserDef": ("occupancy.num_occupants", _num),
+}
+
+
+# ------------------------------------------------------------------------------
+class _ProjectReader:
+    """Builds up the PHX Project from the XML elements, as each one is completed."""
+
+    def __init__(self, _source_name: str = ""):
+        self.source_name = _source_name
+        self.project = PHX.project.Project()
+        self.segment = None
+        self.vertices = {}
+        self.polygons = {}
+
+        # -- (parent tag, tag) -> function to call with the completed element
+        self.handlers = {
+            ("WUFIplusProject", "ProjectData"): self.read_project_data,
+            ("Variants", "Variant"): self.end_variant,
+            ("Vertices", "Vertix"): self.read_vertex,
+            ("Polygons", "Polygon"): self.read_polygon,
+            ("Components", "Component"): self.read_component,
+            ("Zones", "Zone"): self.read_zone,
+        }
+        for tag in PROJECT_FIELDS:
+            self.handlers[("WUFIplusProject", tag)] = self.read_project_field
+        for tag in VARIANT_FIELDS:
+            self.handlers[("Variant", tag)] = self.read_variant_field
+        for tag in BUILDING_FIELDS:
+            self.handlers[("Building", tag)] = self.read_building_field
+
+    # -- Project
+    def read_project_field(self, _element: Element) -> None:
+        attr_path, convert = PROJECT_FIELDS[_element.tag]
+        _set_attr_path(self.project, attr_path, convert(_element.text or ""))
+
+    def read_project_data(self, _element: Element) -> None:
+        _set_attrs_from_children(self.project.projD, _element, PROJECT_DATA_FIELDS)
+
+        date_element = _element.find("Date_Project")
+        if date_element is not None:
+            _set_attrs_from_children(self.project.projD.date, date_element, DATE_FIELDS)
+
+    # -- Variants / BldgSegments
+    def start_variant(self) -> None:
+        self.segment = PHX.bldg_segment.BldgSegment()
+        self.vertices = {}
+        self.polygons = {}
+
+    def end_variant(self, _element: Element) -> None:
+        self.project.add_segment(self.segment)
+        self.segment = None
+        self.vertices = {}
+        self.polygons = {}
+
+    def read_variant_field(self, _element: Element) -> None:
+        attr_path, convert = VARIANT_FIELDS[_element.tag]
+        _set_attr_path(self.segment, attr_path, convert(_element.text or ""))
+
+    def read_building_field(self, _element: Element) -> None:
+        attr_path, convert = BUILDING_FIELDS[_element.tag]
+        _set_attr_path(self.segment, attr_path, convert(_element.text or ""))
+
+    # -- Geometry
+    def read_vertex(self, _element: Element) -> None:
+        vertex = PHX.geometry.Vertex(
+            _num(_child_text(_element, "X")),
+            _num(_child_text(_element, "Y")),
+            _num(_child_text(_element, "Z")),
+        )
+        vertex.id = _num(_child_text(_element, "IdentNr"))
+        self.vertices[vertex.id] = vertex
+
+    def read_polygon(self, _element: Element) -> None:
+        polygon = PHX.geometry.Polygon()
+        polygon.id = _num(_child_text(_element, "IdentNr"))
+        polygon.nVec = PHX.geometry.Vector(
+            _num(_child_text(_element, "NormalVectorX")),
+            _num(_child_text(_element, "NormalVectorY")),
+            _num(_child_text(_element, "NormalVectorZ")),
+        )
+        try:
+            polygon.vertices = [self.vertices[_] for _ in _id_list(_element, "IdentNrPoints")]
+        except KeyError as e:
+            raise WUFIXMLReadError(self.source_name, "Polygon {} uses an unknown Vertex: {}".format(polygon.id, e))
+        polygon.children = _id_list(_element, "IdentNrPolygonsInside")
+
+        # -- Added in the file's order, so Polygons which are not part of any Component are kept as well
+        self.polygons[polygon.id] = polygon
+        self.segment.geom.add_polygons(polygon)
+
+    # -- Components
+    def read_component(self, _element: Element) -> None:
+        compo = PHX.component.Component()
+        _set_attrs_from_children(compo, _element, COMPONENT_FIELDS)
+        compo.idSKP = compo.id
+
+        inner_attachment = _element.find("InnerAttachment")
+        if inner_attachment is not None:
+            compo.int_exposure_zone_name = inner_attachment.get("choice")
+
+        for tag, attr_name in (("ColorExternUserDef", "int_UD_color"), ("ColorInternUserDef", "ext_UD_color")):
+            color_element = _element.find(tag)
+            if color_element is not None:
+                _set_attrs_from_children(getattr(compo, attr_name), color_element, COLOR_FIELDS)
+
+        try:
+            compo.polygons = [self.polygons[_] for _ in _id_list(_element, "IdentNrPolygons")]
+        except KeyError as e:
+            raise WUFIXMLReadError(self.source_name, "Component {} uses an unknown Polygon: {}".format(compo.id, e))
+
+        # -- The Polygons are already in the Segment's Geometry, in their original order
+        self.segment.add_components(compo)
+
+    # -- Zones
+    def read_zone(self, _element: Element) -> None:
+        zone = PHX.bldg_segment.Zone()
+        _set_attrs_from_children(zone, _element, ZONE_FIELDS)
+        self.segment.add_zones(zone)
+
+
+def _open_source(_source: Union[str, Path, BinaryIO]) -> BinaryIO:
+    """Returns an open binary file for the source. Files ending in '.gz' are decompressed."""
+
+    if hasattr(_source, "read"):
+        return _source
+
+    if str(_source).endswith(".gz"):
+        return gzip.open(_source, "rb")
+    return open(_source, "rb")
+
+
+def read_project_xml(_source: Union[str, Path, BinaryIO]) -> PHX.project.Project:
+    """Read a WUFI-Passive XML file and return a new PHX Project.
+
+    The file is parsed incrementally and each Vertix, Polygon, Component, Zone and
+    Variant element is removed from memory as soon as it has been converted.
+
+    The elements in NOT_READ are skipped, so writing the new Project back out will not
+    give the same file if the original had (ie:) Assemblies, HVAC or Room loads in it.
+
+    Arguments:
+    ----------
+        * _source (str | pathlib.Path | BinaryIO): The path to the XML file (or a
+            '.xml.gz' compressed file), or an open binary file object.
+
+    Returns:
+    --------
+        * (PHX.project.Project): The new Project, with one BldgSegment for each Variant.
+    """
+
+    source_name = getattr(_source, "name", _source)
+    reader = _ProjectReader(source_name)
+
+    f = _open_source(_source)
+    try:
+        # -- The open elements, from the root down to the current element
+        open_elements = []
+        for event, element in iterparse(f, events=("start", "end")):
+            if event == "start":
+                if element.tag == "Variant" and open_elements and open_elements[-1].tag == "Variants":
+                    reader.start_variant()
+                open_elements.append(element)
+                continue
+
+            open_elements.pop()
+            if not open_elements:
+                continue  # The root element
+
+            parent = open_elements[-1]
+            handler = reader.handlers.get((parent.tag, element.tag))
+            if handler:
+                try:
+                    handler(element)
+                except (TypeError, ValueError) as e:
+                    raise WUFIXMLReadError(source_name, "Bad value in <{}>: {}".format(element.tag, e))
+
+            # -- Drop the finished element, unless its parent will still need it
+            if parent.tag in _STREAMED_PARENTS:
+                parent.remove(element)
+    finally:
+        if f is not _source:
+            f.close()
+
+    if open_elements:
+        raise WUFIXMLReadError(source_name, "Unexpected end of file.")
+
+    return reader.project
@@ -130,10 +130,8 @@ def _Assembly(_obj) -> list[xml_writable]:
     return [
         PyPH_WUFI.xml_node.XML_Node("IdentNr", _obj.id),
         PyPH_WUFI.xml_node.XML_Node("Name", _obj.name),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Assembly::Order_Layers", _obj.Order_Layers).xml_data
-        ),
-        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.Selection("Assembly::Grid_Kind", _obj.Grid_Kind).xml_data),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Assembly::Order_Layers", _obj.Order_Layers)),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Assembly::Grid_Kind", _obj.Grid_Kind)),
         PyPH_WUFI.xml_node.XML_List(
             "Layers",
             [PyPH_WUFI.xml_node.XML_Object("Layer", _, "index", i) for i, _ in enumerate(_obj.Layers)],
@@ -216,9 +214,9 @@ def _Component(_obj) -> list[xml_writable]:
             "InnerAttachment", _obj.int_exposure_zone_id, "choice", _obj.int_exposure_zone_name
         ),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Component::OuterAttachment", _obj.ext_exposure_zone_id).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Component::OuterAttachment", _obj.ext_exposure_zone_id)
         ),
-        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.Selection("Component::Type", _obj.type).xml_data),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Component::Type", _obj.type)),
         PyPH_WUFI.xml_node.XML_Node("IdentNrColorI", _obj.int_color_id),
         PyPH_WUFI.xml_node.XML_Node("IdentNrColorE", _obj.ext_color_id),
         PyPH_WUFI.xml_node.XML_Object("ColorExternUserDef", _obj.int_UD_color),
@@ -257,17 +255,13 @@ def _temp_PH_Building(_obj: temp_PH_Building) -> list[xml_writable]:
     return [
         PyPH_WUFI.xml_node.XML_Node("IdentNr", _obj.id),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Occupancy::BuildingCategory", _obj.occupancy_category).xml_data
-        ),
-        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.Selection(type_category, _obj.occupancy_type).xml_data),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("PHIUS::BuildingStatus", _obj.building_status).xml_data
-        ),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("PHIUS::BuildingType", _obj.building_type).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Occupancy::BuildingCategory", _obj.occupancy_category)
         ),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data(type_category, _obj.occupancy_type)),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("PHIUS::BuildingStatus", _obj.building_status)),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("PHIUS::BuildingType", _obj.building_type)),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("PHIUS::OccupancySettingMethod", _obj.occupancy_setting_method).xml_data
+            *PyPH_WUFI.selection.get_xml_data("PHIUS::OccupancySettingMethod", _obj.occupancy_setting_method)
         ),
         PyPH_WUFI.xml_node.XML_Node("NumberUnits", _obj.num_units, "unit", "-"),
         PyPH_WUFI.xml_node.XML_Node("CountStories", _obj.num_stories),
@@ -281,9 +275,7 @@ def _temp_PH_Building(_obj: temp_PH_Building) -> list[xml_writable]:
         ),
         PyPH_WUFI.xml_node.XML_Object("InternalGainsAdditionalData", _obj.int_gains),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection(
-                "Mech_Summer::SummerHRVHumidityRecovery", _obj.summer_hrv_bypass_mode
-            ).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Mech_Summer::SummerHRVHumidityRecovery", _obj.summer_hrv_bypass_mode)
         ),
     ]
 
@@ -291,10 +283,10 @@ def _temp_PH_Building(_obj: temp_PH_Building) -> list[xml_writable]:
 def _temp_PassiveHouseData(_obj: temp_PassiveHouseData) -> list[xml_writable]:
     return [
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("PHIUS::PH_CertificateCriteria", _obj.certification_criteria).xml_data
+            *PyPH_WUFI.selection.get_xml_data("PHIUS::PH_CertificateCriteria", _obj.certification_criteria)
         ),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("PHIUS::PH_SelectionTargetData", _obj.localization_selection_type).xml_data
+            *PyPH_WUFI.selection.get_xml_data("PHIUS::PH_SelectionTargetData", _obj.localization_selection_type)
         ),
         PyPH_WUFI.xml_node.XML_Node("AnnualHeatingDemand", _obj.PHIUS2021_heating_demand, "unit", "kWh/m²a"),
         PyPH_WUFI.xml_node.XML_Node("AnnualCoolingDemand", _obj.PHIUS2021_cooling_demand, "unit", "kWh/m²a"),
@@ -421,11 +413,9 @@ def _Climate(_obj: PHX.climate.Climate) -> list[xml_writable]:
 def _Foundation(_obj):
     return [
         PyPH_WUFI.xml_node.XML_Node("Name", _obj.name),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Foundation::FloorSlabType", _obj.floor_type)),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Foundation::FloorSlabType", _obj.floor_type).xml_data
-        ),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Foundation::SettingFloorSlabType", _obj.floor_setting).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Foundation::SettingFloorSlabType", _obj.floor_setting)
         ),
     ]
 
@@ -439,25 +429,23 @@ def _Zone(_obj: Zone) -> list[xml_writable]:
         PyPH_WUFI.xml_node.XML_Node("Name", _obj.name),
         PyPH_WUFI.xml_node.XML_Node("IdentNr", _obj.id),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Zone::GrossVolume_Selection", _obj.volume_gross_selection).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Zone::GrossVolume_Selection", _obj.volume_gross_selection)
         ),
         PyPH_WUFI.xml_node.XML_Node("GrossVolume", round(_obj.volume_gross, TOL), "unit"),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Zone::NetVolume_Selection", _obj.volume_net_selection).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Zone::NetVolume_Selection", _obj.volume_net_selection)
         ),
         PyPH_WUFI.xml_node.XML_Node("NetVolume", round(_obj.volume_net, TOL), "unit"),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Zone::FloorArea_Selection", _obj.floor_area_selection).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Zone::FloorArea_Selection", _obj.floor_area_selection)
         ),
         PyPH_WUFI.xml_node.XML_Node("FloorArea", round(_obj.floor_area, TOL), "unit"),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Zone::ClearanceHeight_Selection", _obj.clearance_height_selection).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Zone::ClearanceHeight_Selection", _obj.clearance_height_selection)
         ),
         PyPH_WUFI.xml_node.XML_Node("ClearanceHeight", round(_obj.clearance_height, TOL), "unit", "m"),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection(
-                "Zone::SpecificHeatCapacity_Selection", _obj.spec_heat_cap_selection
-            ).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Zone::SpecificHeatCapacity_Selection", _obj.spec_heat_cap_selection)
         ),
         PyPH_WUFI.xml_node.XML_Node("SpecificHeatCapacity", round(_obj.spec_heat_cap, 0), "unit", "Wh/m²K"),
         # -- Room Loads (Occupancy, Ventilation, Lighting) and Appliances
@@ -589,7 +577,7 @@ def _RoomVentilation(_temp_space: temp_Space) -> list[xml_writable]:
     return [
         PyPH_WUFI.xml_node.XML_Node("Name", _temp_space.space.display_name),
         PyPH_WUFI.xml_node.XML_Node("Quantity", _temp_space.space.quantity),
-        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.Selection("WP_Room::Type", _temp_space.space.type).xml_data),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("WP_Room::Type", _temp_space.space.type)),
         PyPH_WUFI.xml_node.XML_Node("AreaRoom", round(_temp_space.space.floor_area_weighted, TOL), "unit", "m²"),
         PyPH_WUFI.xml_node.XML_Node("ClearRoomHeight", round(_temp_space.space.clear_height, TOL), "unit", "m"),
         PyPH_WUFI.xml_node.XML_Node("IdentNrUtilizationPatternVent", _temp_space.ventilation.schedule.id),
@@ -794,12 +782,12 @@ def _Project(_obj: Project) -> list[xml_writable]:
 def _Appliance_dishwasher(_obj) -> list[xml_writable]:
     return [
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Appliances::Connection", _obj.dishwasher_water_connection).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Appliances::Connection", _obj.dishwasher_water_connection)
         ),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection(
+            *PyPH_WUFI.selection.get_xml_data(
                 "Appliances::DishwasherCapacityPreselection", _obj.dishwasher_capacity_type
-            ).xml_data
+            )
         ),
         PyPH_WUFI.xml_node.XML_Node("DishwasherCapacityInPlace", _obj.dishwasher_capacity, "unit", "-"),
     ]
@@ -810,22 +798,20 @@ def _Appliance_clothes_washer(_obj) -> list[xml_writable]:
         PyPH_WUFI.xml_node.XML_Node("UtilizationFactor", _obj.washer_utilization_factor, "unit", "-"),
         PyPH_WUFI.xml_node.XML_Node("MEF_ModifiedEnergyFactor", _obj.washer_modified_energy_factor, "unit", "-"),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Appliances::Connection", _obj.washer_connection).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Appliances::Connection", _obj.washer_connection)
         ),
     ]
 
 
 def _Appliance_clothes_dryer(_obj) -> list[xml_writable]:
     return [
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Appliances::Dryer_Choice", _obj.dryer_type).xml_data
-        ),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Appliances::Dryer_Choice", _obj.dryer_type)),
         PyPH_WUFI.xml_node.XML_Node("GasConsumption", _obj.dryer_gas_consumption, "unit", "kWh"),
         PyPH_WUFI.xml_node.XML_Node("EfficiencyFactorGas", _obj.dryer_gas_consumption, "unit", "-"),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection(
+            *PyPH_WUFI.selection.get_xml_data(
                 "Appliances::FieldUtilizationFactorPreselection", _obj.dryer_field_utilization_factor_type
-            ).xml_data
+            )
         ),
         PyPH_WUFI.xml_node.XML_Node("FieldUtilizationFactor", _obj.dryer_field_utilization_factor, "unit", "-"),
     ]
@@ -845,9 +831,7 @@ def _Appliance_fridge_freezer(_obj) -> list[xml_writable]:
 
 def _Appliance_cooking(_obj) -> list[xml_writable]:
     return [
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Appliances::CookingWith", _obj.cooktop_type).xml_data
-        ),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Appliances::CookingWith", _obj.cooktop_type)),
     ]
 
 
@@ -899,16 +883,14 @@ def _Appliance_NonRes(_obj: Appliance) -> list[xml_writable]:
         PyPH_WUFI.xml_node.XML_Node("Name", _obj.name),
         PyPH_WUFI.xml_node.XML_Node("RoomCategory", _obj.usage.id),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Appliances::ApplicationType", _convert_appliance_type(_obj.type)).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Appliances::ApplicationType", _convert_appliance_type(_obj.type))
         ),
         PyPH_WUFI.xml_node.XML_Node("ChoiceCooking", 1),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Appliances::ChoiceCooking", _obj.cooktop_type)),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Appliances::ChoiceCooking", _obj.cooktop_type).xml_data
-        ),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection(
+            *PyPH_WUFI.selection.get_xml_data(
                 "Appliances::ChoiceDishwashingConection", _obj.dishwasher_water_connection
-            ).xml_data
+            )
         ),
         PyPH_WUFI.xml_node.XML_Node("Quantity", int(_obj.quantity)),
         PyPH_WUFI.xml_node.XML_Node("WithinThermalEnvelope", _obj.in_conditioned_space),
@@ -941,19 +923,17 @@ def _Appliance_Res(_obj: Appliance) -> list[xml_writable]:
 
     # Fix the energy Norm.
     # WUFI uses '1' for both 'Use' and 'Day'
-    energy_norm = PyPH_WUFI.selection.Selection(
-        "Appliances::ReferenceEnergyDemandNorm", _obj.reference_energy_norm
-    ).xml_data
+    energy_norm = PyPH_WUFI.selection.get_xml_data("Appliances::ReferenceEnergyDemandNorm", _obj.reference_energy_norm)
     if energy_norm[1] == 99:
         energy_norm = (energy_norm[0], 1, energy_norm[2], energy_norm[3])
 
     # --------------------------------------------------------------------------
     # -- Build the basic params
     basic_params = [
-        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.Selection("Appliances::Type", _obj.type).xml_data),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Appliances::Type", _obj.type)),
         PyPH_WUFI.xml_node.XML_Node("Comment", _obj.comment),
         PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Appliances::ReferenceQuantity", _obj.reference_quantity).xml_data
+            *PyPH_WUFI.selection.get_xml_data("Appliances::ReferenceQuantity", _obj.reference_quantity)
         ),
         PyPH_WUFI.xml_node.XML_Node("InConditionedSpace", _obj.in_conditioned_space),
         PyPH_WUFI.xml_node.XML_Node(*energy_norm),
@@ -995,9 +975,7 @@ def _MechanicalSystemGroup(_obj: temp_MechanicalSystemsGroup) -> list[xml_writab
 
     return [
         PyPH_WUFI.xml_node.XML_Node("Name", "System Group {}".format(_obj.group_type_number)),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Mech_System::Type", _obj.group_type_number).xml_data
-        ),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Mech_System::Type", _obj.group_type_number)),
         PyPH_WUFI.xml_node.XML_Node("IdentNr", _obj.group_type_number),
         PyPH_WUFI.xml_node.XML_List(
             "Devices",
@@ -1013,12 +991,8 @@ def _HVAC_Device(_obj: temp_MechanicalDevice) -> list[xml_writable]:
     node_items = [
         PyPH_WUFI.xml_node.XML_Node("Name", _obj.name),
         PyPH_WUFI.xml_node.XML_Node("IdentNr", _obj.id),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Mech_Device::SystemType", _obj.system_type).xml_data
-        ),
-        PyPH_WUFI.xml_node.XML_Node(
-            *PyPH_WUFI.selection.Selection("Mech_Device::TypeDevice", _obj.device_type).xml_data
-        ),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Mech_Device::SystemType", _obj.system_type)),
+        PyPH_WUFI.xml_node.XML_Node(*PyPH_WUFI.selection.get_xml_data("Mech_Device::TypeDevice", _obj.device_type)),
         PyPH_WUFI.xml_node.XML_Node("UsedFor_Heating", _obj.system_usage.used_for_heating),
         PyPH_WUFI.xml_node.XML_Node("UsedFor_DHW", _obj.system_usage.used_for_DHW),
         PyPH_WUFI.xml_node.XML_Node("UsedFor_Cooling", _obj.system_usage.used_for_cooling),
@@ -6,18 +6,140 @@ Functions for writing a Text XML file out to disk.
 """
 
 from datetime import datetime
+import gzip
 import os
+import secrets
 import shutil
+import stat
+import sys
 from pathlib import Path
+from typing import Callable, Optional, TextIO, Union
 
+# -- Size of the write buffer. The XML is written in large blocks, not line by line.
+WRITE_BUFFER_SIZE = 1024 * 1024
 
-def write_XML_text_file(_file_address: Path, _xml_text: str) -> None:
+# -- Linux ioctl to clone (reflink) a file on copy-on-write file systems (Btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+
+def _reflink(_src: str, _dst: str) -> None:
+    """Make a copy-on-write clone of the source file. Raises OSError if not supported."""
+
+    if not sys.platform.startswith("linux"):
+        raise OSError("Reflink copies are only supported on Linux.")
+
+    import fcntl
+
+    with open(_src, "rb") as src, open(_dst, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(_dst)
+            raise
+
+
+def _link_or_copy(_src: str, _dst: str) -> None:
+    """Make a copy of the file without writing the data again, where possible.
+
+    Tries, in order: a copy-on-write clone (reflink), a hardlink, then a full copy.
+    Since the output is always replaced by a rename (never written over), a hardlinked
+    copy keeps the old contents when the output file is next written.
+    """
+
+    try:
+        _reflink(_src, _dst)
+        return
+    except OSError:
+        pass
+
+    try:
+        os.link(_src, _dst)
+        return
+    except OSError:
+        pass
+
+    shutil.copyfile(_src, _dst)
+
+
+def _create_temp_file(_save_dir: str) -> tuple[int, str]:
+    """Create a new, empty, temporary file in the save directory and return its descriptor and path.
+
+    Unlike tempfile.mkstemp() (which makes private files), the file gets the same permissions
+    as any other new file: the operating system applies the process umask to the mode.
+    """
+
+    for _ in range(100):
+        temp_address = os.path.join(_save_dir, "tmp{}.tmp".format(secrets.token_hex(8)))
+        try:
+            return os.open(temp_address, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_address
+        except FileExistsError:
+            continue
+
+    raise FileExistsError("Could not create a temporary file in: {}".format(_save_dir))
+
+
+def _write_temp_file(
+    _save_dir: str, _xml_text: Union[str, Callable[[TextIO], None]], _compress: bool, _mode: Optional[int] = None
+) -> str:
+    """Write the XML out to a new temporary file in the save directory and return its path.
+
+    Arguments:
+    ----------
+        * _save_dir (str): The directory to create the temporary file in.
+        * _xml_text (str | Callable[[TextIO], None]): The XML text, or a function which
+            will write the XML to the text stream it is given.
+        * _compress (bool): True=gzip compress the file.
+        * _mode (int | None): Optional permissions to set on the file, ie: those of the file it will replace.
+
+    Returns:
+    --------
+        * (str): The path to the temporary file.
+    """
+
+    fd, temp_address = _create_temp_file(_save_dir or os.curdir)
+    try:
+        if _compress:
+            os.close(fd)
+            f = gzip.open(temp_address, "wt", encoding="utf8")
+        else:
+            f = open(fd, "w", encoding="utf8", buffering=WRITE_BUFFER_SIZE)
+
+        with f:
+            if isinstance(_xml_text, str):
+                f.write(_xml_text)
+            else:
+                _xml_text(f)
+        if _mode is not None:
+            os.chmod(temp_address, _mode)
+    except BaseException:
+        os.remove(temp_address)
+        raise
+
+    return temp_address
+
+
+def write_XML_text_file(
+    _file_address: Path,
+    _xml_text: Union[str, Callable[[TextIO], None]],
+    _compress: bool = False,
+) -> None:
     """Write the PHX 'Project' xml string out to a file.
 
+    The XML is written only once, to a temporary file which is then renamed to the
+    target file. So the target is never left partly written if the export fails. The
+    timestamped 'working copy' is made as a reflink or hardlink where possible instead
+    of writing all the data a second time.
+
     Arguments:
     ----------
         * _file_address (pathlib.Path): The file path object to save to.
-        * _xml_text (str): The XML text to write out to file.
+        * _xml_text (str | Callable[[TextIO], None]): The XML text to write out to file. Or,
+            a function which writes the XML to the text stream it is given. ie:
+            lambda f: PyPH_WUFI.WUFI_xml_build.write_project_xml(project, f)
+        * _compress (bool): Default=False. True=write a gzip compressed file. A '.gz'
+            extension is added to the file name if it does not have one already. Files which
+            already end in '.gz' are always compressed.
 
     Returns:
     --------
@@ -26,21 +148,36 @@ def write_XML_text_file(_file_address: Path, _xml_text: str) -> None:
 
     def clean_filename(_file_address):
         old_file_name, old_file_extension = os.path.splitext(_file_address)
+        if old_file_extension == ".gz":
+            old_file_name, xml_extension = os.path.splitext(old_file_name)
+            old_file_extension = xml_extension + old_file_extension
         t = datetime.now()
         return f"{old_file_name}_{t.month}_{t.day}_{t.hour}_{t.minute}_{t.second}{old_file_extension}"
 
     save_dir = os.path.dirname(_file_address)
     save_filename = os.path.basename(_file_address)
+
+    if save_filename.endswith(".gz"):
+        _compress = True
+    elif _compress:
+        save_filename = save_filename + ".gz"
+
     save_filename_clean = clean_filename(save_filename)
+    save_address_1 = os.path.join(save_dir, save_filename)
+    save_address_2 = os.path.join(save_dir, save_filename_clean)
+
+    # -- A file which is written over keeps its permissions
+    try:
+        mode = stat.S_IMODE(os.stat(save_address_1).st_mode)
+    except FileNotFoundError:
+        mode = None
 
+    temp_address = _write_temp_file(save_dir, _xml_text, _compress, mode)
     try:
-        save_address_1 = os.path.join(save_dir, save_filename)
-        save_address_2 = os.path.join(save_dir, save_filename_clean)
-        with open(save_address_1, "w", encoding="utf8") as f:
-            f.writelines(_xml_text)
+        os.replace(temp_address, save_address_1)
 
         #  Make a working copy
-        shutil.copyfile(save_address_1, save_address_2)
+        _link_or_copy(save_address_1, save_address_2)
 
     except PermissionError:
         # - In case the file is being used by WUFI or something else, make a new copy.
@@ -49,7 +186,7 @@ def write_XML_text_file(_file_address: Path, _xml_text: str) -> None:
             f"Writing to a new file: {save_address_2}"
         )
 
-        with open(save_address_2, "w", encoding="utf8") as f:
-            f.writelines(_xml_text)
+        if os.path.exists(temp_address):
+            os.replace(temp_address, save_address_2)
 
     print("Done.")
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Export-scoped cache for the WUFI 'temp' objects built while writing one XML file.
+
+Several of the schema functions build intermediate WUFI structures (temp_Zone,
+temp_RoomVentilation, ...) from the PHX objects. The same structure is often needed
+again later in the same export: every Space in a Room shares the Room's mechanicals,
+so the Room's ventilator only needs to be found once. The writers open an
+ExportContext for the length of one export, and the conversion functions which are
+marked with @memoize_in_export reuse any result already built for the same object.
+
+The PHX objects are not changed during an export, so nothing in the context ever
+needs to be invalidated. The whole context is thrown away when the export ends.
+"""
+
+import contextlib
+import contextvars
+import functools
+from typing import Any, Callable, Iterator, Optional
+
+
+class ExportContext:
+    """The conversion results built so far in one export.
+
+    Results are stored by the function name and the identity (id) of the source object. The
+    source object is kept alive along with the result, so its id can't be re-used by
+    a new object during the export.
+
+    Attributes:
+    -----------
+        * hits (int): Number of results found in the context.
+        * misses (int): Number of results built and then added to the context.
+    """
+
+    def __init__(self):
+        self._results: dict[tuple[str, int], tuple[Any, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, _name: str, _key_object: Any, _build: Callable[[], Any]) -> Any:
+        """Returns the result already built for the key-object, or builds and stores a new one.
+
+        Arguments:
+        ----------
+            * _name (str): The name of the conversion (ie: the function name).
+            * _key_object (Any): The source object. Results are found by its identity.
+            * _build (Callable[[], Any]): Called to build the result if none is found.
+
+        Returns:
+        --------
+            * (Any): The result.
+        """
+
+        key = (_name, id(_key_object))
+        try:
+            result = self._results[key][1]
+        except KeyError:
+            self.misses += 1
+            result = _build()
+            self._results[key] = (_key_object, result)
+        else:
+            self.hits += 1
+
+        return result
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def to_dict(self) -> dict:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        return len(self._results)
+
+    def __repr__(self):
+        return "{}(size={}, hits={}, misses={})".format(self.__class__.__name__, len(self), self.hits, self.misses)
+
+
+# -- The context for the export running now, if any.
+_ACTIVE_CONTEXT: contextvars.ContextVar[Optional[ExportContext]] = contextvars.ContextVar(
+    "PyPH_WUFI_export_context", default=None
+)
+
+
+def get_active_context() -> Optional[ExportContext]:
+    """Returns the ExportContext for the export running now, or None if no export is running."""
+
+    return _ACTIVE_CONTEXT.get()
+
+
+@contextlib.contextmanager
+def export_context() -> Iterator[ExportContext]:
+    """Open a new ExportContext for the length of the 'with' block, and discard it at the end.
+
+    If an export is already running (ie: a writer calling another writer), its context
+    is used instead and left open.
+
+    Usage:
+    ------
+        >>> with export_context():
+        ...     xml_text = create_project_xml_text(project)
+    """
+
+    context = _ACTIVE_CONTEXT.get()
+    if context is not None:
+        yield context
+        return
+
+    context = ExportContext()
+    token = _ACTIVE_CONTEXT.set(context)
+    try:
+        yield context
+    finally:
+        _ACTIVE_CONTEXT.reset(token)
+        context.clear()
+
+
+def memoize_in_export(_key: Callable[[Any], Any] = lambda _: _) -> Callable:
+    """Decorator: Re-use the function's result for the same object, within one export.
+
+    Outside of an export the function is just called as normal.
+
+    Arguments:
+    ----------
+        * _key (Callable[[Any], Any]): Returns the object whose identity the result
+            depends on, from the function's argument. Default is the argument itself.
+    """
+
+    def decorator(_func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        name = "{}.{}".format(_func.__module__, _func.__qualname__)
+
+        @functools.wraps(_func)
+        def wrapper(_obj):
+            context = _ACTIVE_CONTEXT.get()
+            if context is None:
+                return _func(_obj)
+
+            return context.get_or_build(name, _key(_obj), lambda: _func(_obj))
+
+        return wrapper
+
+    return decorator
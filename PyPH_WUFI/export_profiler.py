@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Opt-in profiling of the WUFI export, per schema function and conversion builder.
+
+While an ExportProfiler is enabled, every schema function in PyPH_WUFI.WUFI_xml_schemas_write
+and every 'build_...' function in PyPH_WUFI.WUFI_xml_conversion_functions is swapped out for
+a timing wrapper which records:
+
+    * calls: The number of times the function was called.
+    * cumulative: The total time spent in the function, including any profiled functions it called.
+    * self: The time spent in the function itself, not counting other profiled functions.
+    * nodes: The number of XML Data objects (Nodes, Lists and Objects) the schema function returned.
+
+When disabled, the original functions are put back, so there is no overhead at all
+outside of a profiled export. Only the exports run in this process are profiled, the
+worker processes used by write_project_xml_parallel() are not.
+
+Usage:
+------
+    >>> with profile_export() as profiler:
+    ...     write_project_xml(project, f)
+    >>> print(profiler.report())
+    >>> profiler.to_json()
+"""
+
+import functools
+import json
+import time
+from types import FunctionType, ModuleType
+from typing import Callable, Optional
+
+import PyPH_WUFI.WUFI_xml_convert_phx
+import PyPH_WUFI.WUFI_xml_conversion_functions
+import PyPH_WUFI.WUFI_xml_schemas_write
+import PyPH_WUFI.xml_node
+
+SCHEMA = "schema"
+BUILDER = "builder"
+
+
+class ProfilerActiveError(Exception):
+    def __init__(self):
+        self.message = "Error: An ExportProfiler is already enabled. Disable it before enabling another."
+        super(ProfilerActiveError, self).__init__(self.message)
+
+
+class FunctionProfile:
+    """The profile data collected for a single schema function or builder."""
+
+    __slots__ = ("name", "kind", "calls", "cumulative_time", "self_time", "nodes")
+
+    def __init__(self, _name: str, _kind: str):
+        self.name = _name
+        self.kind = _kind
+        self.calls = 0
+        self.cumulative_time = 0.0
+        self.self_time = 0.0
+        self.nodes = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "calls": self.calls,
+            "cumulative_time": self.cumulative_time,
+            "self_time": self.self_time,
+            "nodes": self.nodes,
+        }
+
+    def __repr__(self):
+        return "{}(name={!r}, kind={!r}, calls={}, cumulative_time={:.6f}, self_time={:.6f}, nodes={})".format(
+            self.__class__.__name__,
+            self.name,
+            self.kind,
+            self.calls,
+            self.cumulative_time,
+            self.self_time,
+            self.nodes,
+        )
+
+
+def _count_nodes(_xml_items) -> int:
+    """Returns the number of XML Data objects in the list, including those inside XML_Lists."""
+
+    if not isinstance(_xml_items, list):
+        return 0
+
+    count = 0
+    stack = list(_xml_items)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, PyPH_WUFI.xml_node.XML_List):
+            stack.extend(item.node_items)
+        elif not isinstance(item, (PyPH_WUFI.xml_node.XML_Node, PyPH_WUFI.xml_node.XML_Object)):
+            continue
+        count += 1
+
+    return count
+
+
+def _is_schema_function(_name: str, _obj) -> bool:
+    return (
+        isinstance(_obj, FunctionType)
+        and _obj.__module__ == PyPH_WUFI.WUFI_xml_schemas_write.__name__
+        and _name.startswith("_")
+        and not _name.startswith("__")
+    )
+
+
+def _is_builder_function(_name: str, _obj) -> bool:
+    return (
+        isinstance(_obj, FunctionType)
+        and _obj.__module__ == PyPH_WUFI.WUFI_xml_conversion_functions.__name__
+        and _name.startswith("build_")
+    )
+
+
+# -- The modules whose functions are swapped out, including any builders imported by name.
+_PROFILED_MODULES: tuple[ModuleType, ...] = (
+    PyPH_WUFI.WUFI_xml_schemas_write,
+    PyPH_WUFI.WUFI_xml_conversion_functions,
+)
+
+# -- The profiler which is enabled now, if any.
+_ACTIVE_PROFILER: Optional["ExportProfiler"] = None
+
+
+class ExportProfiler:
+    """Collects the call counts and times of the WUFI export functions while enabled.
+
+    Attributes:
+    -----------
+        * profiles (dict[str, FunctionProfile]): The profile data, by function name.
+        * enabled (bool): True while the profiling wrappers are in place.
+    """
+
+    def __init__(self):
+        self.profiles: dict[str, FunctionProfile] = {}
+        self._call_stack: list[float] = []
+        self._originals: dict[Callable, Callable] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return _ACTIVE_PROFILER is self
+
+    def _wrap(self, _func: Callable, _kind: str) -> Callable:
+        """Returns a new timing wrapper for the function."""
+
+        profile = self.profiles.setdefault(_func.__name__, FunctionProfile(_func.__name__, _kind))
+        call_stack = self._call_stack
+        perf_counter = time.perf_counter
+
+        @functools.wraps(_func)
+        def wrapper(*args, **kwargs):
+            # -- The time spent in profiled 'child' calls is added onto the top of the stack.
+            call_stack.append(0.0)
+            start = perf_counter()
+            try:
+                result = _func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                child_time = call_stack.pop()
+                if call_stack:
+                    call_stack[-1] += elapsed
+
+                profile.calls += 1
+                profile.cumulative_time += elapsed
+                profile.self_time += elapsed - child_time
+
+            if _kind == SCHEMA:
+                profile.nodes += _count_nodes(result)
+
+            return result
+
+        return wrapper
+
+    def enable(self) -> None:
+        """Swap in the profiling wrappers for all the schema functions and builders.
+
+        Raises:
+        -------
+            * ProfilerActiveError: If another ExportProfiler is already enabled.
+        """
+
+        global _ACTIVE_PROFILER
+
+        if self.enabled:
+            return
+        if _ACTIVE_PROFILER is not None:
+            raise ProfilerActiveError()
+
+        # -- Map each original function to its wrapper
+        wrappers: dict[Callable, Callable] = {}
+        for name, obj in vars(PyPH_WUFI.WUFI_xml_schemas_write).items():
+            if _is_schema_function(name, obj):
+                wrappers[obj] = self._wrap(obj, SCHEMA)
+        for name, obj in vars(PyPH_WUFI.WUFI_xml_conversion_functions).items():
+            if _is_builder_function(name, obj):
+                wrappers[obj] = self._wrap(obj, BUILDER)
+
+        self._swap_functions(wrappers)
+        self._originals = {wrapper: original for original, wrapper in wrappers.items()}
+        _ACTIVE_PROFILER = self
+
+    def disable(self) -> None:
+        """Put back all the original functions. The profile data collected is kept."""
+
+        global _ACTIVE_PROFILER
+
+        if not self.enabled:
+            return
+
+        self._swap_functions(self._originals)
+        self._originals = {}
+        self._call_stack.clear()
+        _ACTIVE_PROFILER = None
+
+    @staticmethod
+    def _swap_functions(_replacements: dict[Callable, Callable]) -> None:
+        """Replace the functions in the profiled modules, and in the schema registry."""
+
+        for module in _PROFILED_MODULES:
+            for name, obj in list(vars(module).items()):
+                if isinstance(obj, FunctionType) and obj in _replacements:
+                    setattr(module, name, _replacements[obj])
+
+        # -- The registry holds on to the functions found so far
+        registry = PyPH_WUFI.WUFI_xml_convert_phx
+        registry._SCHEMA_FUNCTIONS.clear()
+        for phx_class, func in list(registry._CLASS_SCHEMA_FUNCTIONS.items()):
+            registry._CLASS_SCHEMA_FUNCTIONS[phx_class] = _replacements.get(func, func)
+
+    def clear(self) -> None:
+        """Reset all the profile data."""
+
+        for profile in self.profiles.values():
+            profile.calls = 0
+            profile.cumulative_time = 0.0
+            profile.self_time = 0.0
+            profile.nodes = 0
+
+    def to_dict(self) -> dict:
+        """Returns the profile data for all the functions which were called, by name."""
+
+        return {name: p.to_dict() for name, p in sorted(self.profiles.items()) if p.calls}
+
+    def to_json(self, _indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=_indent)
+
+    def report(self, _limit: Optional[int] = None) -> str:
+        """Returns the profile data as a text table, slowest 'self' time first.
+
+        Arguments:
+        ----------
+            * _limit (int | None): Optional max number of rows to include.
+
+        Returns:
+        --------
+            * (str): The table text.
+        """
+
+        rows = sorted((p for p in self.profiles.values() if p.calls), key=lambda p: p.self_time, reverse=True)
+        if _limit is not None:
+            rows = rows[:_limit]
+
+        name_width = max([len("Name")] + [len(p.name) for p in rows])
+        line = "{:<{w}}  {:>8}  {:>10}  {:>12}  {:>12}  {:>10}"
+        lines = [line.format("Name", "Kind", "Calls", "Cumulative s", "Self s", "Nodes", w=name_width)]
+        lines.append("-" * len(lines[0]))
+        for p in rows:
+            lines.append(
+                "{:<{w}}  {:>8}  {:>10}  {:>12.6f}  {:>12.6f}  {:>10}".format(
+                    p.name, p.kind, p.calls, p.cumulative_time, p.self_time, p.nodes, w=name_width
+                )
+            )
+
+        return "\n".join(lines)
+
+    def __enter__(self) -> "ExportProfiler":
+        self.enable()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.disable()
+
+    def __repr__(self):
+        return "{}(enabled={}, functions={})".format(self.__class__.__name__, self.enabled, len(self.to_dict()))
+
+
+def profile_export() -> ExportProfiler:
+    """Returns a new ExportProfiler, to use in a 'with' block around one or more exports."""
+
+    return ExportProfiler()
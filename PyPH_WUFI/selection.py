@@ -3,10 +3,16 @@
 
 """For XML Objects with constrained Attributes, used to organize and validate names/values
 
-During XML write, these objects will look to the "selection_options" module to 
-see what options are 'valid' and to align attr-names and attr-values. 
+During XML write, these objects will look to the "selection_options" module to
+see what options are 'valid' and to align attr-names and attr-values.
+
+The "selection_options" are compiled only once (on first use) into a lookup table of
+ready-made (node_name, node_value, attr_name, attr_value) tuples, so the export does
+not need to rebuild any dicts or lists for each Selection.
 """
 
+from typing import Any, Optional
+
 import PyPH_WUFI.selection_options
 
 
@@ -22,47 +28,156 @@ class SelectionInputValueError(Exception):
         super().__init__(self.message)
 
 
-class Selection:
-    def __init__(self, _node_name, _node_value):
-        self.parent_name, self.node_name = _node_name.split("::")
-        self.attr_data = self.get_attribute_data(_node_name)
-        self.node_value = self.validate_input(_node_value)
+class SelectionNodeNotFoundError(Exception):
+    def __init__(self, _node_name):
+        self.message = 'Error: Cannot find data for Node: "{}"?'.format(_node_name)
+        super().__init__(self.message)
 
-        self.attr_name = self.attr_data.get("attr_name")
-        self.attr_value = self.attr_data.get("enum").get(self.node_value)
 
-    def get_attribute_data(self, _node_name):
-        """Get the right data dict from the selection_options module"""
+# ------------------------------------------------------------------------------
+class CompiledSelection:
+    """All the valid options for a single 'Parent::Node' selection, as ready-to-write XML data.
+
+    Attributes:
+    -----------
+        * node_name (str): The XML Node name. ie: "Type"
+        * attr_name (str | None): The XML Attribute name. ie: "choice"
+        * attr_data (dict): The original data dict from the selection_options module.
+        * allowable_inputs (list[int]): The valid input values.
+        * default_xml_data (tuple): The XML data used when the input value is None.
+        * xml_data (dict[int, tuple]): The XML data for each valid input value.
+    """
+
+    __slots__ = ("node_name", "attr_name", "attr_data", "allowable_inputs", "default_xml_data", "xml_data")
+
+    def __init__(self, _node_name: str, _attr_data: dict):
+        self.node_name = _node_name
+        self.attr_data = _attr_data
+        self.attr_name = _attr_data.get("attr_name")
+
+        enum = _attr_data.get("enum", {})
+        self.allowable_inputs = list(enum.keys())
+        self.xml_data = {
+            int(value): (self.node_name, int(value), self.attr_name, attr_value) for value, attr_value in enum.items()
+        }
+        if self.allowable_inputs:
+            self.default_xml_data = self.xml_data[int(self.allowable_inputs[0])]
+        else:
+            self.default_xml_data = None
 
-        d = getattr(PyPH_WUFI.selection_options, f"__{self.parent_name}", {}).get(
-            self.node_name, {}
-        )
+    def get_xml_data(self, _node_value: Any) -> tuple:
+        """Returns the validated XML data tuple for the input value.
 
-        if not d:
-            raise Exception(
-                'Error: Cannot find data for Node: "{}"?'.format(_node_name)
-            )
-        else:
-            return d
+        Arguments:
+        ----------
+            * _node_value (Any): The input value. None will return the default (first) option.
+
+        Returns:
+        --------
+            * (tuple): (node_name, node_value, attr_name, attr_value)
+        """
+
+        # -- Most inputs are already valid integers, so try those first.
+        try:
+            return self.xml_data[_node_value]
+        except (KeyError, TypeError):
+            pass
 
-    def validate_input(self, _input):
-        """Ensure that the input is allowed / valid"""
         # --- Use a Default, first in the options list of keys
-        if _input is None:
-            _input = list(self.attr_data.get("enum").keys())[0]
+        if _node_value is None:
+            if self.default_xml_data is None:
+                raise SelectionInputValueError(self.node_name, _node_value, self.allowable_inputs)
+            return self.default_xml_data
 
         # --- Validate input type
         try:
-            val = int(_input)
-        except:
-            raise SelectionInputTypeError(self.node_name, _input)
+            val = int(_node_value)
+        except (ValueError, TypeError):
+            raise SelectionInputTypeError(self.node_name, _node_value)
 
         # --- Validate input is one of the allowable options
-        allowable_inputs = list(self.attr_data.get("enum", {}).keys())
-        if val not in allowable_inputs:
-            raise SelectionInputValueError(self.node_name, _input, allowable_inputs)
-        else:
-            return val
+        try:
+            return self.xml_data[val]
+        except KeyError:
+            raise SelectionInputValueError(self.node_name, _node_value, self.allowable_inputs)
+
+
+# -- The compiled options, with keys like "Parent::Node". Built once, on first use.
+_SELECTION_TABLE: dict[str, CompiledSelection] = {}
+
+
+def _compile_selection_table() -> dict[str, CompiledSelection]:
+    """Build the lookup table from all the '__Parent' dicts in the selection_options module."""
+
+    if not _SELECTION_TABLE:
+        for module_attr_name, parent_data in vars(PyPH_WUFI.selection_options).items():
+            # -- Skip the module's own '__dunder__' attributes (__builtins__, ...)
+            if not module_attr_name.startswith("__") or module_attr_name.endswith("__"):
+                continue
+            if not isinstance(parent_data, dict):
+                continue
+
+            parent_name = module_attr_name[2:]
+            for node_name, attr_data in parent_data.items():
+                key = "{}::{}".format(parent_name, node_name)
+                _SELECTION_TABLE[key] = CompiledSelection(node_name, attr_data)
+
+    return _SELECTION_TABLE
+
+
+def get_compiled_selection(_node_name: str) -> CompiledSelection:
+    """Returns the CompiledSelection for the node name.
+
+    Arguments:
+    ----------
+        * _node_name (str): The full selection name. ie: "Component::Type"
+
+    Returns:
+    --------
+        * (CompiledSelection)
+    """
+
+    try:
+        return _SELECTION_TABLE[_node_name]
+    except KeyError:
+        try:
+            return _compile_selection_table()[_node_name]
+        except KeyError:
+            raise SelectionNodeNotFoundError(_node_name)
+
+
+def get_xml_data(_node_name: str, _node_value: Any) -> tuple:
+    """Returns the validated XML data tuple for a selection node and input value.
+
+    Arguments:
+    ----------
+        * _node_name (str): The full selection name. ie: "Component::Type"
+        * _node_value (Any): The input value. None will return the default (first) option.
+
+    Returns:
+    --------
+        * (tuple): (node_name, node_value, attr_name, attr_value)
+    """
+
+    return get_compiled_selection(_node_name).get_xml_data(_node_value)
+
+
+# ------------------------------------------------------------------------------
+class Selection:
+    def __init__(self, _node_name: str, _node_value: Optional[Any]):
+        self.parent_name, self.node_name = _node_name.split("::")
+        self.attr_data = self.get_attribute_data(_node_name)
+        self.node_name, self.node_value, self.attr_name, self.attr_value = get_xml_data(_node_name, _node_value)
+
+    def get_attribute_data(self, _node_name: str) -> dict:
+        """Get the right data dict from the selection_options module"""
+
+        return get_compiled_selection(_node_name).attr_data
+
+    def validate_input(self, _input: Any) -> int:
+        """Ensure that the input is allowed / valid"""
+
+        return get_xml_data("{}::{}".format(self.parent_name, self.node_name), _input)[1]
 
     @property
     def xml_data(self):
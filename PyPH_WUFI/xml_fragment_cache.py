@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Cache of written XML text 'fragments', for fast re-export.
+
+When the same Project is exported over and over again with only small changes, most
+of the Assemblies, WindowTypes, Components and Zones are exactly the same as in the
+last export. The streaming writer can use an XMLFragmentCache to skip the schema
+functions for these objects and write out the text from the last export instead.
+
+Objects are found in the cache by their identity and their version number (see
+PHX.metrics_cache.watch()), plus the schema name and the node's tag and indentation.
+The first time an object is looked up, all the objects it holds are found once and
+registered with it. After that, the version goes up whenever the object, or any PHX
+object (or VertexRange) it holds, has an attribute set to a new value, has items added
+to or removed from one of its PHX lists, or is changed through one of its add_ methods.
+So finding an object in the cache takes the same (short) time no matter how large it is.
+
+Changes made in place to a plain list or dict (ie: obj.user_data["key"] = value) are
+not seen. Set the attribute to the new list or dict instead, or call
+PHX.metrics_cache.changed(obj) after the change.
+"""
+
+from collections import OrderedDict
+from typing import Any, Iterator, Optional
+
+import PHX._base
+import PHX.assemblies
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry_store
+import PHX.metrics_cache
+import PHX.window_types
+import PyPH_WUFI.xml_node
+
+# -- The types of objects to cache by default.
+DEFAULT_CACHED_TYPES = (
+    PHX.assemblies.Assembly,
+    PHX.window_types.WindowType,
+    PHX.component.Component,
+    PHX.bldg_segment.Zone,
+)
+
+# -- Value types which hold no other objects
+_ATOMIC_TYPES = {bool, int, float, complex, str, bytes, type(None)}
+
+
+# -- The names of the __slots__ of each type (and its base types): {type: tuple[str, ...]}
+_SLOT_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def _attribute_values(_obj: Any) -> list[Any]:
+    """Returns the object's attribute values, from its __dict__ and/or __slots__."""
+
+    values = list(getattr(_obj, "__dict__", {}).values())
+    cls = type(_obj)
+    try:
+        slot_names = _SLOT_NAMES[cls]
+    except KeyError:
+        slot_names = []
+        for base in cls.__mro__:
+            slots = base.__dict__.get("__slots__", ())
+            slot_names.extend((slots,) if isinstance(slots, str) else slots)
+        slot_names = _SLOT_NAMES[cls] = tuple(_ for _ in slot_names if _ not in ("__dict__", "__weakref__"))
+
+    for name in slot_names:
+        values.append(getattr(_obj, name, None))
+    return values
+
+
+def held_objects(_obj: Any) -> Iterator[Any]:
+    """Yields each of the objects held by the object (in its attributes, lists and dicts) at any depth.
+
+    Does not use any recursion, so it is safe to use on deep object trees, and objects
+    which are held more than once (or which refer back to their 'parent') are only
+    yielded the first time they are found. A VertexRange is yielded, but not the
+    (shared) VertexStore it points to.
+
+    Arguments:
+    ----------
+        * _obj (Any): The object to search.
+
+    Yields:
+    -------
+        * (Any): The objects held, not including plain values, lists or dicts.
+    """
+
+    seen = {id(_obj)}
+    stack = [_obj]
+    while stack:
+        item = stack.pop()
+        if type(item) in _ATOMIC_TYPES:
+            continue
+
+        if isinstance(item, (list, tuple, set, frozenset)):
+            children = item
+        elif isinstance(item, dict):
+            children = list(item.keys()) + list(item.values())
+        else:
+            if item is not _obj:
+                yield item
+            if isinstance(item, PHX.geometry_store.VertexRange):
+                continue
+            children = _attribute_values(item)
+
+        for child in children:
+            if type(child) not in _ATOMIC_TYPES and id(child) not in seen:
+                seen.add(id(child))
+                stack.append(child)
+
+
+class XMLFragmentCache:
+    """A size-bounded, least-recently-used cache of written XML text fragments.
+
+    Attributes:
+    -----------
+        * max_size (int): The max number of fragments to keep. Once full, the
+            least-recently-used fragment is removed when a new one is added.
+        * cached_types (tuple[type, ...]): The object types to cache.
+        * hits (int): Number of fragments found in the cache.
+        * misses (int): Number of fragments not found in the cache.
+        * evictions (int): Number of fragments removed to make room for new ones.
+    """
+
+    def __init__(self, _max_size: int = 10_000, _cached_types: tuple = DEFAULT_CACHED_TYPES):
+        if _max_size < 1:
+            raise ValueError("Error: XMLFragmentCache max_size must be 1 or more. Got: {}".format(_max_size))
+        for cached_type in _cached_types:
+            if not issubclass(cached_type, PHX._base._Base):
+                raise TypeError(
+                    "Error: XMLFragmentCache can only cache PHX Objects, since changes to other "
+                    "objects are not recorded. Got: {}".format(cached_type)
+                )
+
+        self.max_size = _max_size
+        self.cached_types = _cached_types
+        self._fragments: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def is_cacheable(self, _item: PyPH_WUFI.xml_node.xml_writable) -> bool:
+        """Returns True if the XML Data object's text should be stored in the cache."""
+
+        return isinstance(_item, PyPH_WUFI.xml_node.XML_Object) and isinstance(_item.node_object, self.cached_types)
+
+    def key(self, _item: PyPH_WUFI.xml_node.XML_Object, _indent: str) -> str:
+        """Returns the cache key for the XML_Object, written at the indentation level.
+
+        Arguments:
+        ----------
+            * _item (PyPH_WUFI.xml_node.XML_Object): The XML_Object to get the key for.
+            * _indent (str): The indentation used when the object is written.
+
+        Returns:
+        --------
+            * (str): The cache key.
+        """
+
+        obj = _item.node_object
+        version = PHX.metrics_cache.version(obj)
+        if version is None:
+            version = PHX.metrics_cache.watch(obj, held_objects(obj))
+
+        schema_name = _item.schema_name or "_{}".format(obj.__class__.__name__)
+        return "{}|{}|{}|{}|{}|{!r}|{}".format(
+            id(obj),
+            version,
+            schema_name,
+            _item.node_name,
+            _item.attr_name,
+            _item.attr_value,
+            len(_indent),
+        )
+
+    def get(self, _key: str) -> Optional[str]:
+        """Returns the fragment text for the key, or None if it is not in the cache."""
+
+        try:
+            fragment = self._fragments[_key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._fragments.move_to_end(_key)
+        self.hits += 1
+        return fragment
+
+    def put(self, _key: str, _fragment: str) -> None:
+        """Add the fragment text to the cache, removing the least-recently-used fragment if full."""
+
+        self._fragments[_key] = _fragment
+        self._fragments.move_to_end(_key)
+
+        while len(self._fragments) > self.max_size:
+            self._fragments.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all the fragments and reset the statistics."""
+
+        self._fragments.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def to_dict(self) -> dict:
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def __contains__(self, _key):
+        return _key in self._fragments
+
+    def __repr__(self):
+        return "{}(size={}, max_size={}, hits={}, misses={}, evictions={})".format(
+            self.__class__.__name__, len(self), self.max_size, self.hits, self.misses, self.evictions
+        )
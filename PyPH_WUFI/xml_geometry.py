@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Columnar (flat-array) view of a PHX Geom, used to write the WUFI 'Graphics_3D' node in bulk.
+
+The generic writer turns every Vertex and Polygon into its own XML_Object, runs the
+schema function for it and creates an XML_Node for every value. Geometry is the
+largest part of any WUFI file, so instead the streaming writer reads the vertex
+coordinates and polygon index-lists into flat lists, once, and writes out the
+'Vertices' and 'Polygons' blocks directly from those. The text is exactly the same
+as from the _Geom, _Vertex and _Polygon schemas.
+"""
+
+from typing import Any
+
+import PHX.bldg_segment
+import PyPH_WUFI.xml_node
+from PyPH_WUFI.xml_traversal import TraversalStats
+
+# -- Decimal places, as used by the _Vertex and _Polygon schemas
+VERTEX_PRECISION = 8
+NORMAL_PRECISION = 10
+
+
+def is_columnar_geometry(_item: Any) -> bool:
+    """Returns True if the XML Data object is a Geom which will be written with the _Geom schema."""
+
+    return (
+        type(_item) is PyPH_WUFI.xml_node.XML_Object
+        and type(_item.node_object) is PHX.bldg_segment.Geom
+        and _item.schema_name in (None, "_Geom")
+    )
+
+
+class GeometryColumns:
+    """The Vertex and Polygon data from a Geom, as flat lists.
+
+    Polygon 'k' uses the vertex ids polygon_vertex_ids[polygon_vertex_offsets[k]:polygon_vertex_offsets[k+1]]
+    and the child polygon ids polygon_children[polygon_child_offsets[k]:polygon_child_offsets[k+1]].
+
+    Attributes:
+    -----------
+        * vertex_ids (list): The IdentNr of each Vertex, in 'Vertices' order.
+        * vertex_x (list[float | int]): The rounded X coordinate of each Vertex. An int if it was set as one.
+        * vertex_y (list[float | int]): The rounded Y coordinate of each Vertex. An int if it was set as one.
+        * vertex_z (list[float | int]): The rounded Z coordinate of each Vertex. An int if it was set as one.
+        * polygon_ids (list): The IdentNr of each Polygon, in 'Polygons' order.
+        * normal_x (list[float]): The rounded X component of each Polygon's normal.
+        * normal_y (list[float]): The rounded Y component of each Polygon's normal.
+        * normal_z (list[float]): The rounded Z component of each Polygon's normal.
+        * polygon_vertex_ids (list): The vertex ids of all the Polygons, end to end.
+        * polygon_vertex_offsets (list[int]): The start of each Polygon in polygon_vertex_ids, plus the end.
+        * polygon_children (list): The child polygon ids of all the Polygons, end to end.
+        * polygon_child_offsets (list[int]): The start of each Polygon in polygon_children, plus the end.
+    """
+
+    __slots__ = (
+        "vertex_ids",
+        "vertex_x",
+        "vertex_y",
+        "vertex_z",
+        "polygon_ids",
+        "normal_x",
+        "normal_y",
+        "normal_z",
+        "polygon_vertex_ids",
+        "polygon_vertex_offsets",
+        "polygon_children",
+        "polygon_child_offsets",
+    )
+
+    def __init__(self):
+        self.vertex_ids = []
+        self.vertex_x = []
+        self.vertex_y = []
+        self.vertex_z = []
+        self.polygon_ids = []
+        self.normal_x = []
+        self.normal_y = []
+        self.normal_z = []
+        self.polygon_vertex_ids = []
+        self.polygon_vertex_offsets = [0]
+        self.polygon_children = []
+        self.polygon_child_offsets = [0]
+
+    @classmethod
+    def from_geom(cls, _geom: PHX.bldg_segment.Geom) -> "GeometryColumns":
+        """Returns a new GeometryColumns with the data from the Geom.
+
+        Arguments:
+        ----------
+            * _geom (PHX.bldg_segment.Geom): The Geometry to read.
+
+        Returns:
+        --------
+            * (GeometryColumns): The Geom's data, as flat lists.
+        """
+
+        obj = cls()
+        found_ids = set()
+
+        # -- The Geom's Vertices are each Polygon's Vertices, in order, once per id-number (welded Vertices
+        # -- are shared). Read straight from the flat coordinates.
+        for poly in _geom.polygons:
+            coords = poly.vertex_values
+            vert_ids = poly.idVert
+            if found_ids.isdisjoint(vert_ids) and len(set(vert_ids)) == len(vert_ids):
+                obj.vertex_ids.extend(vert_ids)
+                obj.vertex_x.extend(round(_, VERTEX_PRECISION) for _ in coords[0::3])
+                obj.vertex_y.extend(round(_, VERTEX_PRECISION) for _ in coords[1::3])
+                obj.vertex_z.extend(round(_, VERTEX_PRECISION) for _ in coords[2::3])
+                found_ids.update(vert_ids)
+            else:
+                for k, id_num in enumerate(vert_ids):
+                    if id_num in found_ids:
+                        continue
+                    found_ids.add(id_num)
+                    obj.vertex_ids.append(id_num)
+                    obj.vertex_x.append(round(coords[k * 3], VERTEX_PRECISION))
+                    obj.vertex_y.append(round(coords[k * 3 + 1], VERTEX_PRECISION))
+                    obj.vertex_z.append(round(coords[k * 3 + 2], VERTEX_PRECISION))
+
+            nVec = poly.nVec
+            obj.polygon_ids.append(poly.id)
+            obj.normal_x.append(round(nVec.x, NORMAL_PRECISION))
+            obj.normal_y.append(round(nVec.y, NORMAL_PRECISION))
+            obj.normal_z.append(round(nVec.z, NORMAL_PRECISION))
+
+            obj.polygon_vertex_ids.extend(vert_ids)
+            obj.polygon_vertex_offsets.append(len(obj.polygon_vertex_ids))
+            obj.polygon_children.extend(poly.children)
+            obj.polygon_child_offsets.append(len(obj.polygon_children))
+
+        return obj
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.vertex_ids)
+
+    @property
+    def num_polygons(self) -> int:
+        return len(self.polygon_ids)
+
+    def add_traversal_stats(self, _stats: TraversalStats, _depth: int) -> None:
+        """Add the counts the generic walk would have made for the Geom, less the Geom's own opening visit.
+
+        Arguments:
+        ----------
+            * _stats (TraversalStats): The counters to update.
+            * _depth (int): The depth of the 'Graphics_3D' node.
+        """
+
+        num_verts = self.num_vertices
+        num_polys = self.num_polygons
+
+        # -- 'Graphics_3D' closing visit, 'Vertices' and 'Polygons' lists (1 visit if empty, else 2)
+        visits = 1 + (2 if num_verts else 1) + (2 if num_polys else 1)
+        nodes = 3
+        text_nodes = 0
+
+        # -- Each Vertix: the object (2 visits) and its 4 values
+        visits += num_verts * 6
+        nodes += num_verts * 5
+        text_nodes += num_verts * 4
+
+        # -- Each Polygon: the object (2 visits), its 4 values, and its 2 index lists
+        visits += num_polys * 6
+        nodes += num_polys * 7
+        text_nodes += num_polys * 4
+        max_depth = _depth + 1
+        for start, end in (
+            (self.polygon_vertex_offsets[:-1], self.polygon_vertex_offsets[1:]),
+            (self.polygon_child_offsets[:-1], self.polygon_child_offsets[1:]),
+        ):
+            for s, e in zip(start, end):
+                count = e - s
+                visits += 1 + count + (1 if count else 0)
+                nodes += count
+                text_nodes += count
+                if count:
+                    max_depth = _depth + 4
+
+        if num_verts or num_polys:
+            max_depth = max(max_depth, _depth + 3)
+
+        _stats.visits += visits
+        _stats.nodes += nodes
+        _stats.text_nodes += text_nodes
+        _stats.schema_calls += 1 + num_verts + num_polys
+        _stats.max_depth = max(_stats.max_depth, max_depth)
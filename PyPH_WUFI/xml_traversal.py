@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Non-recursive traversal engine used by all the XML writers.
+
+Walks the XML_Node / XML_List / XML_Object trees returned by the schema functions
+using an explicit work-stack (no Python recursion) and yields a flat stream of
+'events' in document order. Each writer (DOM, streaming, ...) only needs to
+consume these events.
+
+    XML_START ('<name attr="...">'), XML_END ('</name>'),
+    XML_EMPTY ('<name attr="..."/>'), XML_TEXT ('<name attr="...">value</name>'),
+    XML_FRAGMENT (an XML_Object which the writer will handle as a whole, ie: from a cache)
+"""
+
+from typing import Any, Callable, Iterator, Optional
+
+import PyPH_WUFI.xml_node
+import PyPH_WUFI.WUFI_xml_convert_phx
+from PyPH_WUFI.xml_node import xml_writable
+
+# -- Event Types
+XML_START = 0
+XML_END = 1
+XML_EMPTY = 2
+XML_TEXT = 3
+XML_FRAGMENT = 4
+
+
+class TraversalStats:
+    """Counters collected while walking an XML tree. Used to measure the cost of an export.
+
+    Attributes:
+    -----------
+        * visits (int): Number of entries processed off the work-stack (opening and closing).
+        * nodes (int): Number of XML nodes (elements) produced.
+        * text_nodes (int): Number of basic 'text' nodes produced.
+        * schema_calls (int): Number of XML_Objects which were converted using a schema function.
+        * max_depth (int): The deepest element level reached.
+    """
+
+    def __init__(self):
+        self.visits = 0
+        self.nodes = 0
+        self.text_nodes = 0
+        self.schema_calls = 0
+        self.max_depth = 0
+
+    def add(self, _other: "TraversalStats", _depth_offset: int = 0) -> None:
+        """Add in the counts from another walk. ie: from a sub-tree walked by a worker process.
+
+        Arguments:
+        ----------
+            * _other (TraversalStats): The stats to add into this one.
+            * _depth_offset (int): The depth of the other walk's root item in this walk.
+        """
+
+        self.visits += _other.visits
+        self.nodes += _other.nodes
+        self.text_nodes += _other.text_nodes
+        self.schema_calls += _other.schema_calls
+        self.max_depth = max(self.max_depth, _other.max_depth + _depth_offset)
+
+    def to_dict(self) -> dict:
+        return {
+            "visits": self.visits,
+            "nodes": self.nodes,
+            "text_nodes": self.text_nodes,
+            "schema_calls": self.schema_calls,
+            "max_depth": self.max_depth,
+        }
+
+    def __repr__(self):
+        return "{}(visits={}, nodes={}, text_nodes={}, schema_calls={}, max_depth={})".format(
+            self.__class__.__name__, self.visits, self.nodes, self.text_nodes, self.schema_calls, self.max_depth
+        )
+
+
+# ------------------------------------------------------------------------------
+# -- Type Dispatch
+def _text_node_children(_item: PyPH_WUFI.xml_node.XML_Node, _stats: TraversalStats) -> None:
+    """Basic Nodes have no children."""
+    return None
+
+
+def _object_node_children(_item: PyPH_WUFI.xml_node.XML_Object, _stats: TraversalStats) -> list[xml_writable]:
+    """Objects get their children from the object's XML Schema function."""
+    _stats.schema_calls += 1
+    return PyPH_WUFI.WUFI_xml_convert_phx.get_PHX_object_as_xml_node_list(_item.node_object, _item.schema_name)
+
+
+def _list_node_children(_item: PyPH_WUFI.xml_node.XML_List, _stats: TraversalStats) -> list[xml_writable]:
+    """Lists are their own children."""
+    return _item.node_items
+
+
+# -- Maps the XML Data type to the function used to get its child items.
+CHILD_ITEM_DISPATCH: dict[type, Callable[[Any, TraversalStats], Optional[list]]] = {
+    PyPH_WUFI.xml_node.XML_Node: _text_node_children,
+    PyPH_WUFI.xml_node.XML_Object: _object_node_children,
+    PyPH_WUFI.xml_node.XML_List: _list_node_children,
+}
+
+
+def _get_dispatch_function(_item_type: type) -> Optional[Callable]:
+    """Returns the child-item function for the type, adding sub-classes to the table on first use.
+
+    Types which are not XML Data objects (str, None, ...) return None and are skipped,
+    just like the original recursive builder.
+    """
+
+    try:
+        return CHILD_ITEM_DISPATCH[_item_type]
+    except KeyError:
+        for base_type, func in list(CHILD_ITEM_DISPATCH.items()):
+            if func and issubclass(_item_type, base_type):
+                CHILD_ITEM_DISPATCH[_item_type] = func
+                return func
+
+        CHILD_ITEM_DISPATCH[_item_type] = None
+        return None
+
+
+# ------------------------------------------------------------------------------
+def walk(
+    _item: xml_writable,
+    _stats: Optional[TraversalStats] = None,
+    _is_fragment: Optional[Callable[[xml_writable], bool]] = None,
+) -> Iterator[tuple[int, xml_writable, int]]:
+    """Walk the XML Data tree, depth-first, and yield the XML events in document order.
+
+    Schema functions are called only as each XML_Object is reached, in document order,
+    the same as with the original recursive builder.
+
+    If an _is_fragment function is given, any item below the root for which it returns
+    True is yielded as a single XML_FRAGMENT event and its children are not walked.
+
+    Arguments:
+    ----------
+        * _item (PyPH_WUFI.xml_node.XML_Node | PyPH_WUFI.xml_node.XML_Object |
+            PyPH_WUFI.xml_node.XML_List): The root XML Data object to walk through.
+        * _stats (TraversalStats | None): Optional counters to update during the walk.
+        * _is_fragment (Callable | None): Optional test for items to yield as XML_FRAGMENT events.
+
+    Yields:
+    -------
+        * (tuple[int, xml_writable, int]): The event type, the XML Data object and its depth.
+            The root item is depth 0.
+    """
+
+    stats = _stats or TraversalStats()
+
+    # -- Stack items are (XML Data object, depth, is-a-closing-tag)
+    stack = [(_item, 0, False)]
+    while stack:
+        item, depth, is_closing_tag = stack.pop()
+        stats.visits += 1
+
+        if is_closing_tag:
+            yield XML_END, item, depth
+            continue
+
+        get_children = _get_dispatch_function(type(item))
+        if get_children is None:
+            continue
+
+        if _is_fragment and depth and _is_fragment(item):
+            yield XML_FRAGMENT, item, depth
+            continue
+
+        stats.nodes += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+
+        child_items = get_children(item, stats)
+        if child_items is None:
+            stats.text_nodes += 1
+            yield XML_TEXT, item, depth
+            continue
+
+        # -- Only XML Data objects become child nodes
+        child_items = [_ for _ in child_items if _get_dispatch_function(type(_))]
+        if not child_items:
+            yield XML_EMPTY, item, depth
+            continue
+
+        yield XML_START, item, depth
+        stack.append((item, depth, True))
+        child_depth = depth + 1
+        stack.extend((child_item, child_depth, False) for child_item in reversed(child_items))
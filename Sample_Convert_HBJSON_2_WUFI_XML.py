@@ -146,6 +146,8 @@ for seg in project_1.building_segments:
     seg.merge_zones()
     seg = filter_out_Surface_Exposure(seg)
     seg.merge_components(by="assembly")
+    # -- Write shared corners (walls, floors, windows) out as a single Vertex
+    seg.weld_vertices(hb_model.tolerance)
 
 # # ----------------------------------------------------------------------------
 project_1.add_assemblies_from_collection(assmbly_collection)
@@ -154,5 +156,6 @@ project_1.add_window_types_from_collection(window_type_collection)
 # # --- Output the new Project to an XML file for WUFI
 # # ----------------------------------------------------------------------------
 print("> Writing out the XML file...")
-project_xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(project_1)
-PyPH_WUFI.WUFI_xml_write.write_XML_text_file(TARGET_FILE_XML, project_xml_text)
+PyPH_WUFI.WUFI_xml_write.write_XML_text_file(
+    TARGET_FILE_XML, lambda f: PyPH_WUFI.WUFI_xml_build.write_project_xml(project_1, f)
+)
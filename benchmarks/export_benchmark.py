@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Time each stage of the WUFI XML export for a synthetic PHX Project.
+
+Stages:
+-------
+    * build_temp_Project: Building the Project-level Utilization Pattern collections.
+    * build_temp_Zone: Building the temp_Zone for every Zone.
+    * schema_evaluation: Walking the full XML tree, calling every schema function.
+    * document_build: Adding all the (already evaluated) nodes to a minidom Document.
+    * serialization: Converting the Document to XML text (toprettyxml).
+    * file_write: Writing the XML text out to disk.
+    * stream_export: The full streaming export (write_project_xml) to disk, for comparison.
+
+Usage:
+------
+    python -m benchmarks.export_benchmark --segments 5 --zones 20 --components 500 --output results.json
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Optional
+from xml.dom.minidom import Document
+
+# -- Configure logging before PyPH_WUFI.WUFI_xml_build tries to log to its sample folder.
+logging.basicConfig()
+
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_conversion_functions
+import PyPH_WUFI.WUFI_xml_write
+import PyPH_WUFI.xml_node
+import PyPH_WUFI.xml_traversal
+from PyPH_WUFI.export_profiler import profile_export
+from benchmarks.synthetic_project import ProjectSize, build_project
+
+STAGES = (
+    "build_temp_Project",
+    "build_temp_Zone",
+    "schema_evaluation",
+    "document_build",
+    "serialization",
+    "file_write",
+    "stream_export",
+)
+
+
+def _time(_func: Callable, _repeat: int) -> tuple[list[float], object]:
+    """Run the function _repeat times, return the elapsed times (seconds) and the last result."""
+
+    times = []
+    result = None
+    for _ in range(_repeat):
+        start = time.perf_counter()
+        result = _func()
+        times.append(time.perf_counter() - start)
+
+    return times, result
+
+
+def _summary(_times: list[float]) -> dict:
+    return {
+        "min": min(_times),
+        "mean": sum(_times) / len(_times),
+        "max": max(_times),
+        "runs": len(_times),
+    }
+
+
+def run_benchmark(_size: ProjectSize, _repeat: int = 3, _output_dir: Optional[str] = None) -> dict:
+    """Build a synthetic Project and time each stage of the WUFI XML export.
+
+    Arguments:
+    ----------
+        * _size (ProjectSize): The size of the synthetic Project to export.
+        * _repeat (int): The number of times to run each stage.
+        * _output_dir (str | None): The directory to write the XML files to. If None,
+            a temporary directory is used and removed afterwards.
+
+    Returns:
+    --------
+        * (dict): The benchmark results, with the 'min', 'mean' and 'max' seconds for each stage.
+    """
+
+    project = build_project(_size)
+    zones = project.zones
+    root = PyPH_WUFI.xml_node.XML_Object("WUFIplusProject", project)
+    results = {}
+
+    # -- Build the temp-objects on their own
+    times, _ = _time(lambda: PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Project(project), _repeat)
+    results["build_temp_Project"] = _summary(times)
+
+    times, _ = _time(lambda: [PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Zone(z) for z in zones], _repeat)
+    results["build_temp_Zone"] = _summary(times)
+
+    # -- Evaluate all the schemas, keep the events so the Document can be built without them
+    stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    times, events = _time(lambda: list(PyPH_WUFI.xml_traversal.walk(root, stats)), _repeat)
+    results["schema_evaluation"] = _summary(times)
+
+    def build_document():
+        doc = Document()
+        PyPH_WUFI.WUFI_xml_build._add_events(doc, doc, events)
+        return doc
+
+    times, doc = _time(build_document, _repeat)
+    results["document_build"] = _summary(times)
+
+    times, xml_text = _time(doc.toprettyxml, _repeat)
+    results["serialization"] = _summary(times)
+
+    # -- Write out to disk
+    with tempfile.TemporaryDirectory() as temp_dir:
+        save_dir = _output_dir or temp_dir
+
+        times, _ = _time(
+            lambda: PyPH_WUFI.WUFI_xml_write.write_XML_text_file(os.path.join(save_dir, "benchmark.xml"), xml_text),
+            _repeat,
+        )
+        results["file_write"] = _summary(times)
+
+        times, _ = _time(
+            lambda: PyPH_WUFI.WUFI_xml_write.write_XML_text_file(
+                os.path.join(save_dir, "benchmark_stream.xml"),
+                lambda f: PyPH_WUFI.WUFI_xml_build.write_project_xml(project, f),
+            ),
+            _repeat,
+        )
+        results["stream_export"] = _summary(times)
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "size": _size.to_dict(),
+        "xml_characters": len(xml_text),
+        "traversal": {k: v // _repeat for k, v in stats.to_dict().items()},
+        "stages": results,
+    }
+
+
+def main(_args: Optional[list[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Time each stage of the WUFI XML export.")
+    parser.add_argument("--segments", type=int, default=ProjectSize.segments)
+    parser.add_argument("--zones", type=int, default=ProjectSize.zones, help="Zones per segment.")
+    parser.add_argument("--rooms", type=int, default=ProjectSize.rooms, help="Rooms per zone.")
+    parser.add_argument("--spaces", type=int, default=ProjectSize.spaces, help="Spaces per room.")
+    parser.add_argument("--components", type=int, default=ProjectSize.components, help="Components per segment.")
+    parser.add_argument("--polygons", type=int, default=ProjectSize.polygons, help="Polygons per component.")
+    parser.add_argument("--vertices", type=int, default=ProjectSize.vertices, help="Vertices per polygon.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each stage.")
+    parser.add_argument("--output", default=None, help="JSON file to write the results to. Default: print only.")
+    parser.add_argument("--xml-dir", default=None, help="Directory to write the XML files to. Default: temp dir.")
+    parser.add_argument("--profile", action="store_true", help="Also print the time taken by each schema function.")
+    args = parser.parse_args(_args)
+
+    size = ProjectSize(
+        segments=args.segments,
+        zones=args.zones,
+        rooms=args.rooms,
+        spaces=args.spaces,
+        components=args.components,
+        polygons=args.polygons,
+        vertices=args.vertices,
+    )
+    results = run_benchmark(size, args.repeat, args.xml_dir)
+
+    for stage in STAGES:
+        print("{:<20} {:>10.4f} s".format(stage, results["stages"][stage]["min"]))
+
+    if args.profile:
+        # -- Profile a separate export, so the wrappers don't affect the stage times
+        project = build_project(size)
+        with profile_export() as profiler:
+            PyPH_WUFI.WUFI_xml_build.write_project_xml(project, io.StringIO())
+        results["profile"] = profiler.to_dict()
+        print(profiler.report(_limit=25))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(results, f, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# -*- Python Version: 3.9 -*-
+
+"""Build synthetic PHX Projects, of any size, for testing and benchmarking the WUFI export."""
+
+import math
+from dataclasses import dataclass, asdict
+
+import PHX.project
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.spaces
+import PHX.assemblies
+import PHX.window_types
+import PHX.appliances
+import PHX.mechanicals.systems
+import PHX.mechanicals.equipment
+
+
+@dataclass
+class ProjectSize:
+    """The number of each type of object to create in the synthetic Project.
+
+    Attributes:
+    -----------
+        * segments (int): Number of BldgSegments in the Project.
+        * zones (int): Number of Zones in each BldgSegment.
+        * rooms (int): Number of Rooms in each Zone.
+        * spaces (int): Number of Spaces in each Room.
+        * components (int): Number of Components in each BldgSegment.
+        * polygons (int): Number of Polygons in each Component.
+        * vertices (int): Number of Vertices in each Polygon.
+    """
+
+    segments: int = 1
+    zones: int = 1
+    rooms: int = 1
+    spaces: int = 1
+    components: int = 10
+    polygons: int = 1
+    vertices: int = 4
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def build_space(_name: str, _number: int, _floor_area: float) -> PHX.spaces.Space:
+    """Returns a new Space with a single Volume, and a floor area."""
+
+    flr_seg = PHX.spaces.FloorSegment()
+    flr_seg.floor_area_gross = _floor_area
+    flr_seg.space_name = _name
+    flr_seg.space_number = _number
+
+    flr = PHX.spaces.Floor()
+    flr.add_new_floor_segment(flr_seg)
+
+    vol = PHX.spaces.Volume()
+    vol.set_Floor(flr)
+    vol.average_ceiling_height = 2.5
+
+    space = PHX.spaces.Space()
+    space.add_new_volume(vol)
+
+    return space
+
+
+def build_room(_name: str, _num_spaces: int) -> PHX.bldg_segment.Room:
+    """Returns a new Room with Spaces and a Ventilation System."""
+
+    room = PHX.bldg_segment.Room()
+    room.add_spaces([build_space("{}-{}".format(_name, i), i, 10.0 + i) for i in range(_num_spaces)])
+
+    mech_system = PHX.mechanicals.systems.MechanicalSystem()
+    mech_system.equipment_set.add_new_device_to_equipment_set(PHX.mechanicals.equipment.HVAC_Ventilator())
+    room.mechanicals.add_system(mech_system)
+
+    return room
+
+
+def build_polygon(_num_vertices: int, _offset: float) -> PHX.geometry.Polygon:
+    """Returns a new Polygon, with its vertices evenly spaced around a circle in the XY plane."""
+
+    poly = PHX.geometry.Polygon()
+    poly.vertices = [
+        PHX.geometry.Vertex(
+            _offset + math.cos(2 * math.pi * i / _num_vertices),
+            math.sin(2 * math.pi * i / _num_vertices),
+            _offset * 0.1,
+        )
+        for i in range(_num_vertices)
+    ]
+    poly.nVec = PHX.geometry.Vector(0, 0, 1)
+
+    return poly
+
+
+def build_component(
+    _assembly: PHX.assemblies.Assembly, _num_polygons: int, _num_vertices: int, _offset: float
+) -> PHX.component.Component:
+    """Returns a new opaque Component with Polygons."""
+
+    compo = PHX.component.Component()
+    compo.name = "Component {}".format(_offset)
+    compo.assembly_id_num = _assembly.id
+    for i in range(_num_polygons):
+        compo.add_polygons(build_polygon(_num_vertices, _offset + i))
+
+    return compo
+
+
+def build_project(_size: ProjectSize) -> PHX.project.Project:
+    """Returns a new, complete, PHX Project of the specified size, ready for WUFI export.
+
+    Arguments:
+    ----------
+        * _size (ProjectSize): The number of each type of object to create.
+
+    Returns:
+    --------
+        * (PHX.project.Project): The new Project.
+    """
+
+    project = PHX.project.Project()
+
+    assembly = PHX.assemblies.Assembly()
+    assembly.add_layer(PHX.assemblies.Layer())
+    project.lAssembly.append(assembly)
+    project.lWindow.append(PHX.window_types.WindowType())
+
+    for seg_num in range(_size.segments):
+        seg = PHX.bldg_segment.BldgSegment()
+        seg.name = "Segment {}".format(seg_num)
+
+        for zone_num in range(_size.zones):
+            zone = PHX.bldg_segment.Zone()
+            zone.name = "Zone {}".format(zone_num)
+            zone.add_rooms([build_room("Room {}-{}".format(zone_num, i), _size.spaces) for i in range(_size.rooms)])
+            zone.appliance_set.add_appliances_to_set(PHX.appliances.Appliance.PHIUS_Dishwasher())
+            seg.add_zones(zone)
+
+        seg.add_components(
+            [build_component(assembly, _size.polygons, _size.vertices, i) for i in range(_size.components)]
+        )
+        project.add_segment(seg)
+
+    return project
@@ -1,4 +1,5 @@
 import PHX.appliances
+import pytest
 
 
 def test_basic_add():
@@ -17,3 +18,43 @@ def test_basic_add():
     s4 = None
     s5 = s3 + s4
     assert len(s5) == 1
+
+
+def _set_with(*_appliances):
+    app_set = PHX.appliances.ApplianceSet()
+    app_set.add_appliances_to_set(list(_appliances))
+    return app_set
+
+
+def test_merge_many_matches_pairwise_add():
+    sets = []
+    for i in range(5):
+        dw = PHX.appliances.Appliance.PHIUS_Dishwasher()
+        dw.energy_demand = 100 + i
+        dw.comment = "unit-{}".format(i % 2)
+        fridge = PHX.appliances.Appliance.PHIUS_Fridge()
+        fridge.quantity = i + 1
+        sets.append(_set_with(dw, fridge))
+    sets.insert(2, None)
+
+    merged = PHX.appliances.ApplianceSet.merge_many(sets)
+    pairwise = sets[0] + sets[1] + sets[2] + sets[3] + sets[4] + sets[5]
+
+    assert len(merged) == len(pairwise) == 3
+    for a, b in zip(merged, pairwise):
+        assert (a.type, a.comment, a.quantity) == (b.type, b.comment, b.quantity)
+        assert a.energy_demand == pytest.approx(b.energy_demand)
+
+    assert [_.quantity for _ in merged.appliance_dict["dishwasher"]] == [3, 2]
+    assert merged.appliance_dict["fridge"][0].quantity == 15
+
+
+def test_merge_many_by_name():
+    kitchen_1 = PHX.appliances.Appliance.PHIUS_NonResKitchen_Dishwasher(name="A")
+    kitchen_2 = PHX.appliances.Appliance.PHIUS_NonResKitchen_Dishwasher(name="B")
+    kitchen_3 = PHX.appliances.Appliance.PHIUS_NonResKitchen_Dishwasher(name="A")
+
+    merged = PHX.appliances.ApplianceSet.merge_many([_set_with(kitchen_1), _set_with(kitchen_2, kitchen_3)])
+
+    assert sorted((_.name, _.quantity) for _ in merged) == [("A", 2), ("B", 1)]
+    assert len(PHX.appliances.ApplianceSet.merge_many([])) == 0
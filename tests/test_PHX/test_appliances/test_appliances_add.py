@@ -310,3 +310,44 @@ def test_add_PHIUS_MEL():
 
     app_3 = app_1 + app_2
     assert app_3.quantity == 2
+
+
+def test_merge_matches_pairwise_add():
+    apps = [PHX.appliances.Appliance.PHIUS_Dishwasher() for _ in range(4)]
+    for i, app in enumerate(apps):
+        app.quantity = i + 1
+        app.energy_demand = 100 * (i + 1)
+        app.dishwasher_capacity = 10 + i
+
+    merged = PHX.appliances.Appliance.merge(apps)
+    pairwise = sum(apps)
+
+    assert merged.quantity == pairwise.quantity == 10
+    assert merged.energy_demand == pytest.approx(pairwise.energy_demand)
+    assert merged.energy_demand == pytest.approx(3_000 / 10)
+    assert merged.dishwasher_capacity == pytest.approx(pairwise.dishwasher_capacity)
+
+    # -- Single Appliances are not copied
+    assert PHX.appliances.Appliance.merge([apps[0]]) is apps[0]
+    assert PHX.appliances.Appliance.merge([]) is None
+
+
+def test_merge_user_defined_totals():
+    apps = [PHX.appliances.Appliance.Custom_Electric_per_Year(energy_demand=_) for _ in (100, 200, 300)]
+
+    merged = PHX.appliances.Appliance.merge(apps)
+    assert merged.quantity == 1
+    assert merged.reference_quantity == 5
+    assert merged.energy_demand == 600
+
+
+def test_merge_errors():
+    app_1 = PHX.appliances.Appliance.PHIUS_Dishwasher()
+    app_2 = PHX.appliances.Appliance.PHIUS_Dishwasher()
+    app_2.dishwasher_capacity_type = 2
+
+    with pytest.raises(PHX.appliances.ApplianceTypeMismatchError):
+        PHX.appliances.Appliance.merge([app_1, PHX.appliances.Appliance.PHIUS_Dishwasher(), app_2])
+
+    with pytest.raises(PHX.appliances.ApplianceAdditionError):
+        PHX.appliances.Appliance.merge([app_1, PHX.appliances.Appliance.PHIUS_Fridge()])
@@ -1,4 +1,7 @@
+import pytest
 import PHX._base
+import PHX.geometry
+import PHX.programs.schedules
 
 
 def test_base():
@@ -16,3 +19,43 @@ def test_base_to_dict():
     d = b.to_dict()
     assert str(b.identifier) in d.values()
     assert b.user_data in d.values()
+
+
+def test_value_base_lazy_identifier():
+    v = PHX.geometry.Vector(1, 2, 3)
+    assert not hasattr(v, "__dict__")
+    assert not hasattr(v, "_identifier")
+    assert not hasattr(v, "_user_data")
+
+    identifier = v.identifier
+    assert v.identifier == identifier
+    assert str(v.identifier_short) in str(v)
+
+    v.user_data["key"] = "value"
+    assert v.user_data == {"key": "value"}
+
+    with pytest.raises(AttributeError):
+        v.not_an_attribute = 1
+
+
+def test_value_base_dict_round_trip():
+    v = PHX.geometry.Vector(1, 2, 3)
+    d = v.to_dict()
+    assert d == {"identifier": str(v.identifier), "x": 1, "y": 2, "z": 3}
+
+    v2 = PHX.geometry.Vector.from_dict(d)
+    assert v2.to_dict() == d
+
+    rate = PHX.programs.schedules.Vent_UtilRate(12, 0.5)
+    rate2 = PHX.programs.schedules.Vent_UtilRate.from_dict(rate.to_dict())
+    assert (rate2.daily_op_sched, rate2.frac_of_design_airflow) == (12, 0.5)
+
+
+def test_base_classes_share_methods():
+    for name in ("identifier_short", "to_dict", "__str__", "ToString", "__repr__"):
+        assert name not in vars(PHX._base._Base) and name not in vars(PHX._base._ValueBase)
+
+    b, v = PHX._base._Base(), PHX.geometry.Vector()
+    assert repr(b) == "_Base(identifier={!r}, user_data={{}})".format(b.identifier_short)
+    assert repr(v) == "Vector(identifier={!r}, user_data={{}})".format(v.identifier_short)
+    assert b.ToString() == str(b) == "PHX__Base: ID-{}".format(b.identifier_short)
@@ -0,0 +1,122 @@
+import threading
+import pytest
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.id_allocator
+from PHX.id_allocator import IDAllocator, id_scope
+
+
+def _square():
+    poly = PHX.geometry.Polygon()
+    poly.vertices = [PHX.geometry.Vertex(0, 0, 0), PHX.geometry.Vertex(1, 0, 0), PHX.geometry.Vertex(1, 1, 0)]
+    return poly
+
+
+def test_scope_numbering_is_separate():
+    PHX.bldg_segment.Zone()
+    count = PHX.bldg_segment.Zone._count
+
+    with id_scope() as allocator:
+        zones = [PHX.bldg_segment.Zone() for _ in range(3)]
+        poly = _square()
+
+    assert [_.id for _ in zones] == [1, 2, 3]
+    assert poly.id == 10000000
+    assert [_.id for _ in poly.vertices] == [1, 2, 3]
+    assert allocator.count(PHX.bldg_segment.Zone) == 3
+
+    # -- The class's own count is not touched
+    assert PHX.bldg_segment.Zone._count == count
+    assert PHX.bldg_segment.Zone().id == count + 1
+
+
+def test_same_ids_every_time():
+    def build():
+        with id_scope():
+            seg = PHX.bldg_segment.BldgSegment()
+            compo = PHX.component.Component()
+            compo.add_polygons(_square())
+            seg.add_components(compo)
+            return seg.id, compo.id, compo.idSKP, compo.polygons[0].id, compo.polygons[0].idVert
+
+    assert build() == build() == (1, 1, 1, 10000000, [1, 2, 3])
+
+
+def test_scopes_in_threads():
+    results = {}
+
+    def build(_name):
+        with id_scope():
+            results[_name] = [PHX.component.Component().id for _ in range(500)]
+
+    threads = [threading.Thread(target=build, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(ids == list(range(1, 501)) for ids in results.values())
+
+
+def test_unscoped_count_is_thread_safe():
+    PHX.id_allocator.reset_counts(PHX.component.Component)
+    ids = []
+
+    def build():
+        ids.extend(PHX.component.Component().id for _ in range(500))
+
+    threads = [threading.Thread(target=build) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(ids) == list(range(1, 2001))
+    assert PHX.component.Component._count == 2000
+
+
+def test_reset_reserve_and_state():
+    allocator = IDAllocator()
+    Zone = PHX.bldg_segment.Zone
+
+    assert list(allocator.reserve(Zone, 3)) == [1, 2, 3]
+    assert allocator.next_id(Zone) == 4
+    assert allocator.state() == {"PHX.bldg_segment.Zone": 4}
+
+    # -- Another process can carry on from the state
+    other = IDAllocator(allocator.state())
+    assert other.next_id(Zone) == 5
+
+    allocator.set_count(Zone, 10)
+    assert allocator.next_id(Zone) == 11
+    with pytest.raises(PHX.id_allocator.IDAllocatorError):
+        allocator.set_count(PHX.geometry.Polygon, 0)
+
+    allocator.reset(Zone)
+    assert allocator.next_id(Zone) == 1
+    assert allocator.next_id(PHX.geometry.Polygon) == 10000000
+    allocator.reset()
+    assert allocator.state() == {}
+
+
+def test_remap():
+    zones = [PHX.bldg_segment.Zone() for _ in range(3)]
+    old_ids = [_.id for _ in zones]
+
+    id_map = IDAllocator().remap(reversed(zones))
+
+    assert [_.id for _ in zones] == [3, 2, 1]
+    assert id_map == dict(zip(old_ids, [3, 2, 1]))
+
+
+def test_current_state():
+    zone = PHX.bldg_segment.Zone()
+    assert PHX.id_allocator.current_state()["PHX.bldg_segment.Zone"] == zone.id
+
+    with id_scope(IDAllocator({"PHX.bldg_segment.Zone": 7})):
+        assert PHX.id_allocator.current_state() == {"PHX.bldg_segment.Zone": 7}
+
+        # -- Another process can carry on from the current numbering
+        with id_scope(IDAllocator(PHX.id_allocator.current_state())):
+            assert PHX.bldg_segment.Zone().id == 8
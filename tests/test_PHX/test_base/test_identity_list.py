@@ -0,0 +1,118 @@
+import pickle
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+from PHX.geometry import Vertex
+from PHX.identity_list import IdentityList
+
+
+class Item(object):
+    pass
+
+
+def _square(_size=1.0):
+    poly = PHX.geometry.Polygon()
+    poly.vertices = [Vertex(0, 0, 0), Vertex(_size, 0, 0), Vertex(_size, _size, 0), Vertex(0, _size, 0)]
+    return poly
+
+
+def _component(*_polygons):
+    compo = PHX.component.Component()
+    compo.add_polygons(list(_polygons))
+    return compo
+
+
+def test_identity_list_index_in_sync():
+    a, b, c, d = Item(), Item(), Item(), Item()
+    items = IdentityList([a, b])
+    items.append(c)
+    items.insert(0, c)
+    assert items == [c, a, b, c]
+    assert all(_ in items for _ in (a, b, c)) and d not in items
+
+    items.remove(c)
+    assert c in items
+    assert items.pop() is c
+    assert c not in items
+
+    items[0] = d
+    assert a not in items and d in items
+    items[1:] = [a, c]
+    assert items == [d, a, c] and b not in items
+
+    del items[0]
+    del items[:1]
+    assert items == [c] and d not in items and a not in items
+
+    items += [a, b]
+    items.extend(_ for _ in [d])
+    assert items == [c, a, b, d]
+    assert all(_ in items for _ in (a, b, c, d))
+
+    items.clear()
+    assert items == [] and a not in items
+
+
+def test_identity_list_pickle():
+    items = IdentityList([1, 2, 3])
+    new_items = pickle.loads(pickle.dumps(items))
+    assert isinstance(new_items, IdentityList)
+    assert new_items == [1, 2, 3]
+    assert new_items[0] in new_items
+
+
+def test_segment_membership_after_changes():
+    seg = PHX.bldg_segment.BldgSegment()
+    compos = [PHX.component.Component() for _ in range(3)]
+    seg.add_components(compos)
+    seg.add_components(compos[0])
+    assert seg.components == compos
+
+    # -- A filtered list (ie: filter_out_Surface_Exposure) is indexed as well
+    seg.components = [_ for _ in seg.components if _ is not compos[1]]
+    assert isinstance(seg.components, IdentityList)
+    assert compos[1] not in seg.components
+
+    seg.components.append(compos[1])
+    seg.add_components(compos[1])
+    assert seg.components == [compos[0], compos[2], compos[1]]
+
+
+def test_identity_list_on_change():
+    a, b, c = Item(), Item(), Item()
+    changes = []
+    items = IdentityList([a], lambda added, removed: changes.append((list(added), list(removed))))
+    assert changes == [([a], [])]
+    del changes[:]
+
+    items.append(b)
+    items.extend([])
+    items[0] = c
+    items.remove(b)
+    items *= 2
+    del items[:]
+    assert changes == [([b], []), ([], [a]), ([c], []), ([], [b]), ([c], []), ([], [c, c])]
+
+
+def test_component_polygons_changes_recorded():
+    compo = PHX.component.Component()
+    compo.polygons = [_square()]
+    assert compo.exposed_area == 1
+
+    # -- Re-assigning and changing the list in place are both seen by the cached area
+    compo.polygons = [_square(), _square(2)]
+    assert compo.exposed_area == 5
+    compo.polygons.append(_square(3))
+    assert compo.exposed_area == 14
+    compo.polygons.remove(compo.polygons[0])
+    assert compo.exposed_area == 13
+
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components(compo)
+    assert seg.total_envelope_area == 13
+    compo.polygons.pop()
+    assert seg.total_envelope_area == 4
+    seg.components.append(_component(_square(1)))
+    assert seg.total_envelope_area == 5
+    del seg.components[0]
+    assert seg.total_envelope_area == 1
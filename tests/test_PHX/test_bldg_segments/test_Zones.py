@@ -1,3 +1,4 @@
+import pytest
 import PHX.bldg_segment
 import PHX.spaces
 
@@ -160,3 +161,34 @@ def test_Zone_sum_with_empty_params(reset_bldg_segment_count):
     z5 = sum([z1, z2, z3], start=PHX.bldg_segment.Zone())
     assert z5
     assert z5 != z1 and z5 != z2 and z5 != z3
+
+
+def test_Zone_merge_matches_pairwise_add(reset_bldg_segment_count):
+    zones = []
+    for i, (vol, area, height) in enumerate([(100, 300, 2.5), (400, 600, 4), (50, 100, 3)]):
+        zone = PHX.bldg_segment.Zone()
+        zone.volume_gross = vol
+        zone.volume_net = vol * 0.8
+        zone.floor_area = area
+        zone.clearance_height = height
+        zone.summer_ventilation.avg_mech_ach = i + 1
+        zone.occupancy.num_occupants = i + 2
+        zones.append(zone)
+    num_occupants = zones[0].occupancy.num_occupants
+
+    pairwise = zones[0] + zones[1] + zones[2]
+    count = PHX.bldg_segment.Zone._count
+    merged = PHX.bldg_segment.Zone.merge(zones)
+
+    # -- Only one new Zone is made
+    assert PHX.bldg_segment.Zone._count == count + 1
+
+    assert merged.volume_gross == pairwise.volume_gross == 550
+    assert merged.floor_area == pairwise.floor_area == 1000
+    assert merged.clearance_height == pytest.approx(pairwise.clearance_height)
+    assert merged.summer_ventilation.avg_mech_ach == pytest.approx(pairwise.summer_ventilation.avg_mech_ach)
+    assert merged.occupancy.num_occupants == pairwise.occupancy.num_occupants
+
+    # -- The source Zones are left alone
+    assert zones[0].occupancy.num_occupants == num_occupants
+    assert merged.source_zone_identifiers == [_.identifier for _ in zones]
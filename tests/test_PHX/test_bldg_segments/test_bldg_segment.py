@@ -270,6 +270,38 @@ def test_get_zone_by_id():
     assert not z3
 
 
+def test_get_zone_by_identifier_sources():
+    z1 = PHX.bldg_segment.Zone()
+    z1.identifier = "Room_1_abc"
+    z1.source_zone_identifiers.append("Room_1_abc")
+    z2 = PHX.bldg_segment.Zone()
+    z2.identifier = "Room_2_def"
+    z2.source_zone_identifiers.append("Room_2_def")
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_zones([z1, z2])
+
+    # -- Part of a source identifier only matches if not exact
+    assert seg.get_zone_by_identifier("Room_2_def") is z2
+    assert seg.get_zone_by_identifier("Room_2") is z2
+    assert seg.get_zone_by_identifier("Room_2", _exact=True) is None
+    assert seg.get_zone_by_identifier(None) is None
+
+    # -- The merged Zone is found by the identifiers of the Zones merged into it
+    seg.merge_zones()
+    merged = seg.zones[0]
+    assert seg.get_zone_by_identifier("Room_1_abc", _exact=True) is merged
+    assert seg.get_zone_by_identifier("Room_2_def") is merged
+    assert seg.get_zone_by_identifier(merged.identifier) is merged
+
+    # -- Zones added after the lookup are found as well
+    z3 = PHX.bldg_segment.Zone()
+    seg.add_zones(z3)
+    assert seg.get_zone_by_identifier(str(z3.identifier), _exact=True) is z3
+    z4 = PHX.bldg_segment.Zone()
+    seg.zones.append(z4)
+    assert seg.get_zone_by_identifier(z4.identifier) is z4
+
+
 def test_merge_components_normal():
     # -- Build Zones with Components
     c1 = PHX.component.Component()
@@ -391,3 +423,55 @@ def test_merge_zones_with_zones():
     # -- Check the zone ID
     got_zone_1 = seg_1.get_zone_by_identifier(z1.identifier)
     assert got_zone_1
+
+
+def test_get_zone_by_identifier_first_match():
+    # -- An exact match wins over an earlier Zone's source identifier containing the lookup
+    z1 = PHX.bldg_segment.Zone()
+    z1.source_zone_identifiers.append("Room_1_abc")
+    z2 = PHX.bldg_segment.Zone()
+    z2.identifier = "Room_1"
+    z3 = PHX.bldg_segment.Zone()
+    z3.source_zone_identifiers.append("Room_1")
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_zones([z1, z2, z3])
+
+    assert seg.get_zone_by_identifier("Room_1") is z2
+    assert seg.get_zone_by_identifier("Room_1", _exact=True) is z2
+
+    # -- A partial identifier finds the first Zone, in Zone order, with a source identifier containing it
+    assert seg.get_zone_by_identifier("Room_") is z1
+    seg.zones = [z3, z2, z1]
+    assert seg.get_zone_by_identifier("Room_") is z3
+    assert seg.get_zone_by_identifier("Room_1_abc") is z1
+
+
+def test_get_zone_by_identifier_after_zones_changed():
+    z1 = PHX.bldg_segment.Zone()
+    z1.identifier = "Room_1"
+    z2 = PHX.bldg_segment.Zone()
+    z2.identifier = "Room_2"
+    z3 = PHX.bldg_segment.Zone()
+    z3.identifier = "Room_1"
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_zones([z1, z2])
+    assert seg.get_zone_by_identifier("Room_1") is z1
+
+    # -- Replacing a Zone keeps the same number of Zones
+    seg.zones[0] = z3
+    assert seg.get_zone_by_identifier("Room_1") is z3
+    assert seg.get_zone_by_identifier("Room_2") is z2
+
+    # -- Re-ordering the Zones changes which is first
+    seg.zones[1] = z1
+    seg.zones.reverse()
+    assert seg.get_zone_by_identifier("Room_1") is z1
+    seg.zones.sort(key=lambda _: _ is z1)
+    assert seg.get_zone_by_identifier("Room_1") is z3
+
+    # -- Removed Zones are not found
+    seg.zones.remove(z3)
+    seg.zones.append(z2)
+    assert seg.get_zone_by_identifier("Room_1") is z1
+    del seg.zones[:]
+    assert seg.get_zone_by_identifier("Room_1") is None
@@ -0,0 +1,71 @@
+import pytest
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.geometry_kernel
+from PHX.geometry import Polygon, Vertex
+
+
+def _polygon(_points):
+    poly = Polygon()
+    poly.vertices = [Vertex(*_) for _ in _points]
+    return poly
+
+
+def _segment(_polygons):
+    seg = PHX.bldg_segment.BldgSegment()
+    compo = PHX.component.Component()
+    compo.add_polygons(_polygons)
+    seg.add_components(compo)
+    return seg
+
+
+def test_weld_shared_edge():
+    p1 = _polygon([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)])
+    p2 = _polygon([(1, 0, 0), (2, 0, 0), (2, 1, 0), (1.0000001, 1, 0)])
+    seg = _segment([p1, p2])
+    assert len(list(seg.geom.vertices)) == 8
+
+    assert seg.weld_vertices() == 2
+    assert p2.idVert[0] == p1.idVert[1]
+    assert p2.idVert[3] == p1.idVert[2]
+    assert p2.vertices[3].x == 1
+    assert [v.id for v in seg.geom.vertices] == p1.idVert + p2.idVert[1:3]
+
+    # -- Nothing left to weld
+    assert seg.weld_vertices() == 0
+    assert p1.area == 1 and p2.area == 1
+
+
+def test_weld_outside_tolerance():
+    p1 = _polygon([(0, 0, 0), (1, 0, 0), (1, 1, 0)])
+    p2 = _polygon([(0, 0, 0.01), (1, 0, 0), (1, 1, 0.01)])
+    seg = _segment([p1, p2])
+
+    assert seg.weld_vertices(0.001) == 1
+    assert len(list(seg.geom.vertices)) == 5
+
+
+def test_weld_not_within_one_polygon():
+    """Welding two Vertices of the same Polygon would repeat a point in it."""
+    p1 = _polygon([(0, 0, 0), (0.0001, 0, 0), (1, 1, 0)])
+    p2 = _polygon([(0, 0, 0), (1, 1, 0), (0, 1, 0)])
+    seg = _segment([p1, p2])
+
+    assert seg.weld_vertices(0.001) == 2
+    assert len(set(p1.idVert)) == 3
+    assert p2.idVert[:2] == [p1.idVert[0], p1.idVert[2]]
+
+
+def test_weld_across_grid_cells():
+    coords = [0.0009999, 0, 0, 0.0010001, 0, 0]
+    ranges = [(0, 1), (1, 2)]
+
+    assert PHX.geometry_kernel.weld_vertices(PHX.geometry.array("d", coords), ranges, 0.001) == [0, 0]
+
+
+def test_weld_bad_tolerance():
+    with pytest.raises(PHX.geometry_kernel.WeldToleranceError):
+        PHX.bldg_segment.Geom().weld_vertices(0)
+    with pytest.raises(PHX.geometry_kernel.WeldToleranceError):
+        _segment([_polygon([(0, 0, 0), (1, 0, 0), (1, 1, 0)])]).weld_vertices(-1)
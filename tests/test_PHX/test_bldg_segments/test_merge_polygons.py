@@ -0,0 +1,125 @@
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry_kernel
+from PHX.geometry import Polygon, Vertex
+
+
+def _rectangle(_x0, _y0, _x1, _y1, _z=0.0):
+    poly = Polygon()
+    poly.vertices = [Vertex(_x0, _y0, _z), Vertex(_x1, _y0, _z), Vertex(_x1, _y1, _z), Vertex(_x0, _y1, _z)]
+    return poly
+
+
+def _grid(_nx, _ny, _skip=()):
+    return [_rectangle(i, j, i + 1, j + 1) for i in range(_nx) for j in range(_ny) if (i, j) not in _skip]
+
+
+def _component(_polygons, _assembly=1):
+    compo = PHX.component.Component()
+    compo.assembly_id_num = _assembly
+    compo.add_polygons(_polygons)
+    return compo
+
+
+def test_merge_grid_into_rectangle():
+    compo = _component(_grid(8, 5))
+    first = compo.polygons[0]
+
+    merged_ids = compo.merge_coplanar_polygons()
+
+    assert len(merged_ids) == 39
+    assert compo.polygons == [first]
+    assert list(first.vertex_coordinates) == [0, 0, 0, 8, 0, 0, 8, 5, 0, 0, 5, 0]
+    assert first.area == 40
+    assert set(merged_ids.values()) == {first.id}
+
+
+def test_merge_L_shape():
+    compo = _component(_grid(2, 2, _skip={(1, 1)}))
+    compo.merge_coplanar_polygons()
+
+    assert len(compo.polygons) == 1
+    assert len(compo.polygons[0].vertices) == 6
+    assert compo.polygons[0].area == 3
+
+
+def test_no_merge():
+    # -- Different planes, opposite facing, only touching at a corner, and around a hole
+    flipped = _rectangle(1, 0, 2, 1)
+    flipped.vertices.reverse()
+    compos = [
+        _component([_rectangle(0, 0, 1, 1), _rectangle(1, 0, 2, 1, _z=0.5)]),
+        _component([_rectangle(0, 0, 1, 1), flipped]),
+        _component([_rectangle(0, 0, 1, 1), _rectangle(1, 1, 2, 2)]),
+        _component(_grid(3, 3, _skip={(1, 1)})),
+    ]
+
+    for compo in compos:
+        num_polygons = len(compo.polygons)
+        assert compo.merge_coplanar_polygons() == {}
+        assert len(compo.polygons) == num_polygons
+
+
+def test_kernel_leaves_out_collinear_vertices():
+    polys = [_rectangle(0, 0, 1, 1), _rectangle(1, 0, 2, 1), _rectangle(2, 0, 3, 1)]
+    compo = _component(polys)
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components(compo)
+    ranges = [(p._vertex_range.start, p._vertex_range.stop) for p in polys]
+
+    merged = PHX.geometry_kernel.merge_coplanar_polygons(seg.geom.vertex_store.coords, ranges, 0.001)
+
+    assert len(merged) == 1
+    group, outline = merged[0]
+    assert group == [0, 1, 2]
+    assert len(outline) == 4
+
+
+def test_segment_merge_relinks_children():
+    wall = _component(_grid(4, 2))
+    door = _component([_rectangle(1.2, 0, 1.8, 0.5), _rectangle(1.8, 0, 2.4, 0.5)], _assembly=2)
+    window = PHX.component.Component()
+    window.type = 2
+    window.win_type_id_num = 1
+    window.add_polygons(_rectangle(2.2, 1.2, 2.8, 1.8))
+
+    wall.polygons[2].add_children(door.polygons)
+    wall.polygons[5].add_children(window.polygons)
+
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components([wall, door, window])
+    assert seg.total_envelope_area == 8.6
+
+    assert seg.merge_coplanar_polygons() == 8
+    assert len(wall.polygons) == 1
+    assert len(door.polygons) == 1
+    assert wall.polygons[0].children == [door.polygons[0].id, window.polygons[0].id]
+    assert len(seg.geom.polygons) == 3
+    assert round(seg.total_envelope_area, 6) == 8.6
+
+
+def test_merge_components_with_merge_polygons():
+    compos = [_component(_grid(2, 1)), _component([_rectangle(2, 0, 3, 1)])]
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components(compos)
+
+    seg.merge_components(by="assembly", merge_polygons=True)
+
+    assert len(seg.components) == 1
+    assert len(seg.components[0].polygons) == 1
+    assert seg.geom.polygons == seg.components[0].polygons
+    assert seg.total_envelope_area == 3
+
+
+def test_segment_merge_keeps_polygons_outside_components():
+    wall = _component(_grid(2, 1))
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components(wall)
+    loose = _rectangle(0, 0, 1, 1)
+    loose.add_children(wall.polygons[1])
+    seg.geom.polygons.append(loose)
+
+    assert seg.merge_coplanar_polygons() == 1
+    assert list(seg.geom.polygons) == [wall.polygons[0], loose]
+    assert loose.children == [wall.polygons[0].id]
+    assert loose.area == 1
@@ -0,0 +1,269 @@
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.mechanicals.systems
+import PHX.metrics_cache
+from PHX.geometry import Polygon, Vertex
+
+
+def _square(_size=1.0, _z=0.0):
+    poly = Polygon()
+    poly.vertices = [Vertex(0, 0, _z), Vertex(0, _size, _z), Vertex(_size, _size, _z), Vertex(_size, 0, _z)]
+    return poly
+
+
+def _component(_size=1.0):
+    compo = PHX.component.Component()
+    compo.add_polygons(_square(_size))
+    return compo
+
+
+def _stats(_name):
+    return PHX.metrics_cache.get_stats(_name).to_dict()
+
+
+def test_component_area_cached_until_changed():
+    compo = _component(2)
+    PHX.metrics_cache.reset_cache_stats()
+
+    assert compo.exposed_area == 4
+    assert compo.exposed_area == 4
+    assert _stats("Component.exposed_area") == {"hits": 1, "misses": 1}
+
+    # -- Adding a Polygon
+    compo.add_polygons(_square(1))
+    assert compo.exposed_area == 5
+
+    # -- Moving a Vertex
+    compo.polygons[1].vertices[2].y = 2
+    assert compo.exposed_area == 5.5
+
+    # -- Changing the exposure
+    compo.ext_exposure_zone_id = 3
+    assert compo.exposed_area == 0
+    assert _stats("Component.exposed_area") == {"hits": 1, "misses": 4}
+
+
+def test_segment_totals_cached():
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components([_component(1), _component(2)])
+    PHX.metrics_cache.reset_cache_stats()
+
+    for _ in range(3):
+        assert seg.total_envelope_area == 5
+        assert seg.infiltration.q50 == 0
+    assert _stats("BldgSegment.total_envelope_area") == {"hits": 5, "misses": 1}
+    assert _stats("Component.exposed_area") == {"hits": 0, "misses": 2}
+
+    seg.add_components(_component(3))
+    assert seg.total_envelope_area == 14
+
+    seg.geom.scale(2)
+    assert seg.total_envelope_area == 56
+
+
+def test_segment_totals_after_merge_components():
+    seg = PHX.bldg_segment.BldgSegment()
+    compos = [_component(1), _component(2)]
+    for compo in compos:
+        compo.assembly_id_num = 1
+    seg.add_components(compos)
+    assert seg.total_envelope_area == 5
+
+    seg.merge_components()
+    assert len(seg.components) == 1
+    assert seg.total_envelope_area == 5
+
+    seg.components[0].type = 2  # Window
+    assert seg.total_envelope_area == 0
+
+
+def test_segment_volumes_cached():
+    seg = PHX.bldg_segment.BldgSegment()
+    z1 = PHX.bldg_segment.Zone()
+    z1.volume_net = 100
+    z1.volume_gross = 120
+    seg.add_zones(z1)
+    PHX.metrics_cache.reset_cache_stats()
+
+    assert seg.total_volume_net == 100
+    assert seg.total_volume_net == 100
+    assert seg.total_volume_gross == 120
+    assert _stats("BldgSegment.total_volume_net") == {"hits": 1, "misses": 1}
+
+    z2 = PHX.bldg_segment.Zone()
+    z2.volume_net = 50
+    seg.add_zones(z2)
+    assert seg.total_volume_net == 150
+
+    z1.volume_net = 10
+    assert seg.total_volume_net == 60
+
+    seg.merge_zones()
+    assert seg.total_volume_net == 60
+    assert seg.total_volume_gross == 120
+
+
+def test_component_area_after_polygons_replaced():
+    compo = PHX.component.Component()
+    compo.polygons = [_square(1)]
+    assert compo.exposed_area == 1
+
+    compo.polygons = [_square(1), _square(1)]
+    assert compo.exposed_area == 2
+
+    compo.polygons.append(_square(2))
+    assert compo.exposed_area == 6
+
+    compo.polygons.extend([_square(1)])
+    compo.polygons[0] = _square(3)
+    assert compo.exposed_area == 15
+
+
+def test_segment_totals_after_lists_changed():
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components(_component(1))
+    assert seg.total_envelope_area == 1
+
+    seg.components.append(_component(2))
+    assert seg.total_envelope_area == 5
+
+    seg.components = [_component(3)]
+    assert seg.total_envelope_area == 9
+
+    seg.components[0].polygons.append(_square(1))
+    assert seg.total_envelope_area == 10
+
+    zone = PHX.bldg_segment.Zone()
+    zone.volume_net = 100
+    assert seg.total_volume_net == 0
+    seg.zones.append(zone)
+    assert seg.total_volume_net == 100
+    seg.zones.remove(zone)
+    assert seg.total_volume_net == 0
+
+
+def test_polygon_metrics_counted():
+    poly = _square(3)
+    PHX.metrics_cache.reset_cache_stats()
+
+    assert poly.area == 9
+    assert poly.area == 9
+    assert _stats("Polygon.metrics") == {"hits": 1, "misses": 1}
+
+
+def test_cache_stats_and_invalidate():
+    compo = _component(1)
+    assert compo.exposed_area == 1
+
+    stats = PHX.metrics_cache.cache_stats()
+    assert "Component.exposed_area" in stats
+    assert PHX.metrics_cache.get_stats("Component.exposed_area").hit_rate <= 1.0
+
+    PHX.metrics_cache.reset_cache_stats()
+    PHX.metrics_cache.invalidate(compo)
+    assert compo.exposed_area == 1
+    assert _stats("Component.exposed_area") == {"hits": 0, "misses": 1}
+
+
+def test_mechanicals_cached_until_changed():
+    systems = [PHX.mechanicals.systems.MechanicalSystem() for _ in range(3)]
+    zones = []
+    for system in systems[:2]:
+        room_1, room_2 = PHX.bldg_segment.Room(), PHX.bldg_segment.Room()
+        room_1.mechanicals.add_system(system)
+        room_2.mechanicals.add_system(system)
+        zone = PHX.bldg_segment.Zone()
+        zone.add_rooms([room_1, room_2])
+        zones.append(zone)
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_zones(zones)
+    PHX.metrics_cache.reset_cache_stats()
+
+    assert list(seg.mechanicals.systems) == systems[:2]
+    assert seg.mechanicals is not seg.mechanicals
+    assert _stats("BldgSegment.mechanicals") == {"hits": 2, "misses": 1}
+
+    # -- Adding a System to a Room, or a new Room to a Zone
+    zones[0].rooms[0].mechanicals.add_system(systems[2])
+    assert list(seg.mechanicals.systems) == [systems[0], systems[2], systems[1]]
+    assert list(zones[1].mechanicals.systems) == systems[1:2]
+
+    new_room = PHX.bldg_segment.Room()
+    new_room.mechanicals = PHX.mechanicals.systems.Mechanicals()
+    new_room.mechanicals.add_system(PHX.mechanicals.systems.MechanicalSystem())
+    zones[1].add_rooms(new_room)
+    assert len(list(zones[1].mechanicals.systems)) == 2
+    assert len(list(seg.mechanicals.systems)) == 4
+
+    # -- Merged Zones
+    seg.merge_zones()
+    assert len(list(seg.zones[0].mechanicals.systems)) == 4
+    assert len(list(seg.mechanicals.systems)) == 4
+
+    assert list(PHX.bldg_segment.Zone().mechanicals.systems) == []
+
+
+def test_mechanicals_copy_does_not_change_cache():
+    room = PHX.bldg_segment.Room()
+    room.mechanicals.add_system(PHX.mechanicals.systems.MechanicalSystem())
+    zone = PHX.bldg_segment.Zone()
+    zone.add_rooms(room)
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_zones(zone)
+
+    zone.mechanicals.add_system(PHX.mechanicals.systems.MechanicalSystem())
+    seg.mechanicals.add_system(PHX.mechanicals.systems.MechanicalSystem())
+
+    assert len(list(room.mechanicals.systems)) == 1
+    assert len(list(zone.mechanicals.systems)) == 1
+    assert len(list(seg.mechanicals.systems)) == 1
+
+
+def test_changes_only_clear_the_affected_objects():
+    segments = []
+    for _ in range(2):
+        seg = PHX.bldg_segment.BldgSegment()
+        seg.add_components([_component(1), _component(2)])
+        for _ in range(2):
+            zone = PHX.bldg_segment.Zone()
+            zone.add_rooms([PHX.bldg_segment.Room(), PHX.bldg_segment.Room()])
+            seg.add_zones(zone)
+        segments.append(seg)
+
+    def read_all():
+        for seg in segments:
+            seg.total_envelope_area
+            seg.mechanicals
+            for zone in seg.zones:
+                zone.mechanicals
+
+    read_all()
+    PHX.metrics_cache.reset_cache_stats()
+
+    # -- A new System in one Room: only its Zone and BldgSegment are re-calculated. The
+    # -- BldgSegment's other values are cleared too, but not its Components' or the other segment's.
+    segments[0].zones[1].rooms[0].mechanicals.add_system(PHX.mechanicals.systems.MechanicalSystem())
+    read_all()
+    assert _stats("Zone.mechanicals") == {"hits": 5, "misses": 1}
+    assert _stats("BldgSegment.mechanicals") == {"hits": 1, "misses": 1}
+    assert _stats("BldgSegment.total_envelope_area") == {"hits": 1, "misses": 1}
+    assert _stats("Component.exposed_area") == {"hits": 2, "misses": 0}
+    assert len(list(segments[0].mechanicals.systems)) == 1
+
+    # -- Moving a Vertex: only its Component and BldgSegment (all of the segment's values)
+    PHX.metrics_cache.reset_cache_stats()
+    segments[1].components[0].polygons[0].vertices[2].y = 2
+    read_all()
+    assert _stats("BldgSegment.total_envelope_area") == {"hits": 1, "misses": 1}
+    assert _stats("Component.exposed_area") == {"hits": 1, "misses": 1}
+    assert _stats("BldgSegment.mechanicals") == {"hits": 1, "misses": 1}
+    assert segments[1].total_envelope_area == 5.5
+
+    # -- A Component removed from a segment no longer clears it
+    compo = segments[1].components.pop()
+    assert segments[1].total_envelope_area == 1.5
+    PHX.metrics_cache.reset_cache_stats()
+    compo.type = 2
+    assert segments[1].total_envelope_area == 1.5
+    assert _stats("BldgSegment.total_envelope_area") == {"hits": 1, "misses": 0}
@@ -0,0 +1,245 @@
+import gc
+import tracemalloc
+import pytest
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.geometry_store
+from PHX.geometry import Polygon, Vertex, VertexTypeError
+
+
+def _square(_offset=0.0):
+    poly = Polygon()
+    poly.vertices = [
+        Vertex(_offset, 0, 0),
+        Vertex(_offset, 1, 0),
+        Vertex(_offset + 1, 1, 0),
+        Vertex(_offset + 1, 0, 0),
+    ]
+    return poly
+
+
+def _geom(_num_polygons):
+    compos = []
+    for i in range(_num_polygons):
+        compo = PHX.component.Component()
+        compo.add_polygons(_square(i * 2))
+        compos.append(compo)
+
+    geom = PHX.bldg_segment.Geom()
+    geom.add_component_polygons(compos)
+    return geom
+
+
+def test_vertex_becomes_view_onto_polygon(reset_geometry_count):
+    v1 = Vertex(1, 2, 3)
+    poly = Polygon()
+    poly.vertices = [v1, Vertex(4, 5, 6)]
+
+    # -- Changes to the original Vertex are seen by the Polygon, and the other way around
+    v1.x = 10
+    assert poly.vertices[0].x == 10
+    poly.vertices[1].z = 60
+    assert poly.vertex_coordinates.tolist() == [10, 2, 3, 4, 5, 60]
+
+    assert poly.vertices[0] == v1
+    assert poly.idVert == [1, 2]
+
+
+def test_vertex_identifier_and_user_data_kept(reset_geometry_count):
+    v1 = Vertex(1, 2, 3)
+    identifier = v1.identifier
+    v1.user_data["note"] = "corner"
+
+    poly = Polygon()
+    poly.vertices.append(Vertex())
+    poly.vertices.insert(0, v1)
+
+    assert poly.vertices[0].identifier == identifier
+    assert poly.vertices[0].user_data == {"note": "corner"}
+    assert poly.vertices[1].identifier != identifier
+    assert poly.vertices[1].user_data == {}
+
+
+def test_standalone_vertex_has_no_store(reset_geometry_count):
+    v1 = Vertex(1, 2, 3)
+
+    assert isinstance(v1._range, PHX.geometry_store.VertexRecord)
+    assert not hasattr(v1, "__dict__")
+    assert not hasattr(v1, "_identifier")
+    assert (v1.x, v1.y, v1.z, v1.id) == (1, 2, 3, 1)
+
+
+def test_vertex_shared_between_polygons(reset_geometry_count):
+    shared = Vertex(1, 0, 0)
+    poly_1 = Polygon()
+    poly_1.vertices = [Vertex(0, 0, 0), shared, Vertex(1, 1, 0)]
+    poly_2 = Polygon()
+    poly_2.vertices = [shared, Vertex(2, 0, 0), Vertex(2, 1, 0)]
+    assert poly_1.area == pytest.approx(0.5)
+
+    # -- The Vertex is the same in both Polygons
+    assert poly_1.vertices[1] == poly_2.vertices[0]
+    assert hash(poly_1.vertices[1]) == hash(poly_2.vertices[0])
+    assert poly_1.vertices[0] != poly_2.vertices[0]
+
+    shared.x = 0
+    assert poly_1.vertices[1].x == 0
+    assert poly_2.vertices[0].x == 0
+    assert poly_1.area == pytest.approx(0)
+
+    poly_1.vertices[1].user_data["note"] = "corner"
+    assert poly_2.vertices[0].user_data == {"note": "corner"}
+    assert poly_2.vertices[0].identifier == shared.identifier
+
+    # -- Still shared after the Polygons are re-ordered, and after one is removed
+    poly_2.vertices.reverse()
+    popped = poly_1.vertices.pop(1)
+    popped.y = 5
+    assert poly_2.vertices[2].y == 5
+    assert poly_1.idVert == [2, 3]
+
+
+def test_vertex_int_coordinates_kept(reset_geometry_count):
+    poly = Polygon()
+    poly.vertices = [Vertex(0, 1.5, 2), Vertex(1.0, 0, 0)]
+
+    assert [type(_) for _ in poly.vertex_values] == [int, float, int, float, int, int]
+    assert type(poly.vertices[0].x) is int
+
+    poly.vertices[0].x = 0.5
+    assert poly.vertex_values[0] == 0.5
+
+    geom = PHX.bldg_segment.Geom()
+    geom.polygons.append(poly)
+    geom.translate(1, 1, 1)
+    assert all(type(_) is float for _ in poly.vertex_values)
+
+
+def test_vertex_ids_not_int(reset_geometry_count):
+    poly = _square()
+    poly.vertices[0].id = None
+    poly.vertices[1].id = True
+
+    assert poly.idVert[:2] == [None, True]
+    assert poly.vertices[1].id is True
+
+    geom = PHX.bldg_segment.Geom()
+    geom.add_polygons(poly)
+    assert poly.idVert == [None, True, 3, 4]
+
+
+def test_polygon_vertices_list_operations(reset_geometry_count):
+    poly = _square()
+    ids = poly.idVert
+
+    poly.vertices.reverse()
+    assert poly.idVert == list(reversed(ids))
+
+    popped = poly.vertices.pop()
+    assert popped.id == ids[0]
+    assert (popped.x, popped.y, popped.z) == (0, 0, 0)
+    assert len(poly.vertices) == 3
+
+    del poly.vertices[0]
+    assert poly.idVert == [ids[2], ids[1]]
+
+    poly.vertices[0] = popped
+    assert poly.idVert == [ids[0], ids[1]]
+    assert [v.id for v in poly.vertices[::-1]] == [ids[1], ids[0]]
+
+    with pytest.raises(VertexTypeError):
+        poly.vertices.append((0, 0, 0))
+
+
+def test_geom_holds_all_vertices_together():
+    geom = _geom(3)
+
+    store = geom.vertex_store
+    assert len(store) == 12
+    assert all(p._vertex_range.store is store for p in geom.polygons)
+    assert store.coords.tolist() == [c for p in geom.polygons for c in p.vertex_coordinates]
+    assert [v.id for v in geom.vertices] == [i for p in geom.polygons for i in p.idVert]
+
+
+def test_geom_compact():
+    geom = _geom(3)
+
+    # -- Growing the first Polygon moves it to the end of the store
+    geom.polygons[0].vertices.append(Vertex(5, 5, 5))
+    assert geom.vertex_store.garbage == 4
+    assert len(geom.vertex_store) == 17
+
+    geom.compact()
+    assert geom.vertex_store.garbage == 0
+    assert len(geom.vertex_store) == 13
+    assert geom.polygons[0].vertices[-1].x == 5
+
+
+def test_geom_translate_and_scale():
+    geom = _geom(2)
+
+    geom.translate(1, 2, 3)
+    assert geom.polygons[1].vertices[0].x == 3
+    assert geom.polygons[1].vertices[0].y == 2
+    assert geom.polygons[1].vertices[0].z == 3
+
+    geom.scale(2, _origin=(1, 2, 3))
+    assert geom.polygons[1].vertices[2].x == 7
+    assert geom.polygons[1].vertices[2].y == 4
+    assert geom.polygons[0].area == pytest.approx(4)
+
+
+def test_geom_transform_without_numpy(monkeypatch):
+    monkeypatch.setattr(PHX.geometry_store, "np", None)
+    geom = _geom(2)
+
+    geom.transform(_factor=2, _offset=(1, 0, 0))
+    assert geom.polygons[1].vertex_coordinates.tolist()[:3] == [5, 0, 0]
+
+    with pytest.raises(PHX.geometry_store.NumpyNotAvailableError):
+        geom.vertex_coordinates_array()
+
+
+def test_geom_vertex_coordinates_array():
+    geom = _geom(2)
+    arr = geom.vertex_coordinates_array()
+
+    assert arr.shape == (8, 3)
+    assert arr[4].tolist() == [2, 0, 0]
+
+    # -- A copy, not a view
+    arr[0, 0] = 100
+    assert geom.polygons[0].vertices[0].x == 0
+
+    # -- Polygons out of order in the store
+    geom.polygons.reverse()
+    assert geom.vertex_coordinates_array()[0].tolist() == [2, 0, 0]
+
+
+def test_polygon_round_trip_dict(reset_geometry_count):
+    poly = _square()
+    new_poly = Polygon.from_dict(poly.to_dict())
+
+    assert new_poly.vertex_coordinates == poly.vertex_coordinates
+    assert new_poly.idVert == poly.idVert
+    assert [v.identifier for v in new_poly.vertices] == [str(v.identifier) for v in poly.vertices]
+
+
+def test_geom_memory():
+    gc.collect()
+    tracemalloc.start()
+    try:
+        seg = PHX.bldg_segment.BldgSegment()
+        for i in range(200):
+            compo = PHX.component.Component()
+            compo.add_polygons([_square(i * 2 + j * 0.1) for j in range(10)])
+            seg.add_components(compo)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    # -- About 850 bytes for each Polygon (with its 4 Vertices) in a Component and Geom. With full
+    # -- PHX Objects for each Polygon and Vertex, it was over 2600.
+    assert used / 2000 < 1100
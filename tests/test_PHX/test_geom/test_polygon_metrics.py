@@ -0,0 +1,119 @@
+import pytest
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.geometry_kernel
+from PHX.geometry import Polygon, Vertex
+
+
+def _polygon(_points):
+    poly = Polygon()
+    poly.vertices = [Vertex(*_) for _ in _points]
+    return poly
+
+
+def _L_shape(_z=0.0):
+    """
+    2 +----+
+      |    |
+    1 |    +-----+
+      |          |
+    0 +----------+
+      0    1     2
+    """
+    return _polygon([(0, 0, _z), (2, 0, _z), (2, 1, _z), (1, 1, _z), (1, 2, _z), (0, 2, _z)])
+
+
+def _geom(_polygons):
+    compo = PHX.component.Component()
+    compo.add_polygons(_polygons)
+    geom = PHX.bldg_segment.Geom()
+    geom.add_component_polygons(compo)
+    return geom
+
+
+def test_L_shape_metrics():
+    poly = _L_shape(_z=3)
+
+    assert poly.area == 3
+    assert (poly.normal.x, poly.normal.y, poly.normal.z) == (0, 0, 1)
+    assert poly.centroid.x == pytest.approx(5 / 6)
+    assert poly.centroid.y == pytest.approx(5 / 6)
+    assert poly.centroid.z == pytest.approx(3)
+
+
+def test_vertical_polygon_reversed_normal():
+    poly = _polygon([(0, 0, 0), (0, 0, 2), (0, 3, 2), (0, 3, 0)])
+
+    assert poly.area == 6
+    assert (poly.normal.x, poly.normal.y, poly.normal.z) == (-1, 0, 0)
+    assert (poly.centroid.x, poly.centroid.y, poly.centroid.z) == (0, 1.5, 1)
+
+
+def test_collinear_first_vertices():
+    poly = _polygon([(0, 0, 0), (1, 0, 0), (2, 0, 0), (2, 1, 0), (0, 1, 0)])
+    assert poly.area == 2
+
+
+def test_no_area():
+    poly = _polygon([(0, 0, 0), (1, 1, 1), (2, 2, 2)])
+
+    assert poly.area == 0
+    assert (poly.normal.x, poly.normal.y, poly.normal.z) == (0, 0, 0)
+    assert (poly.centroid.x, poly.centroid.y, poly.centroid.z) == (1, 1, 1)
+
+
+def test_batch_matches_single(monkeypatch):
+    monkeypatch.setattr(PHX.geometry_kernel, "NUMPY_MIN_POLYGONS", 1)
+    polys = [_L_shape(1), _polygon([(0, 0, 0), (0, 1, 0)]), _polygon([(2, 0, 0), (2, 0, 1), (3, 1, 1)])]
+    polys += [_polygon([(0, 0, i), (4, 0, i), (4, 1, i + 1), (0, 1, i + 1)]) for i in range(3)]
+    geom = _geom(polys)
+
+    coords = geom.vertex_store.coords
+    ranges = [(p._vertex_range.start, p._vertex_range.stop) for p in polys]
+    batch = PHX.geometry_kernel.batch_polygon_metrics(coords, ranges)
+    single = [PHX.geometry_kernel.polygon_metrics(coords, *r) for r in ranges]
+
+    for b, s in zip(batch, single):
+        assert b.area == pytest.approx(s.area)
+        assert b.normal == pytest.approx(s.normal)
+        assert b.centroid == pytest.approx(s.centroid)
+
+
+def test_batch_without_numpy(monkeypatch):
+    polys = [_L_shape(i) for i in range(3)]
+    geom = _geom(polys)
+    ranges = [(p._vertex_range.start, p._vertex_range.stop) for p in polys]
+
+    monkeypatch.setattr(PHX.geometry_kernel, "np", None)
+    results = PHX.geometry_kernel.batch_polygon_metrics(geom.vertex_store.coords, ranges)
+
+    assert [_.area for _ in results] == [3, 3, 3]
+
+
+def test_geom_metrics_cached_until_vertex_changes():
+    polys = [_L_shape(i) for i in range(3)]
+    geom = _geom(polys)
+    store = geom.vertex_store
+
+    geom.update_polygon_metrics()
+    assert len(store.metrics) == 3
+    assert polys[1].area == 3
+
+    # -- Moving any Vertex clears the values, and the new area is calculated
+    polys[1].vertices[2].x = 3
+    assert not store.metrics or store.metrics_version != store.version
+    assert polys[1].area == 3.5
+
+    geom.scale(2)
+    assert polys[0].area == 12
+
+
+def test_segment_envelope_area_uses_batch():
+    seg = PHX.bldg_segment.BldgSegment()
+    compo = PHX.component.Component()
+    compo.add_polygons([_L_shape(i) for i in range(4)])
+    seg.add_components(compo)
+
+    assert seg.total_envelope_area == 12
+    assert len(seg.geom.vertex_store.metrics) == 4
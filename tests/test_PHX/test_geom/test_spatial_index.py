@@ -0,0 +1,146 @@
+import random
+import pytest
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.geometry_kernel
+from PHX.geometry import Polygon, Vertex
+from PHX.spatial_index import BoundingBox, PolygonIndex
+
+
+def _polygon(_points):
+    poly = Polygon()
+    poly.vertices = [Vertex(*_) for _ in _points]
+    return poly
+
+
+def _rectangle(_x0, _y0, _x1, _y1, _z=0.0, _reverse=False):
+    points = [(_x0, _y0, _z), (_x1, _y0, _z), (_x1, _y1, _z), (_x0, _y1, _z)]
+    return _polygon(points[::-1] if _reverse else points)
+
+
+def _random_polygons(_num, _seed=1):
+    rnd = random.Random(_seed)
+    polys = []
+    for _ in range(_num):
+        x, y, z = rnd.uniform(0, 100), rnd.uniform(0, 100), rnd.uniform(0, 10)
+        w, h = rnd.uniform(0.1, 3), rnd.uniform(0.1, 3)
+        polys.append(_rectangle(x, y, x + w, y + h, z))
+    return polys
+
+
+def _distance(_poly, _point):
+    m = _poly._metrics
+    r = _poly._vertex_range
+    return PHX.geometry_kernel.point_polygon_distance(r.store.coords, r.start, r.stop, m.normal, _point)
+
+
+def test_point_polygon_distance():
+    poly = _rectangle(0, 0, 2, 2)
+
+    assert _distance(poly, (1, 1, 3)) == 3
+    assert _distance(poly, (1, 1, -0.5)) == 0.5
+    assert _distance(poly, (3, 1, 0)) == 1
+    assert _distance(poly, (5, 6, 0)) == 5
+
+
+def test_query_region_matches_brute_force():
+    polys = _random_polygons(500)
+    index = PolygonIndex(polys)
+    region = BoundingBox(20, 20, 0, 40, 50, 5)
+
+    expected = [p for p in polys if BoundingBox.from_coordinates(p.vertex_coordinates).intersects(region)]
+    assert expected
+    assert index.query_region(region) == expected
+
+
+def test_nearest_matches_brute_force():
+    polys = _random_polygons(500)
+    index = PolygonIndex(polys)
+    rnd = random.Random(2)
+
+    for _ in range(50):
+        point = (rnd.uniform(-10, 110), rnd.uniform(-10, 110), rnd.uniform(-5, 15))
+        expected = min(_distance(p, point) for p in polys)
+        poly, distance = index.nearest(point)
+        assert distance == pytest.approx(expected)
+
+
+def test_nearest_max_distance_and_filter():
+    near = _rectangle(0, 0, 1, 1)
+    far = _rectangle(0, 0, 1, 1, _z=5)
+    index = PolygonIndex([near, far])
+
+    assert index.nearest((0.5, 0.5, 1)) == (near, 1)
+    assert index.nearest((0.5, 0.5, 1), _max_distance=0.5) is None
+    assert index.nearest((0.5, 0.5, 1), _filter=lambda p: p is far) == (far, 4)
+    assert PolygonIndex([]).nearest((0, 0, 0)) is None
+
+
+def test_coplanar_neighbours():
+    a = _rectangle(0, 0, 1, 1)
+    b = _rectangle(1, 0, 2, 1)  # -- touching, same plane
+    c = _rectangle(0, 0, 1, 1, _reverse=True)  # -- other side
+    d = _rectangle(1, 0, 2, 1, _z=0.5)  # -- parallel, different plane
+    e = _rectangle(5, 5, 6, 6)  # -- same plane, not touching
+    index = PolygonIndex([a, b, c, d, e])
+
+    assert index.coplanar_neighbours(a) == [b, c]
+    assert index.coplanar_neighbours(a, _facing=1) == [b]
+    assert index.coplanar_neighbours(a, _facing=-1) == [c]
+
+
+def _segment():
+    wall = PHX.component.Component()
+    wall.add_polygons([_rectangle(0, 0, 10, 3), _rectangle(10, 0, 20, 3)])
+
+    other_side = PHX.component.Component()
+    other_side.add_polygons(_rectangle(0, 0, 10, 3, _reverse=True))
+
+    window = PHX.component.Component()
+    window.type = 2
+    window.add_polygons([_rectangle(12, 1, 13, 2), _rectangle(2, 1, 3, 2)])
+
+    seg = PHX.bldg_segment.BldgSegment()
+    seg.add_components([wall, other_side, window])
+    return seg, wall, other_side, window
+
+
+def test_segment_window_host():
+    seg, wall, other_side, window = _segment()
+
+    compo, poly = seg.get_window_host(window.polygons[0])
+    assert compo is wall and poly is wall.polygons[1]
+
+    assert seg.add_window_as_child(window) is wall
+    assert wall.polygons[1].children == [window.polygons[0].id]
+    assert wall.polygons[0].children + other_side.polygons[0].children == [window.polygons[1].id]
+
+
+def test_segment_window_host_not_found():
+    seg, wall, other_side, window = _segment()
+    stray = PHX.component.Component()
+    stray.type = 2
+    stray.add_polygons(_rectangle(2, 1, 3, 2, _z=1))
+
+    assert seg.get_window_host(stray.polygons[0]) is None
+    with pytest.raises(PHX.bldg_segment.WindowHostNotFoundError):
+        seg.add_window_as_child(stray)
+
+
+def test_segment_adjacent_and_region():
+    seg, wall, other_side, window = _segment()
+
+    assert seg.get_adjacent_polygons(wall.polygons[0]) == [other_side.polygons[0]]
+    assert seg.get_polygons_in_region(BoundingBox(11, 0.5, -1, 14, 2.5, 1)) == [wall.polygons[1], window.polygons[0]]
+
+
+def test_segment_index_rebuilt_after_change():
+    seg, wall, other_side, window = _segment()
+    index = seg.polygon_index
+    assert seg.polygon_index is index
+
+    seg.components = [wall]
+    assert seg.polygon_index is not index
+    assert len(seg.polygon_index) == 2
+    assert seg.total_envelope_area == 60
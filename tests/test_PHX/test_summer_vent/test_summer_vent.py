@@ -56,3 +56,27 @@ def test_Summer_Vent_weighted_join_Zero_Volume():
     assert temp(sv1, vol_1, sv2, vol_2, "additional_mech_spec_power") == 0
     assert temp(sv1, vol_1, sv2, vol_2, "exhaust_ach") == 0
     assert temp(sv1, vol_1, sv2, vol_2, "exhaust_spec_power") == 0
+
+
+def test_Summer_Vent_weighted_join_all():
+    svs = [PHX.summer_ventilation.SummerVent() for _ in range(3)]
+    for i, sv in enumerate(svs):
+        sv.avg_mech_ach = i * 10
+        sv.exhaust_ach = i + 1
+    svs[2].day_window_ach = None
+    vols = [1_000, 2_000, 3_000]
+
+    sv_all = PHX.summer_ventilation.SummerVent.weighted_join_all(svs, vols)
+    sv_pairs = PHX.summer_ventilation.SummerVent.weighted_join(
+        PHX.summer_ventilation.SummerVent.weighted_join(svs[0], vols[0], svs[1], vols[1]),
+        vols[0] + vols[1],
+        svs[2],
+        vols[2],
+    )
+
+    assert sv_all.avg_mech_ach == sv_pairs.avg_mech_ach == 80_000 / 6_000
+    assert sv_all.exhaust_ach == sv_pairs.exhaust_ach
+    assert sv_all.day_window_ach is None and sv_pairs.day_window_ach is None
+
+    sv_zero = PHX.summer_ventilation.SummerVent.weighted_join_all(svs, [0, 0, 0])
+    assert sv_zero.avg_mech_ach == 0
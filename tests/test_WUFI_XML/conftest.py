@@ -0,0 +1,92 @@
+import pytest
+import PHX.project
+import PHX.bldg_segment
+import PHX.component
+import PHX.geometry
+import PHX.spaces
+import PHX.assemblies
+import PHX.window_types
+import PHX.appliances
+import PHX.mechanicals.systems
+import PHX.mechanicals.equipment
+
+
+def _build_space(_name, _number, _floor_area):
+    flr_seg = PHX.spaces.FloorSegment()
+    flr_seg.floor_area_gross = _floor_area
+    flr_seg.space_name = _name
+    flr_seg.space_number = _number
+
+    flr = PHX.spaces.Floor()
+    flr.add_new_floor_segment(flr_seg)
+
+    vol = PHX.spaces.Volume()
+    vol.set_Floor(flr)
+    vol.average_ceiling_height = 2.5
+
+    space = PHX.spaces.Space()
+    space.add_new_volume(vol)
+
+    return space
+
+
+def _build_component(_assembly, _offset):
+    poly = PHX.geometry.Polygon()
+    poly.vertices = [
+        PHX.geometry.Vertex(0 + _offset, 0, 0),
+        PHX.geometry.Vertex(0 + _offset, 10.123456789, 0),
+        PHX.geometry.Vertex(3.3333333333 + _offset, 10.123456789, 0),
+        PHX.geometry.Vertex(3.3333333333 + _offset, 0, 0),
+    ]
+    poly.nVec = PHX.geometry.Vector(0, 0, 1)
+
+    compo = PHX.component.Component()
+    compo.name = "Floor <{}> & Co.".format(_offset)
+    compo.assembly_id_num = _assembly.id
+    compo.add_polygons(poly)
+
+    return compo
+
+
+def _build_project(_num_segments):
+    project = PHX.project.Project()
+
+    assembly = PHX.assemblies.Assembly()
+    assembly.add_layer(PHX.assemblies.Layer())
+    project.lAssembly.append(assembly)
+    project.lWindow.append(PHX.window_types.WindowType())
+
+    for seg_num in range(_num_segments):
+        seg = PHX.bldg_segment.BldgSegment()
+        seg.name = 'Segment "{}"'.format(seg_num)
+
+        for zone_num in range(2):
+            room = PHX.bldg_segment.Room()
+            room.add_spaces(_build_space("Room <{}>".format(zone_num), zone_num, 25 * (zone_num + 1)))
+
+            mech_system = PHX.mechanicals.systems.MechanicalSystem()
+            mech_system.equipment_set.add_new_device_to_equipment_set(PHX.mechanicals.equipment.HVAC_Ventilator())
+            room.mechanicals.add_system(mech_system)
+
+            zone = PHX.bldg_segment.Zone()
+            zone.name = "Zone {}".format(zone_num)
+            zone.add_rooms(room)
+            zone.appliance_set.add_appliances_to_set(PHX.appliances.Appliance.PHIUS_Dishwasher())
+            seg.add_zones(zone)
+
+        seg.add_components([_build_component(assembly, i) for i in range(3)])
+        project.add_segment(seg)
+
+    return project
+
+
+@pytest.fixture
+def sample_project():
+    """A small, but complete, PHX Project with two BldgSegments, ready for WUFI export"""
+    return _build_project(2)
+
+
+@pytest.fixture
+def five_segment_project():
+    """The same as the sample_project, but with five BldgSegments"""
+    return _build_project(5)
@@ -0,0 +1,40 @@
+import json
+import PyPH_WUFI.WUFI_xml_build
+from benchmarks.export_benchmark import STAGES, main, run_benchmark
+from benchmarks.synthetic_project import ProjectSize, build_project
+
+
+def test_synthetic_project_size():
+    size = ProjectSize(segments=2, zones=3, rooms=2, spaces=2, components=5, polygons=2, vertices=6)
+    project = build_project(size)
+
+    segments = list(project.building_segments)
+    assert len(segments) == 2
+    for seg in segments:
+        assert len(seg.zones) == 3
+        assert all(len(z.rooms) == 2 for z in seg.zones)
+        assert len(seg.components) == 5
+        assert all(len(c.polygons) == 2 for c in seg.components)
+        assert all(len(p.vertices) == 6 for c in seg.components for p in c.polygons)
+
+    assert PyPH_WUFI.WUFI_xml_build.create_project_xml_text(project)
+
+
+def test_run_benchmark(tmp_path):
+    results = run_benchmark(ProjectSize(components=2), _repeat=1, _output_dir=str(tmp_path))
+
+    assert set(results["stages"]) == set(STAGES)
+    assert all(results["stages"][stage]["runs"] == 1 for stage in STAGES)
+    assert results["size"]["components"] == 2
+    assert results["traversal"]["schema_calls"] > 0
+    assert (tmp_path / "benchmark.xml").read_text(encoding="utf8") == (tmp_path / "benchmark_stream.xml").read_text(
+        encoding="utf8"
+    )
+
+
+def test_main_writes_json(tmp_path):
+    main(["--components", "2", "--repeat", "1", "--output", str(tmp_path / "results.json")])
+
+    with open(tmp_path / "results.json", encoding="utf8") as f:
+        results = json.load(f)
+    assert set(results["stages"]) == set(STAGES)
@@ -0,0 +1,57 @@
+import io
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_conversion_functions
+import PyPH_WUFI.export_context
+from PyPH_WUFI.export_context import export_context, get_active_context
+
+
+def test_no_context_outside_export():
+    assert get_active_context() is None
+
+
+def test_temp_zone_built_once_per_export(sample_project):
+    zone = sample_project.zones[0]
+
+    with export_context() as context:
+        temp_zone = PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Zone(zone)
+        assert PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Zone(zone) is temp_zone
+        assert context.to_dict() == {"size": 1, "hits": 1, "misses": 1}
+
+    assert get_active_context() is None
+    assert len(context) == 0
+    assert PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Zone(zone) is not temp_zone
+
+
+def test_room_ventilation_shared_by_spaces(sample_project):
+    zone = sample_project.zones[0]
+    room = zone.rooms[0]
+    room.add_spaces([room.spaces[0]] * 2)
+
+    with export_context() as context:
+        temp_spaces = PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Zone(zone).spaces
+        assert len(temp_spaces) > 1
+
+        results = [PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_RoomVentilation(_) for _ in temp_spaces]
+        assert all(_ is results[0] for _ in results)
+        ventilator = list(list(room.mechanicals.systems)[0].equipment_set.equipment)[0]
+        assert results[0].ventilator_id == ventilator.id
+        assert context.misses == 2
+
+
+def test_nested_context_is_shared():
+    with export_context() as outer:
+        with export_context() as inner:
+            assert inner is outer
+        assert get_active_context() is outer
+
+    assert get_active_context() is None
+
+
+def test_export_output_unchanged(sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream)
+
+    assert stream.getvalue() == xml_text
+    assert get_active_context() is None
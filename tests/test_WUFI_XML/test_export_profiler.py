@@ -0,0 +1,72 @@
+import io
+import json
+import pytest
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_convert_phx
+import PyPH_WUFI.WUFI_xml_conversion_functions
+import PyPH_WUFI.WUFI_xml_schemas_write
+from PyPH_WUFI.export_profiler import ExportProfiler, ProfilerActiveError, profile_export
+
+
+def test_profile_export(sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+
+    with profile_export() as profiler:
+        stream = io.StringIO()
+        PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream)
+
+    assert stream.getvalue() == xml_text
+
+    profiles = profiler.to_dict()
+    assert profiles["_Project"]["calls"] >= 1
+    assert profiles["_Zone"]["kind"] == "schema"
+    assert profiles["_Zone"]["nodes"] > 0
+    assert profiles["build_temp_Zone"]["kind"] == "builder"
+    assert profiles["build_temp_Zone"]["calls"] >= len(sample_project.zones)
+
+    # -- build_temp_Project is called from the _Project schema, so its time is not 'self' time
+    project = profiles["_Project"]
+    assert project["self_time"] <= project["cumulative_time"]
+    assert project["cumulative_time"] >= profiles["build_temp_Project"]["cumulative_time"]
+
+
+def test_originals_restored(sample_project):
+    schema = PyPH_WUFI.WUFI_xml_schemas_write._Zone
+    builder = PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Zone
+    imported_builder = PyPH_WUFI.WUFI_xml_schemas_write.build_temp_Zone
+
+    with profile_export():
+        assert PyPH_WUFI.WUFI_xml_schemas_write._Zone is not schema
+        assert PyPH_WUFI.WUFI_xml_schemas_write.build_temp_Zone is not imported_builder
+        PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+
+    assert PyPH_WUFI.WUFI_xml_schemas_write._Zone is schema
+    assert PyPH_WUFI.WUFI_xml_conversion_functions.build_temp_Zone is builder
+    assert PyPH_WUFI.WUFI_xml_schemas_write.build_temp_Zone is imported_builder
+    assert PyPH_WUFI.WUFI_xml_convert_phx.get_schema_function(sample_project.zones[0]) is schema
+
+
+def test_report_and_json(sample_project):
+    with profile_export() as profiler:
+        PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+
+    report = profiler.report(_limit=5)
+    assert report.splitlines()[0].split() == ["Name", "Kind", "Calls", "Cumulative", "s", "Self", "s", "Nodes"]
+    assert len(report.splitlines()) == 7
+    assert json.loads(profiler.to_json()) == profiler.to_dict()
+
+
+def test_only_one_profiler():
+    with profile_export():
+        with pytest.raises(ProfilerActiveError):
+            ExportProfiler().enable()
+
+
+def test_clear(sample_project):
+    profiler = ExportProfiler()
+    with profiler:
+        PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+
+    assert not profiler.enabled
+    profiler.clear()
+    assert profiler.to_dict() == {}
@@ -0,0 +1,96 @@
+import io
+import PHX.bldg_segment
+import PHX.id_allocator
+import PHX.project
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_convert_phx
+import PyPH_WUFI.xml_node
+import PyPH_WUFI.xml_traversal
+
+
+class NumberedGeom(PHX.bldg_segment.Geom):
+    """A Geom whose schema hands out a new ID number each time it is written."""
+
+    _count = 0
+
+
+def _NumberedGeom(_obj):
+    return [PyPH_WUFI.xml_node.XML_Node("IdentNr", PHX.id_allocator.next_id(NumberedGeom))]
+
+
+def test_stream_matches_pretty_xml_text(sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream)
+
+    assert stream.getvalue() == xml_text
+
+
+def test_stream_escapes_text_and_attributes(sample_project):
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream)
+    xml_text = stream.getvalue()
+
+    assert "<Name>Segment &quot;0&quot;</Name>" in xml_text
+    assert "<Name>Floor &lt;0&gt; &amp; Co.</Name>" in xml_text
+
+
+def test_stream_empty_project():
+    project = PHX.project.Project()
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(project)
+
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(project, stream)
+
+    assert stream.getvalue() == xml_text
+    assert '<Variants count="0"/>' in xml_text
+
+
+def test_parallel_matches_stream(sample_project):
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream)
+
+    parallel_stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml_parallel(sample_project, parallel_stream, _max_workers=2)
+
+    assert parallel_stream.getvalue() == stream.getvalue()
+
+
+def test_parallel_more_variants_than_workers(five_segment_project):
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(five_segment_project, stream)
+
+    parallel_stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml_parallel(five_segment_project, parallel_stream, _max_workers=2)
+
+    assert parallel_stream.getvalue() == stream.getvalue()
+
+
+def test_parallel_new_ids_match_stream(five_segment_project, monkeypatch):
+    monkeypatch.setitem(PyPH_WUFI.WUFI_xml_convert_phx._CLASS_SCHEMA_FUNCTIONS, NumberedGeom, _NumberedGeom)
+    for seg in list(five_segment_project.building_segments)[2:]:
+        seg.geom = NumberedGeom()
+
+    PHX.id_allocator.reset_counts(NumberedGeom)
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(five_segment_project, stream)
+
+    PHX.id_allocator.reset_counts(NumberedGeom)
+    parallel_stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml_parallel(five_segment_project, parallel_stream, _max_workers=2)
+
+    assert "<IdentNr>3</IdentNr>" in stream.getvalue()
+    assert parallel_stream.getvalue() == stream.getvalue()
+
+
+def test_parallel_stats_match_stream(sample_project):
+    stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, io.StringIO(), stats)
+
+    parallel_stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml_parallel(
+        sample_project, io.StringIO(), _max_workers=2, _stats=parallel_stats
+    )
+
+    assert parallel_stats.to_dict() == stats.to_dict()
@@ -0,0 +1,48 @@
+import pytest
+import PyPH_WUFI.selection
+
+
+def test_get_xml_data():
+    xml_data = PyPH_WUFI.selection.get_xml_data("Component::Type", 2)
+
+    assert xml_data == ("Type", 2, "choice", "Transparent")
+
+
+def test_get_xml_data_is_cached():
+    xml_data_1 = PyPH_WUFI.selection.get_xml_data("Component::Type", 2)
+    xml_data_2 = PyPH_WUFI.selection.get_xml_data("Component::Type", 2)
+
+    assert xml_data_1 is xml_data_2
+
+
+def test_get_xml_data_default():
+    xml_data = PyPH_WUFI.selection.get_xml_data("Component::Type", None)
+
+    assert xml_data == PyPH_WUFI.selection.get_xml_data("Component::Type", 1)
+
+
+def test_get_xml_data_converts_input_to_int():
+    assert PyPH_WUFI.selection.get_xml_data("Component::Type", "2")[1] == 2
+    assert PyPH_WUFI.selection.get_xml_data("Component::Type", 2.0)[1] == 2
+
+
+def test_get_xml_data_bad_type():
+    with pytest.raises(PyPH_WUFI.selection.SelectionInputTypeError):
+        PyPH_WUFI.selection.get_xml_data("Component::Type", "not-a-number")
+
+
+def test_get_xml_data_bad_value():
+    with pytest.raises(PyPH_WUFI.selection.SelectionInputValueError):
+        PyPH_WUFI.selection.get_xml_data("Component::Type", 999)
+
+
+def test_get_xml_data_unknown_node():
+    with pytest.raises(PyPH_WUFI.selection.SelectionNodeNotFoundError):
+        PyPH_WUFI.selection.get_xml_data("Component::Not_A_Node", 1)
+
+
+def test_selection_matches_get_xml_data():
+    s = PyPH_WUFI.selection.Selection("Zone::FloorArea_Selection", None)
+
+    assert s.parent_name == "Zone"
+    assert s.xml_data == PyPH_WUFI.selection.get_xml_data("Zone::FloorArea_Selection", None)
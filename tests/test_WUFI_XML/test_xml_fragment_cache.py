@@ -0,0 +1,150 @@
+import io
+import pytest
+import PHX.assemblies
+import PHX.geometry
+import PHX.id_allocator
+import PHX.metrics_cache
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_convert_phx
+import PyPH_WUFI.WUFI_xml_schemas_write
+import PyPH_WUFI.xml_node
+from PyPH_WUFI.xml_fragment_cache import XMLFragmentCache, held_objects
+
+
+def _export(_project, _cache):
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(_project, stream, _cache=_cache)
+    return stream.getvalue()
+
+
+def test_held_objects():
+    assembly = PHX.assemblies.Assembly()
+    layer = PHX.assemblies.Layer()
+    assembly.add_layer(layer)
+    held = list(held_objects(assembly))
+
+    assert layer in held
+    assert layer.material in held
+    assert assembly not in held
+
+
+def test_version_changes_with_nested_attribute():
+    assembly = PHX.assemblies.Assembly()
+    layer = PHX.assemblies.Layer()
+    assembly.add_layer(layer)
+    version = PHX.metrics_cache.watch(assembly, held_objects(assembly))
+
+    layer.material.tConD = layer.material.tConD
+    assert PHX.metrics_cache.version(assembly) == version
+
+    layer.material.tConD = 0.5
+    assert PHX.metrics_cache.version(assembly) is None
+    assert PHX.metrics_cache.watch(assembly, held_objects(assembly)) != version
+
+
+def test_not_base_type_raises():
+    with pytest.raises(TypeError):
+        XMLFragmentCache(_cached_types=(dict,))
+
+
+def test_cached_export_matches(sample_project):
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream)
+
+    cache = XMLFragmentCache()
+    first_stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, first_stream, _cache=cache)
+    assert cache.hits == 0
+    assert cache.misses == len(cache)
+
+    second_stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, second_stream, _cache=cache)
+    assert cache.hits == len(cache)
+
+    assert first_stream.getvalue() == stream.getvalue()
+    assert second_stream.getvalue() == stream.getvalue()
+
+
+def test_cached_export_after_edit(sample_project):
+    cache = XMLFragmentCache()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, io.StringIO(), _cache=cache)
+    num_fragments = len(cache)
+
+    sample_project.lWindow[0].name = "A New Window Name"
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream, _cache=cache)
+
+    assert "<Name>A New Window Name</Name>" in stream.getvalue()
+    assert cache.misses == num_fragments + 1
+    assert stream.getvalue() == PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+
+
+def test_lru_eviction():
+    cache = XMLFragmentCache(_max_size=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.evictions == 1
+    assert cache.to_dict()["hits"] == 1
+
+
+def test_bad_max_size():
+    with pytest.raises(ValueError):
+        XMLFragmentCache(_max_size=0)
+
+
+def test_cached_export_after_nested_edit(sample_project):
+    cache = XMLFragmentCache()
+    _export(sample_project, cache)
+
+    sample_project.lAssembly[0].Layers[0].material.tConD = 0.123
+    assert "<ThermalConductivity>0.123</ThermalConductivity>" in _export(sample_project, cache)
+
+
+def test_cached_export_after_add_layer(sample_project):
+    cache = XMLFragmentCache()
+    first = _export(sample_project, cache)
+
+    layer = PHX.assemblies.Layer()
+    layer.thickness = 0.321
+    sample_project.lAssembly[0].add_layer(layer)
+    second = _export(sample_project, cache)
+
+    assert second != first
+    assert '<Thickness unit="m">0.321</Thickness>' in second
+
+
+def test_cached_export_after_user_data_edit(sample_project, monkeypatch):
+    def _Assembly(_obj):
+        nodes = PyPH_WUFI.WUFI_xml_schemas_write._Assembly(_obj)
+        return nodes + [PyPH_WUFI.xml_node.XML_Node("Note", _obj.user_data.get("note"))]
+
+    monkeypatch.setitem(PyPH_WUFI.WUFI_xml_convert_phx._CLASS_SCHEMA_FUNCTIONS, PHX.assemblies.Assembly, _Assembly)
+    cache = XMLFragmentCache()
+    assembly = sample_project.lAssembly[0]
+    assembly.user_data = {"note": "first"}
+    assert "<Note>first</Note>" in _export(sample_project, cache)
+
+    assembly.user_data = {"note": "second"}
+    assert "<Note>second</Note>" in _export(sample_project, cache)
+
+    assembly.user_data["note"] = "third"
+    PHX.metrics_cache.changed(assembly)
+    assert "<Note>third</Note>" in _export(sample_project, cache)
+
+
+def test_fragment_with_new_ids_not_cached(sample_project, monkeypatch):
+    def _Assembly(_obj):
+        return [PyPH_WUFI.xml_node.XML_Node("NewId", PHX.id_allocator.next_id(PHX.geometry.Vertex))]
+
+    monkeypatch.setitem(PyPH_WUFI.WUFI_xml_convert_phx._CLASS_SCHEMA_FUNCTIONS, PHX.assemblies.Assembly, _Assembly)
+    cache = XMLFragmentCache()
+    _export(sample_project, cache)
+
+    assert "<NewId>" in _export(sample_project, cache)
+    assert not any("<NewId>" in cache._fragments[_] for _ in cache._fragments)
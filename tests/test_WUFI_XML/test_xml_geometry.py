@@ -0,0 +1,153 @@
+import io
+import PHX.bldg_segment
+import PHX.geometry
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.xml_node
+import PyPH_WUFI.xml_traversal
+from PyPH_WUFI.xml_geometry import GeometryColumns, is_columnar_geometry
+
+
+def _generic_text(_item, _stats=None):
+    """The 'Graphics_3D' text, written without the columnar fast-path"""
+    stream = io.StringIO()
+    for event, item, depth in PyPH_WUFI.xml_traversal.walk(_item, _stats):
+        indent = "\t" * depth
+        if event == PyPH_WUFI.xml_traversal.XML_TEXT:
+            stream.write(
+                "{}{}>{}</{}>\n".format(
+                    indent,
+                    PyPH_WUFI.WUFI_xml_build._xml_start_tag(item),
+                    PyPH_WUFI.WUFI_xml_build._xml_escape(PyPH_WUFI.WUFI_xml_build._xml_str(item.node_value)),
+                    item.node_name,
+                )
+            )
+        elif event == PyPH_WUFI.xml_traversal.XML_START:
+            stream.write("{}{}>\n".format(indent, PyPH_WUFI.WUFI_xml_build._xml_start_tag(item)))
+        elif event == PyPH_WUFI.xml_traversal.XML_END:
+            stream.write("{}</{}>\n".format(indent, item.node_name))
+        elif event == PyPH_WUFI.xml_traversal.XML_EMPTY:
+            stream.write("{}{}/>\n".format(indent, PyPH_WUFI.WUFI_xml_build._xml_start_tag(item)))
+
+    return stream.getvalue()
+
+
+def _columnar_text(_item, _stats=None):
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build._write_geometry(stream, _item, "", 0, _stats)
+    return stream.getvalue()
+
+
+def _build_geom():
+    host = PHX.geometry.Polygon()
+    host.vertices = [
+        PHX.geometry.Vertex(0, 0, 0),
+        PHX.geometry.Vertex(0, 10.123456789, 0),
+        PHX.geometry.Vertex(3.3333333333, 10.123456789, -1e-12),
+    ]
+    host.nVec = PHX.geometry.Vector(0.123456789012345, 0, 1)
+
+    window = PHX.geometry.Polygon()
+    window.vertices = [PHX.geometry.Vertex(1, 1, 0), PHX.geometry.Vertex(2, 1, 0), PHX.geometry.Vertex(2, 2, 0)]
+    host.add_children(window)
+
+    geom = PHX.bldg_segment.Geom()
+    geom.polygons = [host, window, PHX.geometry.Polygon()]
+
+    return geom
+
+
+def test_geometry_matches_generic():
+    item = PyPH_WUFI.xml_node.XML_Object("Graphics_3D", _build_geom())
+
+    assert _columnar_text(item) == _generic_text(item)
+
+
+def test_empty_geometry_matches_generic():
+    item = PyPH_WUFI.xml_node.XML_Object("Graphics_3D", PHX.bldg_segment.Geom())
+
+    assert _columnar_text(item) == _generic_text(item)
+    assert '<Vertices count="0"/>' in _columnar_text(item)
+
+
+def test_geometry_with_text_ids_matches_generic():
+    geom = _build_geom()
+    geom.polygons[0].id = "<poly> & 'co'"
+    geom.polygons[0].vertices[0].id = True
+    item = PyPH_WUFI.xml_node.XML_Object("Graphics_3D", geom)
+
+    assert _columnar_text(item) == _generic_text(item)
+
+
+def test_welded_geometry_matches_generic():
+    geom = _build_geom()
+    geom.polygons[1].vertices = [PHX.geometry.Vertex(0, 0, 0.0001), PHX.geometry.Vertex(2, 1, 0)]
+    assert geom.weld_vertices(0.001) == 1
+    item = PyPH_WUFI.xml_node.XML_Object("Graphics_3D", geom)
+
+    assert _columnar_text(item) == _generic_text(item)
+    assert '<Vertices count="4">' in _columnar_text(item)
+
+    stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    _generic_text(item, stats)
+    columnar_stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    columnar_stats.visits += 1
+    _columnar_text(item, columnar_stats)
+    assert columnar_stats.to_dict() == stats.to_dict()
+
+
+def test_geometry_stats_match_generic():
+    item = PyPH_WUFI.xml_node.XML_Object("Graphics_3D", _build_geom())
+
+    stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    _generic_text(item, stats)
+
+    # -- The walk counts the opening visit for the 'Graphics_3D' fragment itself
+    columnar_stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    columnar_stats.visits += 1
+    _columnar_text(item, columnar_stats)
+
+    assert columnar_stats.to_dict() == stats.to_dict()
+
+
+def test_project_stats_match_generic(sample_project):
+    stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project, stats)
+
+    stream_stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream, stream_stats)
+
+    assert stream.getvalue() == xml_text
+    assert stream_stats.to_dict() == stats.to_dict()
+
+
+def test_columns():
+    geom = _build_geom()
+    cols = GeometryColumns.from_geom(geom)
+
+    assert cols.num_vertices == 6
+    assert cols.num_polygons == 3
+    assert cols.vertex_y[1] == 10.12345679
+    assert cols.polygon_vertex_offsets == [0, 3, 6, 6]
+    assert cols.polygon_children == [geom.polygons[1].id]
+    assert cols.polygon_child_offsets == [0, 1, 1, 1]
+
+
+def test_is_columnar_geometry():
+    geom = PHX.bldg_segment.Geom()
+
+    assert is_columnar_geometry(PyPH_WUFI.xml_node.XML_Object("Graphics_3D", geom))
+    assert not is_columnar_geometry(PyPH_WUFI.xml_node.XML_Object("Graphics_3D", geom, _schema_name="_Other"))
+    assert not is_columnar_geometry(PyPH_WUFI.xml_node.XML_List("Graphics_3D", []))
+
+
+def test_int_coordinates_written_as_ints():
+    geom = PHX.bldg_segment.Geom()
+    poly = PHX.geometry.Polygon()
+    poly.vertices = [PHX.geometry.Vertex(0, 1, 2.5), PHX.geometry.Vertex(1.0, 0, 0)]
+    geom.polygons.append(poly)
+    item = PyPH_WUFI.xml_node.XML_Object("Graphics_3D", geom)
+
+    text = _columnar_text(item)
+    assert text == _generic_text(item)
+    assert "<X>0</X>" in text and "<Z>2.5</Z>" in text and "<X>1.0</X>" in text
@@ -0,0 +1,138 @@
+import gzip
+import io
+import xml.etree.ElementTree as ET
+import pytest
+import PHX.geometry
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_read
+
+
+def _round_trip(_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(_project)
+    new_project = PyPH_WUFI.WUFI_xml_read.read_project_xml(io.BytesIO(xml_text.encode("utf8")))
+    new_xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(new_project)
+
+    return ET.fromstring(xml_text), ET.fromstring(new_xml_text)
+
+
+def _to_text(_element):
+    return ET.tostring(_element, encoding="unicode")
+
+
+def test_read_project(sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+    project = PyPH_WUFI.WUFI_xml_read.read_project_xml(io.BytesIO(xml_text.encode("utf8")))
+
+    segments = list(project.building_segments)
+    original_segments = list(sample_project.building_segments)
+    assert len(segments) == len(original_segments)
+
+    for seg, original_seg in zip(segments, original_segments):
+        assert seg.name == original_seg.name
+        assert seg.id == original_seg.id
+        assert [z.name for z in seg.zones] == [z.name for z in original_seg.zones]
+        assert [c.name for c in seg.components] == [c.name for c in original_seg.components]
+        assert [p.id for p in seg.geom.polygons] == [p.id for p in original_seg.geom.polygons]
+
+        for compo, original_compo in zip(seg.components, original_seg.components):
+            for poly, original_poly in zip(compo.polygons, original_compo.polygons):
+                # -- Vertices are written out to 8 decimal places
+                for v, original_v in zip(poly.vertices, original_poly.vertices):
+                    assert (v.x, v.y, v.z) == pytest.approx((original_v.x, original_v.y, original_v.z), abs=1e-8)
+
+
+def test_round_trip_geometry_and_components(sample_project):
+    xml, new_xml = _round_trip(sample_project)
+
+    for tag in ("Graphics_3D", "Building/Components"):
+        original = [_to_text(_) for _ in xml.iterfind("Variants/Variant/{}".format(tag))]
+        new = [_to_text(_) for _ in new_xml.iterfind("Variants/Variant/{}".format(tag))]
+        assert original
+        assert new == original
+
+
+def test_round_trip_project_data(sample_project):
+    xml, new_xml = _round_trip(sample_project)
+
+    assert _to_text(new_xml.find("ProjectData")) == _to_text(xml.find("ProjectData"))
+    for tag in PyPH_WUFI.WUFI_xml_read.PROJECT_FIELDS:
+        assert new_xml.find(tag).text == xml.find(tag).text
+
+
+def test_round_trip_zones(sample_project):
+    xml, new_xml = _round_trip(sample_project)
+
+    original_zones = list(xml.iterfind("Variants/Variant/Building/Zones/Zone"))
+    new_zones = list(new_xml.iterfind("Variants/Variant/Building/Zones/Zone"))
+    assert len(new_zones) == len(original_zones)
+
+    for zone, original_zone in zip(new_zones, original_zones):
+        for tag in PyPH_WUFI.WUFI_xml_read.ZONE_FIELDS:
+            assert _to_text(zone.find(tag)) == _to_text(original_zone.find(tag))
+
+
+def test_read_compressed_file(tmp_path, sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+    with gzip.open(tmp_path / "project.xml.gz", "wt", encoding="utf8") as f:
+        f.write(xml_text)
+
+    project = PyPH_WUFI.WUFI_xml_read.read_project_xml(tmp_path / "project.xml.gz")
+
+    assert len(project.building_segments) == len(sample_project.building_segments)
+
+
+def test_read_bad_polygon_vertex():
+    xml_text = (
+        "<WUFIplusProject><Variants><Variant><Graphics_3D>"
+        "<Vertices/><Polygons><Polygon><IdentNr>1</IdentNr>"
+        '<IdentNrPoints count="1"><IdentNr index="0">99</IdentNr></IdentNrPoints>'
+        "</Polygon></Polygons></Graphics_3D></Variant></Variants></WUFIplusProject>"
+    )
+
+    with pytest.raises(PyPH_WUFI.WUFI_xml_read.WUFIXMLReadError):
+        PyPH_WUFI.WUFI_xml_read.read_project_xml(io.BytesIO(xml_text.encode("utf8")))
+
+
+def test_read_is_lossy(sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+    xml = ET.fromstring(xml_text)
+    project = PyPH_WUFI.WUFI_xml_read.read_project_xml(io.BytesIO(xml_text.encode("utf8")))
+
+    # -- Each of the skipped elements is in the written file
+    for path in PyPH_WUFI.WUFI_xml_read.NOT_READ:
+        parent_tag, tag = path.split("/")
+        parents = [xml] if parent_tag == xml.tag else list(xml.iter(parent_tag))
+        assert parents and all(_.find(tag) is not None for _ in parents), path
+
+    # -- ... and the new Project has the defaults instead
+    assert project.lAssembly == []
+    assert project.lWindow == []
+    for seg in project.building_segments:
+        assert list(seg.mechanicals.systems) == []
+        for zone in seg.zones:
+            assert zone.rooms == []
+            assert zone.appliance_set.appliances == []
+
+    # -- The Components still point to their Assembly
+    original_compos = [c for seg in sample_project.building_segments for c in seg.components]
+    compos = [c for seg in project.building_segments for c in seg.components]
+    assert [_.assembly_id_num for _ in compos] == [_.assembly_id_num for _ in original_compos]
+
+
+def test_read_keeps_loose_polygons(sample_project):
+    # -- A Polygon which is not part of any Component
+    seg = list(sample_project.building_segments)[0]
+    loose = PHX.geometry.Polygon()
+    loose.vertices = [PHX.geometry.Vertex(0, 0, 5), PHX.geometry.Vertex(1, 0, 5), PHX.geometry.Vertex(1, 1, 5)]
+    loose.nVec = PHX.geometry.Vector(0, 0, 1)
+    seg.geom.add_polygons(loose)
+
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+    project = PyPH_WUFI.WUFI_xml_read.read_project_xml(io.BytesIO(xml_text.encode("utf8")))
+
+    new_seg = list(project.building_segments)[0]
+    assert [p.id for p in new_seg.geom.polygons] == [p.id for p in seg.geom.polygons]
+    assert all(p._vertex_range.store is new_seg.geom.vertex_store for p in new_seg.geom.polygons)
+
+    xml, new_xml = _round_trip(sample_project)
+    assert _to_text(new_xml.find("Variants/Variant/Graphics_3D")) == _to_text(xml.find("Variants/Variant/Graphics_3D"))
@@ -0,0 +1,107 @@
+import io
+import pytest
+import PHX._base
+import PHX.bldg_segment
+import PHX.geometry
+import PHX.project
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_convert_phx
+import PyPH_WUFI.WUFI_xml_schemas_write
+import PyPH_WUFI.WUFI_xml_write
+
+
+class UnknownPHXObject(PHX._base._Base):
+    pass
+
+
+def test_schema_function_by_class():
+    v = PHX.geometry.Vertex(1, 2, 3)
+    func = PyPH_WUFI.WUFI_xml_convert_phx.get_schema_function(v)
+
+    assert func is PyPH_WUFI.WUFI_xml_schemas_write._Vertex
+
+
+def test_schema_function_by_name():
+    v = PHX.geometry.Vertex(1, 2, 3)
+    func = PyPH_WUFI.WUFI_xml_convert_phx.get_schema_function(v, "_Polygon")
+
+    assert func is PyPH_WUFI.WUFI_xml_schemas_write._Polygon
+
+
+def test_unknown_schema_raises():
+    with pytest.raises(PyPH_WUFI.WUFI_xml_convert_phx.SchemaNotFoundError):
+        PyPH_WUFI.WUFI_xml_convert_phx.get_schema_function(UnknownPHXObject())
+
+    with pytest.raises(PyPH_WUFI.WUFI_xml_convert_phx.SchemaNotFoundError):
+        PyPH_WUFI.WUFI_xml_convert_phx.get_schema_function(PHX.geometry.Vertex(), "_Not_A_Schema")
+
+
+def test_schemas_run_once_per_export(sample_project, monkeypatch):
+    calls = []
+
+    def _Project(_project):
+        calls.append(_project)
+        return PyPH_WUFI.WUFI_xml_schemas_write._Project(_project)
+
+    monkeypatch.setitem(PyPH_WUFI.WUFI_xml_convert_phx._CLASS_SCHEMA_FUNCTIONS, PHX.project.Project, _Project)
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, io.StringIO())
+
+    assert calls == [sample_project]
+
+
+def test_failed_export_leaves_target(tmp_path, sample_project):
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", "<first/>")
+    seg = list(sample_project.building_segments)[-1]
+    seg.geom = UnknownPHXObject()
+
+    with pytest.raises(PyPH_WUFI.WUFI_xml_convert_phx.SchemaNotFoundError):
+        PyPH_WUFI.WUFI_xml_write.write_XML_text_file(
+            tmp_path / "project.xml", lambda f: PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, f)
+        )
+
+    assert (tmp_path / "project.xml").read_text(encoding="utf8") == "<first/>"
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_parallel_export_raises(sample_project):
+    seg = list(sample_project.building_segments)[-1]
+    seg.geom = UnknownPHXObject()
+
+    with pytest.raises(PyPH_WUFI.WUFI_xml_convert_phx.SchemaNotFoundError):
+        PyPH_WUFI.WUFI_xml_build.write_project_xml_parallel(sample_project, io.StringIO(), _max_workers=2)
+
+
+def test_missing_schema_raises_before_writing(sample_project):
+    seg = list(sample_project.building_segments)[-1]
+    seg.components[-1].int_UD_color = UnknownPHXObject()
+    stream = io.StringIO()
+
+    with pytest.raises(PyPH_WUFI.WUFI_xml_convert_phx.SchemaNotFoundError):
+        PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, stream)
+    assert stream.getvalue() == ""
+
+    with pytest.raises(PyPH_WUFI.WUFI_xml_convert_phx.SchemaNotFoundError):
+        PyPH_WUFI.WUFI_xml_build.write_project_xml_parallel(sample_project, stream, _max_workers=2)
+    assert stream.getvalue() == ""
+
+
+def test_check_schemas_follows_registered_children(sample_project, monkeypatch):
+    class CustomGeom(PHX.bldg_segment.Geom):
+        pass
+
+    monkeypatch.setattr(PyPH_WUFI.WUFI_xml_convert_phx, "_CLASS_SCHEMA_FUNCTIONS", {})
+    monkeypatch.setattr(
+        PyPH_WUFI.WUFI_xml_convert_phx, "_CHILD_ATTRIBUTES", dict(PyPH_WUFI.WUFI_xml_convert_phx._CHILD_ATTRIBUTES)
+    )
+    seg = list(sample_project.building_segments)[0]
+    geom = CustomGeom()
+    geom.polygons = [UnknownPHXObject()]
+    seg.geom = geom
+
+    # -- The registered class's child attributes are checked as well
+    PyPH_WUFI.WUFI_xml_convert_phx.register_schema(CustomGeom, "_Geom", ["polygons"])
+    with pytest.raises(PyPH_WUFI.WUFI_xml_convert_phx.SchemaNotFoundError):
+        PyPH_WUFI.WUFI_xml_convert_phx.check_schemas(sample_project)
+
+    PyPH_WUFI.WUFI_xml_convert_phx.register_schema(UnknownPHXObject, "_Polygon")
+    PyPH_WUFI.WUFI_xml_convert_phx.check_schemas(sample_project)
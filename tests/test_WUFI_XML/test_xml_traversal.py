@@ -0,0 +1,45 @@
+import io
+import sys
+from PyPH_WUFI.xml_node import XML_Node, XML_List
+import PyPH_WUFI.xml_traversal
+import PyPH_WUFI.WUFI_xml_build
+
+
+def test_walk_event_order():
+    tree = XML_List("Items", [XML_Node("A", 1), XML_List("Empty", []), "not-a-node", XML_Node("B", 2)])
+    events = [(e, item.node_name, depth) for e, item, depth in PyPH_WUFI.xml_traversal.walk(tree)]
+
+    assert events == [
+        (PyPH_WUFI.xml_traversal.XML_START, "Items", 0),
+        (PyPH_WUFI.xml_traversal.XML_TEXT, "A", 1),
+        (PyPH_WUFI.xml_traversal.XML_EMPTY, "Empty", 1),
+        (PyPH_WUFI.xml_traversal.XML_TEXT, "B", 1),
+        (PyPH_WUFI.xml_traversal.XML_END, "Items", 0),
+    ]
+
+
+def test_walk_deep_tree_without_recursion():
+    depth = sys.getrecursionlimit() * 2
+    tree = XML_Node("Leaf", 0)
+    for i in range(depth):
+        tree = XML_List("Level", [tree])
+
+    stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    stream = io.StringIO()
+    PyPH_WUFI.WUFI_xml_build._write_children(stream, tree, _stats=stats)
+
+    assert stats.max_depth == depth
+    assert stats.nodes == depth + 1
+    assert stats.text_nodes == 1
+    assert "<Leaf>0</Leaf>" in stream.getvalue()
+
+
+def test_dom_and_stream_stats_match(sample_project):
+    dom_stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project, dom_stats)
+
+    stream_stats = PyPH_WUFI.xml_traversal.TraversalStats()
+    PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, io.StringIO(), stream_stats)
+
+    assert dom_stats.to_dict() == stream_stats.to_dict()
+    assert dom_stats.schema_calls > 0
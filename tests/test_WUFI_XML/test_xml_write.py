@@ -0,0 +1,78 @@
+import gzip
+import os
+import stat
+import pytest
+import PyPH_WUFI.WUFI_xml_build
+import PyPH_WUFI.WUFI_xml_write
+
+
+def test_write_text(tmp_path, sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", xml_text)
+
+    assert (tmp_path / "project.xml").read_text(encoding="utf8") == xml_text
+
+    # -- Target file and the timestamped copy only, no temp files left behind
+    files = sorted(_.name for _ in tmp_path.iterdir())
+    assert len(files) == 2
+    assert files[0] == "project.xml"
+    assert files[1].startswith("project_") and files[1].endswith(".xml")
+    assert (tmp_path / files[1]).read_text(encoding="utf8") == xml_text
+
+
+def test_write_streaming_writer(tmp_path, sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file(
+        tmp_path / "project.xml", lambda f: PyPH_WUFI.WUFI_xml_build.write_project_xml(sample_project, f)
+    )
+
+    assert (tmp_path / "project.xml").read_text(encoding="utf8") == xml_text
+
+
+def test_write_compressed(tmp_path, sample_project):
+    xml_text = PyPH_WUFI.WUFI_xml_build.create_project_xml_text(sample_project)
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", xml_text, _compress=True)
+
+    with gzip.open(tmp_path / "project.xml.gz", "rt", encoding="utf8") as f:
+        assert f.read() == xml_text
+    assert not (tmp_path / "project.xml").exists()
+
+
+def test_rewrite_keeps_old_copy(tmp_path):
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", "<first/>")
+    copy = next(_ for _ in tmp_path.iterdir() if _.name != "project.xml")
+    copy = copy.rename(tmp_path / "first_copy.xml")
+
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", "<second/>")
+
+    assert (tmp_path / "project.xml").read_text(encoding="utf8") == "<second/>"
+    assert copy.read_text(encoding="utf8") == "<first/>"
+
+
+def test_failed_write_leaves_target(tmp_path):
+    PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", "<first/>")
+
+    def bad_writer(f):
+        f.write("<partial>")
+        raise ValueError("export failed")
+
+    with pytest.raises(ValueError):
+        PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", bad_writer)
+
+    assert (tmp_path / "project.xml").read_text(encoding="utf8") == "<first/>"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_file_permissions(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        # -- A new file gets the usual permissions, not the private ones of a temp file
+        PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", "<first/>")
+        assert stat.S_IMODE((tmp_path / "project.xml").stat().st_mode) == 0o644
+
+        # -- A file which is written over keeps its own
+        os.chmod(tmp_path / "project.xml", 0o600)
+        PyPH_WUFI.WUFI_xml_write.write_XML_text_file(tmp_path / "project.xml", "<second/>")
+        assert stat.S_IMODE((tmp_path / "project.xml").stat().st_mode) == 0o600
+    finally:
+        os.umask(umask)